@@ -1,18 +1,142 @@
 import streamlit as st
-from components.graph_loader import load_graph
-from components.visualizations import draw_graph
+from components.ego_network import (
+    DEFAULT_BUDGET,
+    DEFAULT_HOPS,
+    DEFAULT_TYPE_PRIORITY,
+    center_ids,
+    ego_network,
+    reserve,
+    type_counts,
+)
+from components.filters import filter_nodes
+from components.graph_cache import (
+    cache_stats,
+    shared_analytics_table,
+    shared_graph,
+    shared_layout,
+    shared_overview,
+    shared_path_engine,
+    shared_sample,
+)
+from components.graph_loader import load_bitmap_index
+from components.node_picker import node_picker
+from components.render_cache import cached_html, render_key
+from components.sampling import DEFAULT_SIZE, DEFAULT_TOP_K
+from components.visualizations import draw_ego_network, draw_graph, draw_overview
+
+# Centres taken from a subject (its most central members)
+SUBJECT_CENTERS = 5
 
 st.set_page_config(page_title="🧠 Knowledge Graph", layout="wide")
 st.title("🧠 Knowledge Graph Platform")
 
 try:
-    G, raw = load_graph()
+    handle = shared_graph()
+    G = handle.G
 except Exception as e:
     st.error(str(e))
     st.stop()
 
 st.success(f"Loaded {G.number_of_nodes()} nodes, {G.number_of_edges()} edges")
 
-net = draw_graph(G)
-html = net.generate_html()
+stats = cache_stats()
+st.caption(
+    f"Graph cache — version {stats['version'][:12]} · "
+    f"{stats['hits']} hits · {stats['misses']} misses · {stats['reloads']} reloads"
+)
+
+view = st.radio("View", ["Ego network", "Preview", "Overview", "Full graph"], horizontal=True)
+
+layout = shared_layout(handle)
+layout_meta = layout.meta if layout is not None else None
+
+if view == "Full graph":
+    key = render_key(handle.version, "full", {"layout": layout_meta})
+    html = cached_html(key, lambda: draw_graph(G, layout).generate_html())
+    st.components.v1.html(html, height=750)
+    st.stop()
+
+if view == "Preview":
+    cols = st.columns(2)
+    with cols[0]:
+        size = st.number_input("Nodes", min_value=20, max_value=2000, value=DEFAULT_SIZE, step=20)
+    with cols[1]:
+        top_k = st.number_input("Always include top central", min_value=0, max_value=200, value=DEFAULT_TOP_K)
+    sample = shared_sample(int(size), int(top_k), handle)
+    st.caption(
+        f"Stratified sample of {len(sample.ids)} of {G.number_of_nodes()} nodes by subject, degree "
+        f"and edge type ({len(sample.src)} edges among them)."
+    )
+    key = render_key(handle.version, {"sample": [int(size), int(top_k)]}, {"layout": layout_meta})
+    names = shared_path_engine(handle).names
+    html = cached_html(key, lambda: draw_graph(G.subgraph(names[i] for i in sample.ids.tolist()), layout).generate_html())
+    st.components.v1.html(html, height=750)
+    st.stop()
+
+if view == "Overview":
+    grouping = st.radio("Collapse by", ["community", "subject"], horizontal=True, format_func=str.title)
+    overview = shared_overview(grouping, handle)
+    names = shared_path_engine(handle).names
+    st.caption(
+        f"{len(overview.labels)} {grouping} supernodes, {len(overview.edge_src)} superedges. "
+        f"Click a supernode to expand its most central members."
+    )
+    key = render_key(handle.version, {"overview": grouping}, {"layout": layout_meta})
+    html = cached_html(key, lambda: draw_overview(G, names, overview))
+    st.components.v1.html(html, height=750)
+    st.stop()
+
+# ======================================================
+# EGO NETWORK
+# ======================================================
+
+engine = shared_path_engine(handle)
+pagerank = shared_analytics_table(handle).columns["pagerank"]
+
+cols = st.columns([2, 1, 1])
+with cols[0]:
+    start = st.radio("Start from", ["Node", "Subject"], horizontal=True)
+    if start == "Node":
+        picked = node_picker("Centre node", key="ego_center")
+        centers = center_ids(engine, [picked] if picked else [])
+    else:
+        bitmaps = load_bitmap_index()
+        if bitmaps is not None:
+            subjects = bitmaps.values("subject")
+        else:
+            subjects = sorted({
+                s for _, props in G.nodes(data=True)
+                for s in props.get("metadata", {}).get("subjects", [])
+            })
+        subject = st.selectbox("Subject", subjects) if subjects else None
+        members = filter_nodes(G, subject=subject) if subject else []
+        centers = center_ids(engine, members, pagerank, limit=SUBJECT_CENTERS)
+with cols[1]:
+    hops = st.slider("Hops", 1, 4, DEFAULT_HOPS)
+with cols[2]:
+    budget = st.number_input("Node budget", min_value=10, max_value=2000, value=DEFAULT_BUDGET, step=10)
+
+present = list(type_counts(engine))
+priority = st.multiselect(
+    "Prefer edge types (in order)",
+    present,
+    default=[t for t in DEFAULT_TYPE_PRIORITY if t in present],
+)
+
+if not centers:
+    st.info("Pick a node or subject to explore.")
+    st.stop()
+
+ego = ego_network(engine, centers, hops=hops, budget=int(budget), type_priority=priority, scores=pagerank)
+extra = reserve(engine, ego, type_priority=priority, scores=pagerank)
+
+st.caption(
+    f"Showing {len(ego.ids)} of {engine.node_count} nodes within {hops} hops "
+    f"({int((ego.hidden > 0).sum())} with hidden neighbours). "
+    f"Double-click a node to expand it."
+)
+
+selection = {"centers": centers, "hops": hops, "budget": int(budget), "priority": priority}
+key = render_key(handle.version, {"ego": selection}, {"layout": layout_meta})
+html = cached_html(key, lambda: draw_ego_network(G, engine, ego, extra, layout))
 st.components.v1.html(html, height=750)
@@ -0,0 +1,261 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as splinalg
+
+# ======================================================
+# GRAPH ANALYTICS
+# ======================================================
+#
+# Degree, PageRank, HITS and eigenvector centrality over one sparse
+# adjacency matrix, built once per graph instead of once per networkx
+# call. The results match networkx's (same iterations, same tolerances,
+# same treatment of self-loops and dangling nodes) and are returned as
+# arrays in node order; as_dict() / top() turn them into what the pages
+# display.
+#
+# Instances are shared by content hash (node names + edge pairs), so a
+# reloaded but unchanged graph reuses every result already computed.
+
+# Graphs whose analytics stay cached per process
+CACHE_SIZE = 4
+
+
+def _digest(names: Sequence[str], src: np.ndarray, dst: np.ndarray) -> str:
+    digest = hashlib.sha256()
+    digest.update("\0".join(map(str, names)).encode("utf-8"))
+    digest.update(np.ascontiguousarray(src, dtype=np.int64).tobytes())
+    digest.update(np.ascontiguousarray(dst, dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
+
+def _sorted_unique(keys: np.ndarray) -> np.ndarray:
+    # Plain sort + mask: much faster than np.unique on millions of int64
+    keys = np.sort(keys)
+    if len(keys):
+        keys = keys[np.concatenate([[True], keys[1:] != keys[:-1]])]
+    return keys
+
+
+class GraphAnalytics:
+    def __init__(self, names: List[str], src: np.ndarray, dst: np.ndarray):
+        n = len(names)
+
+        # Parallel edges of different types count once, as in a DiGraph
+        pairs = _sorted_unique(src.astype(np.int64) * max(n, 1) + dst)
+        self.names = names
+        self.src = (pairs // max(n, 1)).astype(np.int32)
+        self.dst = (pairs % max(n, 1)).astype(np.int32)
+        self.key = _digest(names, self.src, self.dst)
+
+        self._matrices = {}
+        self._results = {}
+        self.iterations = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_graph(cls, G) -> "GraphAnalytics":
+        names = list(G.nodes())
+        ids = {name: i for i, name in enumerate(names)}
+        edges = np.fromiter(
+            (ids[x] for edge in G.edges() for x in edge),
+            dtype=np.int64,
+            count=2 * G.number_of_edges(),
+        ).reshape(-1, 2)
+        return cls(names, edges[:, 0], edges[:, 1])
+
+    @classmethod
+    def from_engine(cls, engine) -> "GraphAnalytics":
+        """From a PathEngine's forward CSR (ids in snapshot order)."""
+        src = np.repeat(np.arange(engine.node_count, dtype=np.int64), np.diff(engine.fwd_indptr))
+        return cls(engine.names, src, engine.fwd_indices)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.names)
+
+    # --------------------------------------------------
+    # Matrices
+    # --------------------------------------------------
+    def adjacency(self, directed: bool = True) -> sp.csr_array:
+        """
+        0/1 adjacency. Undirected is G.to_undirected(): both directions,
+        self-loops once.
+        """
+        if directed not in self._matrices:
+            n = self.node_count
+            keys = self.src.astype(np.int64) * max(n, 1) + self.dst
+            if not directed:
+                keys = _sorted_unique(np.concatenate([keys, self.dst.astype(np.int64) * max(n, 1) + self.src]))
+
+            # Keys are sorted and unique: the CSR arrays follow directly
+            rows, cols = keys // max(n, 1), keys % max(n, 1)
+            indptr = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+            data = np.ones(len(keys), dtype=np.float64)
+            self._matrices[directed] = sp.csr_array((data, cols.astype(np.int32), indptr), shape=(n, n))
+        return self._matrices[directed]
+
+    def _memo(self, key, compute):
+        with self._lock:
+            if key not in self._results:
+                self._results[key] = compute()
+            return self._results[key]
+
+    # --------------------------------------------------
+    # Centralities
+    # --------------------------------------------------
+    def degree(self) -> np.ndarray:
+        """In + out degree, as G.degree() (a self-loop counts twice)."""
+        def compute():
+            n = self.node_count
+            return (np.bincount(self.src, minlength=n) + np.bincount(self.dst, minlength=n)).astype(np.int64)
+        return self._memo(("degree",), compute)
+
+    def degree_centrality(self) -> np.ndarray:
+        """nx.degree_centrality: degree / (n - 1)."""
+        def compute():
+            n = self.node_count
+            if n <= 1:
+                return np.ones(n)
+            return self.degree() / (n - 1)
+        return self._memo(("degree_centrality",), compute)
+
+    def pagerank(
+        self,
+        directed: bool = False,
+        alpha: float = 0.85,
+        tol: float = 1e-6,
+        max_iter: int = 100,
+        nstart: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        nx.pagerank (directed=False is nx.pagerank(G.to_undirected())).
+        Dangling nodes spread their rank uniformly. `nstart` warm-starts
+        the iteration, e.g. from the previous graph's vector; the
+        iterations used (by the run that computed this result, which may
+        be memoized) are left in self.iterations["pagerank"].
+        """
+        def compute():
+            n = self.node_count
+            if n == 0:
+                return np.zeros(0), 0
+
+            A = self.adjacency(directed)
+            AT = A if not directed else A.T.tocsr()
+            out = np.diff(A.indptr).astype(np.float64)
+            dangling = out == 0
+            scale = np.divide(1.0, out, out=np.zeros(n), where=~dangling)
+
+            x = np.full(n, 1.0 / n) if nstart is None else nstart / nstart.sum()
+            teleport = np.full(n, 1.0 / n)
+            for i in range(max_iter):
+                last = x
+                x = alpha * (AT @ (x * scale) + x[dangling].sum() * teleport) + (1 - alpha) * teleport
+                if np.abs(x - last).sum() < n * tol:
+                    return x, i + 1
+            raise nx.PowerIterationFailedConvergence(max_iter)
+
+        # A warm start converges to the same vector only within tol, so it
+        # is memoized apart from the cold one
+        start = None
+        if nstart is not None:
+            start = hashlib.sha256(np.ascontiguousarray(nstart, dtype=np.float64).tobytes()).hexdigest()
+        x, iterations = self._memo(("pagerank", directed, alpha, tol, max_iter, start), compute)
+        self.iterations["pagerank"] = iterations
+        return x
+
+    def hits(self, tol: float = 1e-8, max_iter: int = 100) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (hubs, authorities) as nx.hits: the principal singular vectors of
+        the adjacency (ARPACK), each scaled to sum to 1.
+        """
+        def compute():
+            n = self.node_count
+            if n == 0:
+                return np.zeros(0), np.zeros(0)
+
+            A = self.adjacency(True)
+            try:
+                _, _, vt = splinalg.svds(A, k=1, maxiter=max_iter, tol=tol)
+            except splinalg.ArpackNoConvergence as exc:
+                raise nx.PowerIterationFailedConvergence(max_iter) from exc
+
+            authorities = vt.ravel().real
+            hubs = A @ authorities
+            return hubs / hubs.sum(), authorities / authorities.sum()
+
+        return self._memo(("hits", tol, max_iter), compute)
+
+    def eigenvector(self, directed: bool = False, tol: float = 1e-6, max_iter: int = 100) -> np.ndarray:
+        """
+        nx.eigenvector_centrality (of G.to_undirected() unless directed):
+        power iteration on A^T + I, unit L2 norm.
+        """
+        def compute():
+            n = self.node_count
+            if n == 0:
+                return np.zeros(0)
+
+            A = self.adjacency(directed)
+            AT = A if not directed else A.T.tocsr()
+            x = np.full(n, 1.0 / n)
+            for _ in range(max_iter):
+                last = x
+                x = last + AT @ last
+                norm = np.linalg.norm(x) or 1.0
+                x = x / norm
+                if np.abs(x - last).sum() < n * tol:
+                    return x
+            raise nx.PowerIterationFailedConvergence(max_iter)
+
+        return self._memo(("eigenvector", directed, tol, max_iter), compute)
+
+    # --------------------------------------------------
+    # Display helpers
+    # --------------------------------------------------
+    def as_dict(self, values: np.ndarray) -> Dict[str, float]:
+        return dict(zip(self.names, values.tolist()))
+
+    def top(self, values: np.ndarray, k: int = 10) -> List[Tuple[str, float]]:
+        """k best (name, value), ties in node order like a stable sort."""
+        k = min(k, len(values))
+        if k <= 0:
+            return []
+        order = np.argsort(-values, kind="stable")[:k]
+        return [(self.names[i], float(values[i])) for i in order.tolist()]
+
+
+# ======================================================
+# SHARED INSTANCES
+# ======================================================
+
+_cache: "OrderedDict[str, GraphAnalytics]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _shared(analytics: GraphAnalytics) -> GraphAnalytics:
+    with _cache_lock:
+        cached = _cache.get(analytics.key)
+        if cached is not None:
+            _cache.move_to_end(analytics.key)
+            return cached
+        _cache[analytics.key] = analytics
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+        return analytics
+
+
+def analytics_for_graph(G) -> GraphAnalytics:
+    """Shared analytics for a DiGraph, reused while its structure is unchanged."""
+    return _shared(GraphAnalytics.from_graph(G))
+
+
+def analytics_for_engine(engine) -> GraphAnalytics:
+    """Shared analytics over a PathEngine's arrays (see graph_cache.shared_analytics)."""
+    return _shared(GraphAnalytics.from_engine(engine))
@@ -0,0 +1,363 @@
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import networkx as nx
+import numpy as np
+
+from components.communities import DEFAULT_PARAMS, modularity, refine_communities
+from components.npz_store import decode_meta, encode_meta, load_arrays, pack_strings, save_arrays
+
+# ======================================================
+# ANALYTICS TABLE
+# ======================================================
+#
+# Every per-node metric the overview pages show, computed once by
+# pipelines/build_analytics.py right after merge_graph.py and stored
+# column by column next to merged_graph.json:
+#
+#     merged_graph.analytics.npz
+#         meta                      JSON (source fingerprint, columns, ...)
+#         col_<metric>              one value per node id (snapshot order)
+#         order_<metric>            node ids, best first (stable)
+#         names_*, subjects_*       packed strings, decoded per row on demand
+#         edge_src, edge_dst        the deduplicated edges the table describes
+#
+# A page reads the file once per version and slices it: the top k of a
+# metric is order_<metric>[:k], so nothing it does grows with the graph.
+# Metrics that fail to converge are stored as NaN and listed in meta.
+#
+# After a small merge the table is updated rather than rebuilt
+# (update_analytics_table): the delta against the stored edges is
+# derived, PageRank is warm-started from the previous vector (and that
+# vector is what gets stored), HITS and eigenvector scores are carried
+# over, and communities are refined only around the nodes the delta
+# touched. Its report says when drift has grown large enough to warrant
+# a full build.
+
+TABLE_VERSION = 2
+
+# Louvain resolution the stored modularity is measured with
+RESOLUTION = DEFAULT_PARAMS["louvain"]["resolution"]
+
+# Past these, an incremental update asks for a full build
+MAX_CHANGED_FRACTION = 0.1      # added + removed edges / edges
+MAX_MODULARITY_DROP = 0.02      # below the last full build's modularity
+MAX_UPDATES_SINCE_FULL = 20
+
+# (column, dtype); "community" is the coarsest level of the Louvain
+# hierarchy (communities.py), -1 when communities were not computed
+COLUMNS = [
+    ("degree", np.int64),
+    ("in_degree", np.int64),
+    ("out_degree", np.int64),
+    ("degree_centrality", np.float64),
+    ("pagerank", np.float64),
+    ("eigenvector", np.float64),
+    ("hub", np.float64),
+    ("authority", np.float64),
+    ("community", np.int32),
+    ("community_size", np.int64),
+]
+
+
+def analytics_table_path(graph_path: Path) -> Path:
+    """merged_graph.json → merged_graph.analytics.npz"""
+    return graph_path.with_suffix(".analytics.npz")
+
+
+# ======================================================
+# BUILD
+# ======================================================
+
+def _ranking(values: np.ndarray) -> np.ndarray:
+    # Descending, ties in node order; NaN (no result) last
+    key = np.where(np.isnan(values), -np.inf, values) if values.dtype.kind == "f" else values
+    return np.argsort(-key, kind="stable").astype(np.int32)
+
+
+def build_analytics_table(
+    analytics,
+    subjects: Sequence[Sequence[str]],
+    communities: Optional[np.ndarray] = None,
+    source: Optional[dict] = None,
+    meta: Optional[dict] = None,
+    columns: Optional[Dict[str, np.ndarray]] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    The table's arrays, ready for np.savez. `analytics` is a
+    GraphAnalytics over ids in snapshot order; `subjects` lists each
+    node's subjects in the same order. `meta` overrides the defaults of
+    a full build and `columns` supplies centralities already at hand,
+    which are then not recomputed (see update_analytics_table).
+    """
+    n = analytics.node_count
+    given = columns or {}
+    failed = []
+
+    def converged(name, compute, count=1):
+        try:
+            return compute()
+        except nx.PowerIterationFailedConvergence:
+            failed.append(name)
+            nan = np.full(n, np.nan)
+            return nan if count == 1 else (nan,) * count
+
+    def metric(name, compute):
+        return given[name] if name in given else converged(name, compute)
+
+    if "hub" in given and "authority" in given:
+        hub, authority = given["hub"], given["authority"]
+    else:
+        hub, authority = converged("hits", analytics.hits, count=2)
+    if communities is None:
+        communities = np.full(n, -1, dtype=np.int32)
+        sizes = np.zeros(n, dtype=np.int64)
+        quality = None
+    else:
+        sizes = np.bincount(communities, minlength=1)[communities]
+        quality = modularity(analytics.adjacency(False), communities, RESOLUTION)
+
+    columns = {
+        "degree": analytics.degree(),
+        "in_degree": np.bincount(analytics.dst, minlength=n),
+        "out_degree": np.bincount(analytics.src, minlength=n),
+        "degree_centrality": analytics.degree_centrality(),
+        "pagerank": metric("pagerank", analytics.pagerank),
+        "eigenvector": metric("eigenvector", analytics.eigenvector),
+        "hub": hub,
+        "authority": authority,
+        "community": communities,
+        "community_size": sizes,
+    }
+
+    meta = {
+        "version": TABLE_VERSION,
+        "source": source,
+        "graph_key": analytics.key,
+        "node_count": n,
+        "columns": [name for name, _ in COLUMNS],
+        "not_converged": failed,
+        "community_count": int(communities.max()) + 1 if n else 0,
+        "modularity": quality,
+        # Quality at the last full build, and incremental updates since
+        "modularity_full": quality,
+        "updates_since_full": 0,
+        "update_report": None,
+        **(meta or {}),
+    }
+
+    arrays = {"meta": encode_meta(meta)}
+    for name, dtype in COLUMNS:
+        values = np.asarray(columns[name], dtype=dtype)
+        arrays[f"col_{name}"] = values
+        if name != "community":
+            arrays[f"order_{name}"] = _ranking(values)
+
+    # The graph itself, so the next update can diff against it
+    arrays["edge_src"], arrays["edge_dst"] = analytics.src, analytics.dst
+    arrays["names_offsets"], arrays["names_blob"] = pack_strings([str(name) for name in analytics.names])
+    arrays["subjects_offsets"], arrays["subjects_blob"] = pack_strings([", ".join(s) for s in subjects])
+    return arrays
+
+
+def save_analytics_table(arrays: Dict[str, np.ndarray], path: Path):
+    save_arrays(arrays, path)
+
+
+# ======================================================
+# READ
+# ======================================================
+
+class AnalyticsTable:
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.meta = decode_meta(arrays["meta"])
+        self.columns = {name: arrays[f"col_{name}"] for name in self.meta["columns"]}
+        self.orders = {
+            name: arrays[f"order_{name}"]
+            for name in self.meta["columns"]
+            if f"order_{name}" in arrays
+        }
+        self.edge_src = arrays.get("edge_src")
+        self.edge_dst = arrays.get("edge_dst")
+        self._names = (arrays["names_offsets"], arrays["names_blob"].tobytes())
+        self._subjects = (arrays["subjects_offsets"], arrays["subjects_blob"].tobytes())
+
+    @classmethod
+    def load(cls, path: Path) -> "AnalyticsTable":
+        return cls(load_arrays(path))
+
+    def __len__(self):
+        return self.meta["node_count"]
+
+    @property
+    def has_communities(self) -> bool:
+        return self.meta["community_count"] > 0
+
+    @staticmethod
+    def _strings(packed, ids) -> List[str]:
+        offsets, raw = packed
+        return [raw[offsets[i]:offsets[i + 1]].decode("utf-8") for i in ids]
+
+    def names(self, ids) -> List[str]:
+        return self._strings(self._names, np.asarray(ids).tolist())
+
+    def subjects(self, ids) -> List[str]:
+        """Each node's subjects, comma-separated."""
+        return self._strings(self._subjects, np.asarray(ids).tolist())
+
+    def top_ids(self, column: str, k: Optional[int] = None) -> np.ndarray:
+        """Ids of the k best nodes by a column (all of them if k is None)."""
+        order = self.orders[column]
+        return order if k is None else order[:k]
+
+    def top(self, column: str, k: int = 10) -> List[Tuple[str, float]]:
+        ids = self.top_ids(column, k)
+        return list(zip(self.names(ids), self.columns[column][ids].tolist()))
+
+    def rows(self, ids, columns: Sequence[str]) -> Dict[str, list]:
+        """Column → values for the given node ids, plus "node" and "subjects"."""
+        rows = {"node": self.names(ids)}
+        for name in columns:
+            rows[name] = self.columns[name][ids].tolist()
+        rows["subjects"] = self.subjects(ids)
+        return rows
+
+
+# ======================================================
+# INCREMENTAL UPDATE
+# ======================================================
+
+class GraphDelta(NamedTuple):
+    remap: np.ndarray          # previous id → current id, -1 if removed
+    added_nodes: np.ndarray    # current ids
+    removed_nodes: np.ndarray  # previous ids
+    added_edges: np.ndarray    # (k, 2) current ids
+    removed_edges: np.ndarray  # (k, 2) previous ids
+
+    def touched(self) -> np.ndarray:
+        """Current ids of added nodes and of surviving endpoints of changed edges."""
+        ends = self.remap[self.removed_edges.ravel()]
+        return np.unique(np.concatenate([self.added_nodes, self.added_edges.ravel(), ends[ends >= 0]]))
+
+
+def graph_delta(previous: AnalyticsTable, analytics) -> GraphDelta:
+    """Nodes and edges added / removed between the table's graph and `analytics`."""
+    n = analytics.node_count
+    ids = {str(name): i for i, name in enumerate(analytics.names)}
+    old_names = previous.names(range(len(previous)))
+    remap = np.fromiter((ids.get(name, -1) for name in old_names), dtype=np.int64, count=len(old_names))
+
+    back = np.full(n, -1, dtype=np.int64)
+    back[remap[remap >= 0]] = np.flatnonzero(remap >= 0)
+
+    # Edge keys in current ids; analytics' own keys are already sorted
+    new_keys = analytics.src.astype(np.int64) * n + analytics.dst
+    src, dst = remap[previous.edge_src], remap[previous.edge_dst]
+    alive = (src >= 0) & (dst >= 0)
+    old_keys = np.where(alive, src * n + dst, -1)
+
+    pos = np.minimum(np.searchsorted(new_keys, old_keys), max(len(new_keys) - 1, 0))
+    kept = alive & (new_keys[pos] == old_keys) if len(new_keys) else np.zeros(len(old_keys), dtype=bool)
+
+    kept_keys = np.sort(old_keys[kept])
+    pos = np.minimum(np.searchsorted(kept_keys, new_keys), max(len(kept_keys) - 1, 0))
+    added = kept_keys[pos] != new_keys if len(kept_keys) else np.ones(len(new_keys), dtype=bool)
+
+    return GraphDelta(
+        remap=remap,
+        added_nodes=np.flatnonzero(back < 0),
+        removed_nodes=np.flatnonzero(remap < 0),
+        added_edges=np.stack([analytics.src[added], analytics.dst[added]], axis=1).astype(np.int64),
+        removed_edges=np.stack([previous.edge_src[~kept], previous.edge_dst[~kept]], axis=1).astype(np.int64),
+    )
+
+
+def update_analytics_table(
+    previous: AnalyticsTable,
+    analytics,
+    subjects: Sequence[Sequence[str]],
+    source: Optional[dict] = None,
+    seed: int = 0,
+) -> Optional[Tuple[Dict[str, np.ndarray], dict]]:
+    """
+    (arrays, report) for `analytics`' graph, updated from `previous`:
+    degrees are recounted exactly, PageRank starts from the previous
+    vector, communities are refined around the changed nodes, and HITS /
+    eigenvector scores are carried over (0 for new nodes) unless the
+    report asks for a full build, which recomputes them. None
+    if `previous` has an older layout. report["full_recompute"] says
+    whether a full build is warranted, and why in report["reasons"].
+    """
+    if previous.meta.get("version") != TABLE_VERSION:
+        return None
+
+    n = analytics.node_count
+    delta = graph_delta(previous, analytics)
+    known = delta.remap >= 0
+    changed = len(delta.added_edges) + len(delta.removed_edges)
+    reasons = []
+
+    report = {
+        "nodes_added": len(delta.added_nodes),
+        "nodes_removed": len(delta.removed_nodes),
+        "edges_added": len(delta.added_edges),
+        "edges_removed": len(delta.removed_edges),
+        "changed_fraction": changed / max(len(analytics.src), 1),
+    }
+    if report["changed_fraction"] > MAX_CHANGED_FRACTION:
+        reasons.append(f"{report['changed_fraction']:.0%} of edges changed")
+
+    # PageRank from the previous vector (new nodes at the uniform value)
+    old_rank = previous.columns["pagerank"]
+    start = None
+    if n and len(old_rank) and np.isfinite(old_rank).all():
+        start = np.full(n, 1.0 / n)
+        start[delta.remap[known]] = old_rank[known]
+    columns = {}
+    try:
+        rank = columns["pagerank"] = analytics.pagerank(nstart=start)
+        report["pagerank_iterations"] = analytics.iterations.get("pagerank")
+        if start is not None:
+            report["pagerank_shift"] = float(np.abs(rank - start / start.sum()).sum())
+    except nx.PowerIterationFailedConvergence:
+        reasons.append("PageRank did not converge")
+
+    # Communities: previous labels carried over, moves only near the delta
+    communities = None
+    if previous.has_communities and n:
+        labels = np.empty(n, dtype=np.int64)
+        labels[delta.remap[known]] = previous.columns["community"][known]
+        labels[delta.added_nodes] = previous.meta["community_count"] + np.arange(len(delta.added_nodes))
+
+        A = analytics.adjacency(False)
+        touched = delta.touched()
+        region = np.unique(np.concatenate([touched, A[touched].indices])) if len(touched) else touched
+        communities = refine_communities(A, labels, region, RESOLUTION, seed)
+
+        quality = modularity(A, communities, RESOLUTION)
+        baseline = previous.meta.get("modularity_full")
+        report.update(region_nodes=len(region), modularity=quality, modularity_full=baseline)
+        if baseline is not None and quality < baseline - MAX_MODULARITY_DROP:
+            reasons.append(f"modularity fell from {baseline:.3f} to {quality:.3f}")
+
+    updates = previous.meta.get("updates_since_full", 0) + 1
+    if updates > MAX_UPDATES_SINCE_FULL:
+        reasons.append(f"{updates} incremental updates since the last full build")
+
+    # Scores the delta barely moves, kept from the previous table; a
+    # full build recomputes them
+    if not reasons:
+        for name in ("eigenvector", "hub", "authority"):
+            values = np.zeros(n)
+            values[delta.remap[known]] = previous.columns[name][known]
+            columns[name] = values
+        report["carried_over"] = ["eigenvector", "hub", "authority"]
+
+    report.update(full_recompute=bool(reasons), reasons=reasons)
+    meta = {
+        "modularity_full": previous.meta.get("modularity_full"),
+        "updates_since_full": updates,
+        "update_report": report,
+    }
+    arrays = build_analytics_table(analytics, subjects, communities, source=source, meta=meta, columns=columns)
+    return arrays, report
@@ -0,0 +1,268 @@
+import bisect
+import math
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from components.npz_store import (
+    decode_meta,
+    encode_meta,
+    load_arrays,
+    pack_strings,
+    save_arrays,
+    unpack_strings,
+)
+
+# ======================================================
+# AUTOCOMPLETE INDEX
+# ======================================================
+#
+# Search-as-you-type over node names for the node pickers. Three lookups,
+# best first:
+#   prefix       "conj"   → Conjugate Gradient      (sorted key array)
+#   word prefix  "grad"   → Conjugate Gradient      (sorted word array)
+#   trigram      "gradeint", "gate gr" → ...        (trigram postings)
+# Within a tier, better trigram overlap and higher node degree rank first,
+# so central concepts surface before obscure ones.
+
+INDEX_VERSION = 1
+
+TIER_EXACT = 4.0
+TIER_PREFIX = 3.0
+TIER_WORD_PREFIX = 2.0
+TIER_TRIGRAM = 1.0
+
+# Share of the score decided by degree (0..1, relative to the max degree)
+DEGREE_WEIGHT = 0.5
+
+# Share of the query's trigrams a fuzzy match must contain
+MIN_COVERAGE = 0.5
+
+
+def normalize_key(text: str) -> str:
+    """Case- and accent-insensitive form used for every comparison."""
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(text.lower().split())
+
+
+def _words(key: str) -> List[str]:
+    return [w for w in key.replace("-", " ").replace("–", " ").split() if w]
+
+
+def trigrams(key: str) -> set:
+    """Trigrams of each word padded like pg_trgm ("  w", " wo", "wor", "rd ")."""
+    grams = set()
+    for word in _words(key):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def node_degrees(graph: dict) -> Tuple[List[str], List[int]]:
+    """
+    Node names (records first, then bare edge endpoints) and their degree
+    in the DiGraph the app builds, i.e. distinct in + out neighbours.
+    """
+    names = list(graph.get("nodes", {}))
+    ids = {n: i for i, n in enumerate(names)}
+    pairs = set()
+
+    for edge in graph.get("edges", []):
+        s, t = edge.get("source"), edge.get("target")
+        if not isinstance(s, str) or not isinstance(t, str):
+            continue
+        for endpoint in (s, t):
+            if endpoint not in ids:
+                ids[endpoint] = len(names)
+                names.append(endpoint)
+        pairs.add((ids[s], ids[t]))
+
+    degree = [0] * len(names)
+    for s, t in pairs:
+        degree[s] += 1
+        degree[t] += 1
+
+    return names, degree
+
+
+# ======================================================
+# BUILD / SAVE
+# ======================================================
+
+def build_autocomplete_index(
+    names: List[str],
+    degree: Iterable[int],
+    source: Optional[dict] = None
+) -> Dict[str, np.ndarray]:
+    """Arrays for AutocompleteIndex, ready for np.savez."""
+    keys = [normalize_key(n) for n in names]
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+
+    words = sorted(
+        (w, i)
+        for i, key in enumerate(keys)
+        for w in set(_words(key)[1:])
+    )
+
+    postings: Dict[str, List[int]] = {}
+    trigram_count = []
+    for i, key in enumerate(keys):
+        grams = trigrams(key)
+        trigram_count.append(len(grams))
+        for g in grams:
+            postings.setdefault(g, []).append(i)
+
+    grams = sorted(postings)
+    indptr = np.zeros(len(grams) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(postings[g]) for g in grams])
+
+    name_offsets, name_blob = pack_strings(names)
+    word_offsets, word_blob = pack_strings([w for w, _ in words])
+    gram_offsets, gram_blob = pack_strings(grams)
+
+    meta = {"version": INDEX_VERSION, "source": source}
+
+    return {
+        "meta": encode_meta(meta),
+        "name_offsets": name_offsets,
+        "name_blob": name_blob,
+        "degree": np.asarray(list(degree), dtype=np.int32),
+        "prefix_order": np.asarray(order, dtype=np.int32),
+        "word_offsets": word_offsets,
+        "word_blob": word_blob,
+        "word_ids": np.asarray([i for _, i in words], dtype=np.int32),
+        "gram_offsets": gram_offsets,
+        "gram_blob": gram_blob,
+        "gram_indptr": indptr,
+        "gram_ids": np.fromiter(
+            (i for g in grams for i in postings[g]), dtype=np.int32, count=int(indptr[-1])
+        ),
+        "trigram_count": np.asarray(trigram_count, dtype=np.int32),
+    }
+
+
+def save_autocomplete_index(index: Dict[str, np.ndarray], path: Path):
+    save_arrays(index, path)
+
+
+# ======================================================
+# QUERY
+# ======================================================
+
+class AutocompleteIndex:
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.meta = decode_meta(arrays["meta"])
+        self.names = unpack_strings(arrays["name_offsets"], arrays["name_blob"])
+        self.degree = arrays["degree"]
+        self.prefix_order = arrays["prefix_order"]
+        self.words = unpack_strings(arrays["word_offsets"], arrays["word_blob"])
+        self.word_ids = arrays["word_ids"]
+        self.gram_ids = {
+            g: i for i, g in enumerate(unpack_strings(arrays["gram_offsets"], arrays["gram_blob"]))
+        }
+        self.gram_indptr = arrays["gram_indptr"]
+        self.gram_postings = arrays["gram_ids"]
+        self.trigram_count = arrays["trigram_count"]
+
+        self.sorted_keys = [normalize_key(self.names[i]) for i in self.prefix_order.tolist()]
+
+        max_degree = int(self.degree.max()) if len(self.degree) else 0
+        self.centrality = (
+            np.log1p(self.degree) / math.log1p(max_degree) if max_degree else np.zeros(len(self.names))
+        ).astype(np.float32)
+
+    @classmethod
+    def load(cls, path: Path) -> "AutocompleteIndex":
+        return cls(load_arrays(path))
+
+    @classmethod
+    def from_graph(cls, graph: dict, source: Optional[dict] = None) -> "AutocompleteIndex":
+        names, degree = node_degrees(graph)
+        return cls(build_autocomplete_index(names, degree, source))
+
+    def __len__(self):
+        return len(self.names)
+
+    # --------------------------------------------------
+    # Lookups (each returns node ids)
+    # --------------------------------------------------
+    def _prefix(self, q: str, keys: List[str], ids: np.ndarray) -> np.ndarray:
+        lo = bisect.bisect_left(keys, q)
+        hi = bisect.bisect_left(keys, q + "\uffff", lo)
+        return ids[lo:hi]
+
+    def _trigram(self, q: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Candidate ids and their similarity to the query: mostly the share
+        of the query's trigrams found in the name (so infixes score high),
+        plus some Jaccard so tighter names win ties.
+        """
+        query_grams = trigrams(q)
+        grams = [self.gram_ids[g] for g in query_grams if g in self.gram_ids]
+        if not grams:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+
+        hits = np.concatenate([
+            self.gram_postings[self.gram_indptr[g]:self.gram_indptr[g + 1]] for g in grams
+        ])
+        ids, shared = np.unique(hits, return_counts=True)
+
+        coverage = shared / len(query_grams)
+        keep = coverage >= MIN_COVERAGE
+        ids, shared, coverage = ids[keep], shared[keep], coverage[keep]
+
+        jaccard = shared / (len(query_grams) + self.trigram_count[ids] - shared)
+        return ids, (0.75 * coverage + 0.25 * jaccard).astype(np.float32)
+
+    # --------------------------------------------------
+    # Public API
+    # --------------------------------------------------
+    def top(self, limit: int = 20) -> List[str]:
+        """Highest-degree nodes: the picker's suggestions before any input."""
+        limit = min(limit, len(self.names))
+        if limit <= 0:
+            return []
+        ids = np.argpartition(-self.degree, limit - 1)[:limit]
+        ids = ids[np.lexsort((ids, -self.degree[ids]))]
+        return [self.names[i] for i in ids.tolist()]
+
+    def complete(self, text: str, limit: int = 20) -> List[Tuple[str, float]]:
+        """Top `limit` (name, score) for what the user typed, best first."""
+        q = normalize_key(text)
+        if not q:
+            return [(n, 0.0) for n in self.top(limit)]
+
+        scores: Dict[int, float] = {}
+
+        def offer(ids: np.ndarray, tier):
+            ranked = tier + DEGREE_WEIGHT * self.centrality[ids]
+            for i, score in zip(ids.tolist(), ranked.tolist()):
+                if score > scores.get(i, -1.0):
+                    scores[i] = score
+
+        def most_central(ids: np.ndarray) -> np.ndarray:
+            # A one-letter prefix can match a large share of the graph
+            if len(ids) > limit:
+                ids = ids[np.argpartition(-self.degree[ids], limit - 1)[:limit]]
+            return ids
+
+        prefix = self._prefix(q, self.sorted_keys, self.prefix_order)
+        offer(most_central(prefix), TIER_PREFIX)
+
+        # Exact matches sort first within the prefix range
+        exact = bisect.bisect_right(self.sorted_keys, q) - bisect.bisect_left(self.sorted_keys, q)
+        offer(prefix[:exact], TIER_EXACT)
+
+        if len(scores) < limit:
+            offer(most_central(self._prefix(q, self.words, self.word_ids)), TIER_WORD_PREFIX)
+
+        if len(scores) < limit and len(q) >= 3:
+            ids, similarity = self._trigram(q)
+            offer(ids, TIER_TRIGRAM * similarity)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self.names[item[0]]))
+        return [(self.names[i], score) for i, score in ranked[:limit]]
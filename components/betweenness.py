@@ -0,0 +1,354 @@
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from components.npz_store import decode_meta, encode_meta, load_arrays, save_arrays
+
+# ======================================================
+# BETWEENNESS
+# ======================================================
+#
+# Brandes' algorithm, one vectorized BFS per source over the deduplicated
+# CSR adjacency (GraphAnalytics.adjacency), normalized like
+# nx.betweenness_centrality. Exact mode uses every node as a source;
+# approximate mode samples k pivot sources (Brandes & Pich), enough for
+#
+#     P(|estimate - exact| > epsilon for some node) <= delta
+#
+# (Hoeffding per node, union bound over the n nodes; every source adds
+# at most 1 to a node's normalized score before averaging), i.e.
+#
+#     k = ln(2n / delta) / (2 epsilon^2)
+#
+# Sources are split into chunks across a process pool. The long-running
+# version is pipelines/build_betweenness.py, which writes progress to a
+# small JSON file while it works and the scores to
+# merged_graph.betweenness.npz when done; start_betweenness_job() runs
+# it in the background from the app.
+
+INDEX_VERSION = 1
+
+DEFAULT_EPSILON = 0.05
+DEFAULT_DELTA = 0.1
+
+# Below this many nodes exact betweenness is cheap enough
+EXACT_MAX_NODES = 2_000
+
+# Chunks per worker: enough for smooth progress, few enough to stay cheap
+CHUNKS_PER_WORKER = 16
+
+# Seconds a started job may take to write its own first progress
+STARTUP_GRACE = 60
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+JOB_SCRIPT = BASE_DIR / "pipelines" / "build_betweenness.py"
+
+
+def betweenness_path(graph_path: Path) -> Path:
+    """merged_graph.json → merged_graph.betweenness.npz"""
+    return graph_path.with_suffix(".betweenness.npz")
+
+
+def progress_path(graph_path: Path) -> Path:
+    """merged_graph.json → merged_graph.betweenness.progress.json"""
+    return graph_path.with_suffix(".betweenness.progress.json")
+
+
+def sample_size(n: int, epsilon: float = DEFAULT_EPSILON, delta: float = DEFAULT_DELTA) -> int:
+    """Pivot sources for an (epsilon, delta) guarantee on every node, capped at n."""
+    if n <= 2:
+        return n
+    return min(n, math.ceil(math.log(2 * n / delta) / (2 * epsilon ** 2)))
+
+
+# ======================================================
+# BRANDES
+# ======================================================
+
+def _dependencies(indptr: np.ndarray, indices: np.ndarray, s: int, stamp: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (nodes, dependency) of source s: δ_s(v) for every node v reached
+    from s (s itself included, with 0). `stamp` is scratch space of
+    length n, any contents.
+    """
+    n = len(indptr) - 1
+    dist = np.full(n, -1, dtype=np.int32)
+    sigma = np.zeros(n, dtype=np.float64)
+    dist[s] = 0
+    sigma[s] = 1.0
+
+    frontier = np.asarray([s], dtype=np.int64)
+    levels = []
+    depth = 0
+    while len(frontier):
+        starts = indptr[frontier]
+        counts = indptr[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            break
+        block_start = np.cumsum(counts) - counts
+        slots = np.repeat(starts - block_start, counts) + np.arange(total)
+        nbrs = indices[slots].astype(np.int64)
+        origins = np.repeat(frontier, counts)
+
+        # Newly reached nodes, each once (stamp keeps the last occurrence)
+        fresh = nbrs[dist[nbrs] < 0]
+        stamp[fresh] = np.arange(len(fresh))
+        fresh = fresh[stamp[fresh] == np.arange(len(fresh))]
+        dist[fresh] = depth + 1
+
+        # Shortest-path DAG edges into the next level
+        on = dist[nbrs] == depth + 1
+        preds, succs = origins[on], nbrs[on]
+        np.add.at(sigma, succs, sigma[preds])
+
+        levels.append((preds, succs))
+        frontier = fresh
+        depth += 1
+
+    delta = np.zeros(n, dtype=np.float64)
+    for preds, succs in reversed(levels):
+        np.add.at(delta, preds, sigma[preds] / sigma[succs] * (1.0 + delta[succs]))
+
+    # A source is never between itself and a target
+    delta[s] = 0.0
+    reached = np.flatnonzero(dist >= 0)
+    return reached, delta[reached]
+
+
+def accumulate(indptr: np.ndarray, indices: np.ndarray, sources) -> np.ndarray:
+    """Σ over sources of δ_s(v), unscaled; δ_s(s) is 0."""
+    n = len(indptr) - 1
+    total = np.zeros(n, dtype=np.float64)
+    stamp = np.zeros(n, dtype=np.int64)
+    for s in sources:
+        nodes, dep = _dependencies(indptr, indices, int(s), stamp)
+        total[nodes] += dep
+    return total
+
+
+# Worker-process state, set once per worker by _init_worker
+_worker_csr = None
+
+
+def _init_worker(indptr: np.ndarray, indices: np.ndarray):
+    global _worker_csr
+    _worker_csr = (indptr, indices)
+
+
+def _accumulate_chunk(sources) -> Tuple[int, np.ndarray]:
+    return len(sources), accumulate(*_worker_csr, sources)
+
+
+def _rescale(total: np.ndarray, sources: Optional[np.ndarray]) -> np.ndarray:
+    """nx's normalization (endpoints excluded), including its sampling correction."""
+    n = len(total)
+    if n <= 2:
+        return total
+    if sources is None:
+        return total / ((n - 1) * (n - 2))
+
+    k = len(sources)
+    scale = np.full(n, 1.0 / (k * (n - 2)))
+    # A sampled node never counts itself as a source
+    scale[sources] = 1.0 / ((k - 1) * (n - 2)) if k > 1 else math.nan
+    return total * scale
+
+
+def betweenness_centrality(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    sources: Optional[np.ndarray] = None,
+    workers: int = 1,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> np.ndarray:
+    """
+    Normalized betweenness over a CSR adjacency, from every source
+    (exact) or from the given sample. `progress(done, total)` is called
+    as chunks of sources finish.
+    """
+    n = len(indptr) - 1
+    todo = np.arange(n) if sources is None else np.asarray(sources, dtype=np.int64)
+    total = np.zeros(n, dtype=np.float64)
+
+    if workers <= 1 or len(todo) <= 1:
+        chunks = np.array_split(todo, max(1, min(len(todo), CHUNKS_PER_WORKER)))
+        done = 0
+        for chunk in chunks:
+            total += accumulate(indptr, indices, chunk)
+            done += len(chunk)
+            if progress is not None:
+                progress(done, len(todo))
+        return _rescale(total, None if sources is None else todo)
+
+    chunks = np.array_split(todo, min(len(todo), workers * CHUNKS_PER_WORKER))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(indptr, indices)) as pool:
+        done = 0
+        for future in as_completed([pool.submit(_accumulate_chunk, chunk) for chunk in chunks]):
+            count, partial = future.result()
+            total += partial
+            done += count
+            if progress is not None:
+                progress(done, len(todo))
+
+    return _rescale(total, None if sources is None else todo)
+
+
+def approximate_betweenness(
+    analytics,
+    directed: bool = True,
+    epsilon: float = DEFAULT_EPSILON,
+    delta: float = DEFAULT_DELTA,
+    exact: Optional[bool] = None,
+    seed: int = 0,
+    workers: int = 1,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Tuple[np.ndarray, dict]:
+    """
+    (scores, info) over a GraphAnalytics' adjacency. Exact when asked,
+    or by default when the graph is small or the sample would cover
+    every node anyway.
+    """
+    A = analytics.adjacency(directed)
+    n = analytics.node_count
+    k = sample_size(n, epsilon, delta)
+    if exact is None:
+        exact = n <= EXACT_MAX_NODES or k >= n
+
+    sources = None
+    if not exact:
+        sources = np.sort(np.random.default_rng(seed).choice(n, size=k, replace=False))
+
+    scores = betweenness_centrality(A.indptr, A.indices, sources, workers, progress)
+    info = {
+        "mode": "exact" if exact else "approximate",
+        "directed": directed,
+        "epsilon": None if exact else epsilon,
+        "delta": None if exact else delta,
+        "samples": n if exact else k,
+        "seed": None if exact else seed,
+    }
+    return scores, info
+
+
+# ======================================================
+# PERSISTENCE
+# ======================================================
+
+def save_betweenness(scores: np.ndarray, info: dict, path: Path, source: Optional[dict] = None):
+    meta = dict(info, version=INDEX_VERSION, source=source, node_count=len(scores))
+    save_arrays({"meta": encode_meta(meta), "scores": scores}, path)
+
+
+class Betweenness:
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.meta = decode_meta(arrays["meta"])
+        self.scores = arrays["scores"]
+
+    @classmethod
+    def load(cls, path: Path) -> "Betweenness":
+        return cls(load_arrays(path))
+
+    def top_ids(self, k: int = 10) -> np.ndarray:
+        return np.argsort(-self.scores, kind="stable")[:k]
+
+    def top(self, names: List[str], k: int = 10) -> List[Tuple[str, float]]:
+        if len(names) != len(self.scores):
+            return []
+        return [(names[i], float(self.scores[i])) for i in self.top_ids(k).tolist()]
+
+
+# ======================================================
+# BACKGROUND JOB
+# ======================================================
+
+def write_progress(path: Path, **status):
+    """Atomically replace the job's progress file."""
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(dict(status, updated_at=time.time())), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def job_status(graph_path: Path) -> Optional[dict]:
+    """
+    Last progress written by the job, or None if it never ran. A
+    "running" job whose process is gone, or that never reported its
+    pid within STARTUP_GRACE, is reported as "failed".
+    """
+    try:
+        status = json.loads(progress_path(graph_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if status.get("state") != "running":
+        return status
+    if status.get("pid") is None:
+        stalled = time.time() - status.get("updated_at", 0) > STARTUP_GRACE
+    else:
+        stalled = not _alive(status["pid"])
+    if stalled:
+        status["state"] = "failed"
+        status.setdefault("error", "the job exited without finishing")
+    return status
+
+
+def start_betweenness_job(
+    graph_path: Path,
+    epsilon: float = DEFAULT_EPSILON,
+    delta: float = DEFAULT_DELTA,
+    workers: Optional[int] = None,
+    directed: bool = False,
+) -> bool:
+    """
+    Run pipelines/build_betweenness.py detached. False if a job for this
+    graph is already running.
+    """
+    status = job_status(graph_path)
+    if status is not None and status.get("state") == "running":
+        return False
+
+    args = [
+        sys.executable, str(JOB_SCRIPT),
+        "--epsilon", str(epsilon),
+        "--delta", str(delta),
+        "--workers", str(workers or max(1, (os.cpu_count() or 2) - 1)),
+    ]
+    if directed:
+        args.append("--directed")
+
+    # Visible to every session right away. Written before spawning: from
+    # here on only the job writes (its pid included), so a fast job's
+    # own updates are never overwritten
+    path = progress_path(graph_path)
+    write_progress(path, state="running", pid=None, done=0, total=None)
+    try:
+        subprocess.Popen(
+            args,
+            cwd=BASE_DIR,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError as e:
+        write_progress(path, state="failed", pid=None, error=str(e))
+        raise
+    return True
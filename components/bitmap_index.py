@@ -0,0 +1,255 @@
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from components.npz_store import (
+    decode_meta,
+    encode_meta,
+    load_arrays,
+    pack_strings,
+    save_arrays,
+    unpack_strings,
+)
+
+# ======================================================
+# BITMAP INDEX
+# ======================================================
+#
+# One bitset per subject, domain, type and source file, over the integer
+# node ids of the snapshot (records in file order, then edge endpoints
+# without a record). Bit i of a bitset is word i // 64, bit i % 64.
+#
+# Filters compose with the usual operators, e.g. nodes in linear algebra
+# or optimization, but not from a given file:
+#
+#     (index.any_of("subject", ["linear_algebra", "optimization"])
+#      & ~index.bits("source_file", "optimization/old.json"))
+
+INDEX_VERSION = 1
+
+FACETS = ("subject", "domain", "type", "source_file")
+
+
+def bitmap_path(graph_path: Path) -> Path:
+    """merged_graph.json → merged_graph.bitmaps.npz"""
+    return graph_path.with_suffix(".bitmaps.npz")
+
+
+def node_order(graph: dict) -> List[str]:
+    """Node names in snapshot id order."""
+    ids = dict.fromkeys(graph.get("nodes", {}))
+    for edge in graph.get("edges", []):
+        s, t = edge.get("source"), edge.get("target")
+        if isinstance(s, str) and isinstance(t, str):
+            ids.setdefault(s)
+            ids.setdefault(t)
+    return list(ids)
+
+
+def _facet_values(record: dict) -> Dict[str, List[str]]:
+    meta = record.get("metadata", {})
+    if not isinstance(meta, dict):
+        meta = {}
+
+    def strings(value):
+        if isinstance(value, str):
+            return [value]
+        if isinstance(value, list):
+            return [v for v in value if isinstance(v, str)]
+        return []
+
+    return {
+        "subject": strings(meta.get("subjects")),
+        "domain": strings(record.get("domain")),
+        "type": strings(record.get("type")),
+        "source_file": strings(meta.get("source_files")),
+    }
+
+
+# ======================================================
+# BITSET
+# ======================================================
+
+class Bitset:
+    """Fixed-size set of node ids backed by uint64 words."""
+
+    __slots__ = ("words", "size")
+
+    def __init__(self, words: np.ndarray, size: int):
+        self.words = words
+        self.size = size
+
+    @classmethod
+    def empty(cls, size: int) -> "Bitset":
+        return cls(np.zeros((size + 63) // 64, dtype=np.uint64), size)
+
+    @classmethod
+    def full(cls, size: int) -> "Bitset":
+        return ~cls.empty(size)
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[int], size: int) -> "Bitset":
+        bools = np.zeros(((size + 63) // 64) * 64, dtype=bool)
+        bools[np.fromiter(ids, dtype=np.int64)] = True
+        return cls(np.packbits(bools, bitorder="little").view(np.uint64), size)
+
+    def __and__(self, other: "Bitset") -> "Bitset":
+        return Bitset(self.words & other.words, self.size)
+
+    def __or__(self, other: "Bitset") -> "Bitset":
+        return Bitset(self.words | other.words, self.size)
+
+    def __sub__(self, other: "Bitset") -> "Bitset":
+        return Bitset(self.words & ~other.words, self.size)
+
+    def __invert__(self) -> "Bitset":
+        words = ~self.words
+        tail = self.size % 64
+        if tail and len(words):
+            # Keep the padding bits past the last node clear
+            words[-1] &= np.uint64((1 << tail) - 1)
+        return Bitset(words, self.size)
+
+    def __contains__(self, i: int) -> bool:
+        return 0 <= i < self.size and bool((int(self.words[i >> 6]) >> (i & 63)) & 1)
+
+    def __len__(self) -> int:
+        return int(np.unpackbits(self.words.view(np.uint8)).sum())
+
+    def __bool__(self) -> bool:
+        return bool(self.words.any())
+
+    def to_mask(self) -> np.ndarray:
+        """Boolean array of length size."""
+        return np.unpackbits(self.words.view(np.uint8), bitorder="little")[:self.size].astype(bool)
+
+    def ids(self) -> np.ndarray:
+        return np.flatnonzero(self.to_mask())
+
+
+# ======================================================
+# BUILD / SAVE
+# ======================================================
+
+def build_bitmap_index(graph: dict, source: Optional[dict] = None) -> Dict[str, np.ndarray]:
+    """Arrays for BitmapIndex, ready for np.savez."""
+    names = node_order(graph)
+    nodes = graph.get("nodes", {})
+    words = (len(names) + 63) // 64
+
+    arrays = {}
+    values: Dict[str, Dict[str, List[int]]] = {facet: {} for facet in FACETS}
+
+    for i, name in enumerate(names):
+        record = nodes.get(name)
+        if not isinstance(record, dict):
+            continue
+        for facet, keys in _facet_values(record).items():
+            for key in keys:
+                values[facet].setdefault(key, []).append(i)
+
+    for facet in FACETS:
+        keys = sorted(values[facet])
+        bits = np.zeros((len(keys), words * 64), dtype=bool)
+        for row, key in enumerate(keys):
+            bits[row, values[facet][key]] = True
+
+        offsets, blob = pack_strings(keys)
+        arrays[f"{facet}_offsets"] = offsets
+        arrays[f"{facet}_blob"] = blob
+        arrays[f"{facet}_bits"] = np.packbits(bits, axis=1, bitorder="little").view(np.uint64)
+
+    meta = {"version": INDEX_VERSION, "source": source, "node_count": len(names)}
+    arrays["meta"] = encode_meta(meta)
+
+    name_offsets, name_blob = pack_strings(names)
+    arrays["name_offsets"] = name_offsets
+    arrays["name_blob"] = name_blob
+
+    return arrays
+
+
+def save_bitmap_index(index: Dict[str, np.ndarray], path: Path):
+    save_arrays(index, path)
+
+
+# ======================================================
+# QUERY
+# ======================================================
+
+class BitmapIndex:
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.meta = decode_meta(arrays["meta"])
+        self.size = self.meta["node_count"]
+        self._arrays = arrays
+        self._keys: Dict[str, Dict[str, int]] = {}
+        self._names = None
+
+    @classmethod
+    def load(cls, path: Path) -> "BitmapIndex":
+        return cls(load_arrays(path))
+
+    def _facet(self, facet: str) -> Dict[str, int]:
+        if facet not in FACETS:
+            raise KeyError(f"Unknown facet: {facet}")
+        if facet not in self._keys:
+            keys = unpack_strings(self._arrays[f"{facet}_offsets"], self._arrays[f"{facet}_blob"])
+            self._keys[facet] = {k: row for row, k in enumerate(keys)}
+        return self._keys[facet]
+
+    # --------------------------------------------------
+    # Lookup
+    # --------------------------------------------------
+    def values(self, facet: str) -> List[str]:
+        """Every subject / domain / type / source file, sorted."""
+        return list(self._facet(facet))
+
+    def names(self) -> List[str]:
+        if self._names is None:
+            self._names = unpack_strings(self._arrays["name_offsets"], self._arrays["name_blob"])
+        return self._names
+
+    def bits(self, facet: str, value: str) -> Bitset:
+        row = self._facet(facet).get(value)
+        if row is None:
+            return Bitset.empty(self.size)
+        return Bitset(self._arrays[f"{facet}_bits"][row], self.size)
+
+    # --------------------------------------------------
+    # Combinators
+    # --------------------------------------------------
+    def any_of(self, facet: str, values: Iterable[str]) -> Bitset:
+        rows = [r for r in map(self._facet(facet).get, values) if r is not None]
+        if not rows:
+            return Bitset.empty(self.size)
+        return Bitset(np.bitwise_or.reduce(self._arrays[f"{facet}_bits"][rows], axis=0), self.size)
+
+    def all_of(self, facet: str, values: Iterable[str]) -> Bitset:
+        rows = list(map(self._facet(facet).get, values))
+        if not rows:
+            return Bitset.full(self.size)
+        if None in rows:
+            return Bitset.empty(self.size)
+        return Bitset(np.bitwise_and.reduce(self._arrays[f"{facet}_bits"][rows], axis=0), self.size)
+
+    def select(
+        self,
+        facet: str = "subject",
+        any_of: Optional[Iterable[str]] = None,
+        all_of: Optional[Iterable[str]] = None,
+        none_of: Optional[Iterable[str]] = None,
+    ) -> Bitset:
+        """OR of any_of, AND of all_of, minus none_of; omitted parts don't filter."""
+        result = Bitset.full(self.size)
+        if any_of:
+            result &= self.any_of(facet, any_of)
+        if all_of:
+            result &= self.all_of(facet, all_of)
+        if none_of:
+            result -= self.any_of(facet, none_of)
+        return result
+
+    def node_names(self, bits: Bitset) -> List[str]:
+        names = self.names()
+        return [names[i] for i in bits.ids().tolist()]
@@ -0,0 +1,411 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+
+from components.npz_store import decode_meta, encode_meta, load_arrays, save_arrays
+
+# ======================================================
+# COMMUNITIES
+# ======================================================
+#
+# Community detection over the undirected sparse adjacency
+# (GraphAnalytics.adjacency(False)), with integer node ids throughout:
+#
+#   louvain            multi-level modularity optimisation. Each level
+#                      moves nodes (seeded visiting order) to the
+#                      neighbouring community with the best modularity
+#                      gain, then splits every community into its
+#                      connected pieces (Leiden's connectivity guarantee)
+#                      and aggregates communities into the nodes of the
+#                      next level. Every level is kept, so the result is a
+#                      hierarchy from small concept groups (level 0) up to
+#                      subject-sized clusters (the last level).
+#   label_propagation  semi-synchronous, vectorized: a seeded half of the
+#                      nodes adopts its heaviest neighbouring label each
+#                      round, ties to the smallest label. One level.
+#
+# refine_communities() reruns Louvain's moving phase around the nodes a
+# graph delta touched, keeping every other assignment, for the
+# incremental analytics update (analytics_table.py).
+#
+# Labels are renumbered by size (0 is the largest community, ties by
+# smallest member id), so equal inputs always give equal outputs.
+#
+# Results are cached on disk under data/indexes/communities/, one npz per
+# (graph content key, algorithm, parameters), and in memory per process.
+
+CACHE_VERSION = 1
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+CACHE_DIR = BASE_DIR / "data" / "indexes" / "communities"
+
+# Result files kept on disk (oldest dropped first) and per process
+DISK_CACHE_SIZE = 16
+MEMORY_CACHE_SIZE = 8
+
+ALGORITHMS = ("louvain", "label_propagation")
+
+DEFAULT_PARAMS = {
+    "louvain": {"resolution": 1.0, "seed": 0, "max_levels": 10},
+    "label_propagation": {"seed": 0, "max_iter": 100},
+}
+
+
+# ======================================================
+# HELPERS
+# ======================================================
+
+def _relabel(labels: np.ndarray) -> np.ndarray:
+    """
+    Renumber non-negative labels by community size (descending), ties
+    by smallest member.
+    """
+    n = len(labels)
+    if n == 0:
+        return labels.astype(np.int32)
+    m = int(labels.max()) + 1
+    sizes = np.bincount(labels, minlength=m)
+    first = np.full(m, n, dtype=np.int64)
+    np.minimum.at(first, labels, np.arange(n))
+    used = np.flatnonzero(sizes)
+    order = used[np.lexsort((first[used], -sizes[used]))]
+    rank = np.empty(m, dtype=np.int32)
+    rank[order] = np.arange(len(order), dtype=np.int32)
+    return rank[labels]
+
+
+def _aggregate(A: sp.csr_array, labels: np.ndarray, count: int) -> sp.csr_array:
+    """Community graph: A'[c, d] = Σ A[i, j] over i in c, j in d."""
+    C = A.tocoo()
+    return sp.csr_array(
+        (C.data, (labels[C.row], labels[C.col])),
+        shape=(count, count),
+    )
+
+
+def modularity(A: sp.csr_array, labels: np.ndarray, resolution: float = 1.0) -> float:
+    """Newman modularity of a partition of a symmetric weighted adjacency."""
+    total = A.sum()
+    if total == 0:
+        return 0.0
+    C = A.tocoo()
+    inside = C.data[labels[C.row] == labels[C.col]].sum()
+    strength = np.bincount(labels, weights=np.asarray(A.sum(axis=1)).ravel())
+    return float(inside / total - resolution * np.square(strength / total).sum())
+
+
+# ======================================================
+# LOUVAIN
+# ======================================================
+
+def _move_nodes(
+    A: sp.csr_array,
+    resolution: float,
+    rng: np.random.Generator,
+    labels: Optional[np.ndarray] = None,
+    nodes: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, bool]:
+    """
+    Local moving phase: (labels, moved anything). Gains are
+    w(i, c) - resolution * tot(c) * k(i) / 2m, with i taken out of its
+    own community first. Starts from singletons unless `labels` is
+    given, and only visits `nodes` when given.
+    """
+    n = A.shape[0]
+    indptr = A.indptr.tolist()
+    indices = A.indices.tolist()
+    weights = A.data.tolist()
+    strength = np.asarray(A.sum(axis=1)).ravel()
+    two_m = float(strength.sum())
+
+    if labels is None:
+        labels = np.arange(n)
+    tot = np.bincount(labels, weights=strength, minlength=n).tolist() if n else []
+    labels = labels.tolist()
+    strength = strength.tolist()
+    visit = np.arange(n) if nodes is None else np.asarray(nodes)
+    order = visit[rng.permutation(len(visit))].tolist()
+    moved_any = False
+
+    while True:
+        moved = 0
+        for i in order:
+            own = labels[i]
+            k = strength[i]
+            links = {}
+            for p in range(indptr[i], indptr[i + 1]):
+                j = indices[p]
+                if j != i:
+                    c = labels[j]
+                    links[c] = links.get(c, 0.0) + weights[p]
+
+            tot[own] -= k
+            scale = resolution * k / two_m if two_m else 0.0
+            best = own
+            best_gain = links.get(own, 0.0) - tot[own] * scale
+            for c, w in links.items():
+                gain = w - tot[c] * scale
+                if gain > best_gain + 1e-12:
+                    best, best_gain = c, gain
+            tot[best] += k
+
+            if best != own:
+                labels[i] = best
+                moved += 1
+        if moved == 0:
+            break
+        moved_any = True
+
+    return np.asarray(labels, dtype=np.int64), moved_any
+
+
+def _split_disconnected(A: sp.csr_array, labels: np.ndarray) -> np.ndarray:
+    """Each connected piece of a community becomes its own community."""
+    C = A.tocoo()
+    keep = labels[C.row] == labels[C.col]
+    inside = sp.csr_array((C.data[keep], (C.row[keep], C.col[keep])), shape=A.shape)
+    _, pieces = connected_components(inside, directed=False)
+    return pieces
+
+
+def louvain(
+    A: sp.csr_array,
+    resolution: float = 1.0,
+    seed: int = 0,
+    max_levels: int = 10,
+) -> Tuple[np.ndarray, List[float]]:
+    """
+    (levels, modularity per level): levels[l] is every node's community
+    at level l, level 0 the finest. Stops when a level merges nothing.
+    """
+    n = A.shape[0]
+    rng = np.random.default_rng(seed)
+    A = sp.csr_array(A, dtype=np.float64)
+    original = A
+    assignment = np.arange(n)
+
+    levels, scores = [], []
+    for _ in range(max_levels):
+        labels, moved = _move_nodes(A, resolution, rng)
+        if not moved:
+            break
+        labels = _relabel(_split_disconnected(A, labels))
+        count = int(labels.max()) + 1
+        if count == A.shape[0]:
+            break
+
+        assignment = labels[assignment]
+        levels.append(_relabel(assignment))
+        scores.append(modularity(original, levels[-1], resolution))
+        A = _aggregate(A, labels, count)
+
+    if not levels:
+        levels.append(_relabel(np.arange(n)))
+        scores.append(modularity(original, levels[-1], resolution))
+    return np.vstack(levels).astype(np.int32), scores
+
+
+def refine_communities(
+    A: sp.csr_array,
+    labels: np.ndarray,
+    nodes: np.ndarray,
+    resolution: float = 1.0,
+    seed: int = 0,
+) -> np.ndarray:
+    """
+    An existing partition improved around `nodes` only: those nodes are
+    moved as in Louvain's first phase while every other node keeps its
+    community, then communities are split into connected pieces and
+    renumbered. For small graph changes, instead of a full run.
+    """
+    rng = np.random.default_rng(seed)
+    A = sp.csr_array(A, dtype=np.float64)
+    labels, _ = _move_nodes(A, resolution, rng, labels=np.asarray(labels, dtype=np.int64), nodes=nodes)
+    return _relabel(_split_disconnected(A, labels))
+
+
+# ======================================================
+# LABEL PROPAGATION
+# ======================================================
+
+def label_propagation(A: sp.csr_array, seed: int = 0, max_iter: int = 100) -> np.ndarray:
+    """
+    Labels after propagation converges (or max_iter rounds). Each round
+    a seeded random half of the nodes is updated, which avoids the
+    two-colour oscillation of fully synchronous updates.
+    """
+    n = A.shape[0]
+    rng = np.random.default_rng(seed)
+    C = A.tocoo()
+    off = C.row != C.col
+    rows, cols = C.row[off].astype(np.int64), C.col[off].astype(np.int64)
+    weights = C.data[off].astype(np.float64)
+
+    labels = np.arange(n, dtype=np.int64)
+    if len(rows) == 0:
+        return _relabel(labels)
+
+    for _ in range(max_iter):
+        # Weight of every (node, neighbouring label) pair
+        keys = rows * n + labels[cols]
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        starts = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+        totals = np.add.reduceat(weights[order], starts)
+        nodes, cand = keys[starts] // n, keys[starts] % n
+
+        # Heaviest label per node, smallest label on ties
+        pick = np.lexsort((cand, -totals, nodes))
+        nodes, cand = nodes[pick], cand[pick]
+        first = np.concatenate([[True], nodes[1:] != nodes[:-1]])
+        best = labels.copy()
+        best[nodes[first]] = cand[first]
+
+        # A node already carrying one of its heaviest labels keeps it
+        weight = totals[pick]
+        heaviest = np.zeros(n, dtype=np.float64)
+        heaviest[nodes[first]] = weight[first]
+        current = np.zeros(n, dtype=np.float64)
+        mine = cand == labels[nodes]
+        current[nodes[mine]] = weight[mine]
+        best = np.where(current == heaviest, labels, best)
+
+        changing = best != labels
+        if not changing.any():
+            break
+        labels = np.where(changing & (rng.random(n) < 0.5), best, labels)
+
+    return _relabel(labels)
+
+
+# ======================================================
+# RESULT + CACHE
+# ======================================================
+
+class Communities:
+    """
+    levels[l, v]: community of node v at level l (0 = finest). Levels
+    are nested: a level-l community lies inside one level-(l+1) community.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.meta = decode_meta(arrays["meta"])
+        self.levels = arrays["levels"]
+
+    @classmethod
+    def load(cls, path: Path) -> "Communities":
+        return cls(load_arrays(path))
+
+    def __len__(self):
+        return len(self.levels)
+
+    @property
+    def modularity(self) -> List[float]:
+        return self.meta["modularity"]
+
+    def labels(self, level: int = -1) -> np.ndarray:
+        return self.levels[level]
+
+    def count(self, level: int = -1) -> int:
+        labels = self.levels[level]
+        return int(labels.max()) + 1 if len(labels) else 0
+
+    def sizes(self, level: int = -1) -> np.ndarray:
+        return np.bincount(self.levels[level], minlength=self.count(level))
+
+    def parents(self, level: int) -> np.ndarray:
+        """Community at level + 1 of each community at `level`."""
+        parents = np.zeros(self.count(level), dtype=np.int32)
+        parents[self.levels[level]] = self.levels[level + 1]
+        return parents
+
+    def members(self, level: int, community: int) -> np.ndarray:
+        return np.flatnonzero(self.levels[level] == community)
+
+    def clusters(self, names: Sequence[str], level: int = -1) -> Dict[int, List[str]]:
+        """community → sorted member names, as the pages display them."""
+        labels = self.levels[level]
+        order = np.argsort(labels, kind="stable")
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=self.count(level)))])
+        return {
+            c: sorted(names[i] for i in order[bounds[c]:bounds[c + 1]].tolist())
+            for c in range(self.count(level))
+        }
+
+
+def cache_key(graph_key: str, algorithm: str, params: dict) -> str:
+    payload = json.dumps([CACHE_VERSION, graph_key, algorithm, params], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _prune(cache_dir: Path):
+    files = sorted(cache_dir.glob("*.npz"), key=lambda p: p.stat().st_mtime_ns, reverse=True)
+    for stale in files[DISK_CACHE_SIZE:]:
+        stale.unlink(missing_ok=True)
+
+
+_memory: "OrderedDict[str, Communities]" = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def detect_communities(
+    analytics,
+    algorithm: str = "louvain",
+    cache_dir: Optional[Path] = CACHE_DIR,
+    **params,
+) -> Communities:
+    """
+    Communities of a GraphAnalytics' undirected graph, from the memory or
+    disk cache when this graph was already partitioned with the same
+    algorithm and parameters. cache_dir=None skips the disk cache.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown community algorithm: {algorithm}")
+    params = dict(DEFAULT_PARAMS[algorithm], **params)
+    key = cache_key(analytics.key, algorithm, params)
+
+    with _memory_lock:
+        if key in _memory:
+            _memory.move_to_end(key)
+            return _memory[key]
+
+    path = cache_dir / f"{key}.npz" if cache_dir is not None else None
+    if path is not None and path.exists():
+        result = Communities.load(path)
+    else:
+        A = analytics.adjacency(False)
+        if algorithm == "louvain":
+            levels, scores = louvain(A, **params)
+        else:
+            labels = label_propagation(A, **params)
+            levels, scores = labels[None, :], [modularity(A, labels)]
+
+        meta = {
+            "version": CACHE_VERSION,
+            "graph_key": analytics.key,
+            "algorithm": algorithm,
+            "params": params,
+            "modularity": scores,
+        }
+        arrays = {
+            "meta": encode_meta(meta),
+            "levels": levels.astype(np.int32),
+        }
+        result = Communities(arrays)
+
+        if path is not None:
+            save_arrays(arrays, path)
+            _prune(cache_dir)
+
+    with _memory_lock:
+        _memory[key] = result
+        while len(_memory) > MEMORY_CACHE_SIZE:
+            _memory.popitem(last=False)
+    return result
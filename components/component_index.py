@@ -0,0 +1,327 @@
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from components.npz_store import (
+    decode_meta,
+    encode_meta,
+    load_arrays,
+    pack_strings,
+    save_arrays,
+    unpack_strings,
+)
+
+# ======================================================
+# COMPONENT INDEX
+# ======================================================
+#
+# Weakly and strongly connected component ids per node, plus the
+# condensation DAG (one vertex per SCC), written next to merged_graph.json
+# by pipelines/build_path_index.py.
+#
+# SCC ids are in topological order and every DAG vertex has a level (the
+# longest chain of SCCs leading to it), so an edge always goes to a higher
+# id and a higher level. That answers most impossible queries in O(1):
+#   - endpoints in different weak components: no path in either mode,
+#   - same SCC: always reachable,
+#   - target's SCC not above the source's (by level): not reachable.
+# Everything else falls back to a pruned walk of the (small) DAG.
+
+INDEX_VERSION = 1
+
+# Subjects kept per weak component for display
+TOP_SUBJECTS = 5
+
+
+def component_path(graph_path: Path) -> Path:
+    """merged_graph.json → merged_graph.components.npz"""
+    return graph_path.with_suffix(".components.npz")
+
+
+def weak_components(indptr: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """
+    Component id per node over an undirected CSR, numbered by smallest
+    member. Vectorized hook-and-compress (Shiloach–Vishkin style) label
+    propagation: a few passes over the edge arrays, no per-node Python.
+    """
+    n = len(indptr) - 1
+    src = np.repeat(np.arange(n, dtype=np.int64), np.diff(indptr))
+    dst = indices.astype(np.int64)
+    labels = np.arange(n, dtype=np.int64)
+
+    while True:
+        # Hook: point the larger root of every edge at the smaller one
+        a, b = labels[src], labels[dst]
+        differ = a != b
+        if not differ.any():
+            break
+        lo, hi = np.minimum(a[differ], b[differ]), np.maximum(a[differ], b[differ])
+        np.minimum.at(labels, hi, lo)
+
+        # Compress: jump pointers until every node points at a root
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+
+    return np.unique(labels, return_inverse=True)[1].astype(np.int32)
+
+
+def _neighbours(indptr, indices, frontier):
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    total = int(counts.sum())
+    block_start = np.cumsum(counts) - counts
+    return indices[np.repeat(starts - block_start, counts) + np.arange(total)]
+
+
+def strong_components(indptr: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """
+    SCC id per node, numbered in topological order of the condensation
+    (iterative Tarjan, so deep graphs cannot hit the recursion limit).
+    """
+    n = len(indptr) - 1
+    ptr = indptr.tolist()
+    adj = indices.tolist()
+
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack = []
+    comp = [-1] * n
+    found = 0
+    counter = 0
+
+    for root in range(n):
+        if index[root] >= 0:
+            continue
+
+        work = [(root, ptr[root])]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+
+        while work:
+            v, i = work[-1]
+            end = ptr[v + 1]
+
+            # Advance to the next unvisited successor
+            while i < end:
+                w = adj[i]
+                i += 1
+                if index[w] < 0:
+                    work[-1] = (v, i)
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, ptr[w]))
+                    break
+                if on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                work.pop()
+                if work:
+                    u = work[-1][0]
+                    if low[v] < low[u]:
+                        low[u] = low[v]
+                if low[v] == index[v]:
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        comp[w] = found
+                        if w == v:
+                            break
+                    found += 1
+
+    # Tarjan emits sinks first: reverse for topological order
+    return (found - 1 - np.asarray(comp, dtype=np.int32)).astype(np.int32)
+
+
+def condensation(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    scc: np.ndarray,
+    count: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(dag_indptr, dag_indices, level) of the SCC DAG."""
+    src = np.repeat(np.arange(len(indptr) - 1, dtype=np.int32), np.diff(indptr))
+    a, b = scc[src], scc[indices]
+    cross = a != b
+    pairs = np.unique(np.stack([a[cross], b[cross]], axis=1), axis=0) if cross.any() \
+        else np.zeros((0, 2), dtype=np.int32)
+
+    dag_indptr = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(pairs[:, 0], minlength=count), out=dag_indptr[1:])
+    dag_indices = pairs[:, 1].astype(np.int32)
+
+    # Longest chain of SCCs above each one: peel sources level by level
+    level = np.zeros(count, dtype=np.int32)
+    indegree = np.bincount(dag_indices, minlength=count)
+    frontier = np.flatnonzero(indegree == 0)
+    depth = 0
+    while len(frontier):
+        level[frontier] = depth
+        targets, hits = np.unique(_neighbours(dag_indptr, dag_indices, frontier), return_counts=True)
+        indegree[targets] -= hits
+        frontier = targets[indegree[targets] == 0]
+        depth += 1
+
+    return dag_indptr, dag_indices, level
+
+
+# ======================================================
+# BUILD / SAVE
+# ======================================================
+
+def build_component_index(
+    engine,
+    node_subjects: Optional[Sequence[Sequence[str]]] = None,
+    source: Optional[dict] = None,
+) -> Dict[str, np.ndarray]:
+    """Arrays for ComponentIndex from a PathEngine's CSR adjacency."""
+    und_indptr, und_indices = engine.undirected()
+    wcc = weak_components(und_indptr, und_indices)
+    scc = strong_components(engine.fwd_indptr, engine.fwd_indices)
+
+    wcc_count = int(wcc.max()) + 1 if len(wcc) else 0
+    scc_count = int(scc.max()) + 1 if len(scc) else 0
+    dag_indptr, dag_indices, level = condensation(engine.fwd_indptr, engine.fwd_indices, scc, scc_count)
+
+    # Most common subjects per weak component
+    subjects: Dict[str, int] = {}
+    per_component: Dict[int, Dict[int, int]] = {}
+    for i, names in enumerate(node_subjects or []):
+        counts = per_component.setdefault(int(wcc[i]), {})
+        for name in names:
+            sid = subjects.setdefault(name, len(subjects))
+            counts[sid] = counts.get(sid, 0) + 1
+
+    subject_indptr = [0]
+    subject_ids, subject_counts = [], []
+    for c in range(wcc_count):
+        top = sorted(per_component.get(c, {}).items(), key=lambda kv: (-kv[1], kv[0]))[:TOP_SUBJECTS]
+        subject_ids.extend(s for s, _ in top)
+        subject_counts.extend(k for _, k in top)
+        subject_indptr.append(len(subject_ids))
+
+    subject_offsets, subject_blob = pack_strings(list(subjects))
+    meta = {"version": INDEX_VERSION, "source": source, "node_count": len(wcc)}
+
+    return {
+        "meta": encode_meta(meta),
+        "wcc": wcc,
+        "scc": scc,
+        "wcc_size": np.bincount(wcc, minlength=wcc_count).astype(np.int32),
+        "scc_size": np.bincount(scc, minlength=scc_count).astype(np.int32),
+        "dag_indptr": dag_indptr,
+        "dag_indices": dag_indices,
+        "level": level,
+        "subject_offsets": subject_offsets,
+        "subject_blob": subject_blob,
+        "wcc_subject_indptr": np.asarray(subject_indptr, dtype=np.int64),
+        "wcc_subject_ids": np.asarray(subject_ids, dtype=np.int32),
+        "wcc_subject_counts": np.asarray(subject_counts, dtype=np.int32),
+    }
+
+
+def save_component_index(index: Dict[str, np.ndarray], path: Path):
+    save_arrays(index, path)
+
+
+# ======================================================
+# QUERY
+# ======================================================
+
+class ComponentIndex:
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.meta = decode_meta(arrays["meta"])
+        self.wcc = arrays["wcc"]
+        self.scc = arrays["scc"]
+        self.wcc_size = arrays["wcc_size"]
+        self.scc_size = arrays["scc_size"]
+        self.dag_indptr = arrays["dag_indptr"]
+        self.dag_indices = arrays["dag_indices"]
+        self.level = arrays["level"]
+        self.subjects = unpack_strings(arrays["subject_offsets"], arrays["subject_blob"])
+        self.wcc_subject_indptr = arrays["wcc_subject_indptr"]
+        self.wcc_subject_ids = arrays["wcc_subject_ids"]
+        self.wcc_subject_counts = arrays["wcc_subject_counts"]
+
+    @classmethod
+    def load(cls, path: Path) -> "ComponentIndex":
+        return cls(load_arrays(path))
+
+    @property
+    def node_count(self) -> int:
+        return len(self.wcc)
+
+    # --------------------------------------------------
+    # O(1) checks
+    # --------------------------------------------------
+    def why_unreachable(self, s: int, t: int, directed: bool = True) -> Optional[str]:
+        """
+        Reason there is certainly no s → t path, or None if there may be
+        one. Constant time.
+        """
+        if s == t:
+            return None
+        if self.wcc[s] != self.wcc[t]:
+            return "different_components"
+        if not directed:
+            return None
+
+        cs, ct = self.scc[s], self.scc[t]
+        if cs == ct:
+            return None
+        if self.level[cs] >= self.level[ct]:
+            return "target_upstream"
+        return None
+
+    def reachable(self, s: int, t: int, directed: bool = True) -> bool:
+        """Exact reachability, from the O(1) checks or a walk of the DAG."""
+        if s == t:
+            return True
+        if self.why_unreachable(s, t, directed) is not None:
+            return False
+        if not directed:
+            return True
+
+        cs, ct = int(self.scc[s]), int(self.scc[t])
+        if cs == ct:
+            return True
+
+        # Only components strictly between the two levels can lie on a path
+        target_level = self.level[ct]
+        seen = np.zeros(len(self.level), dtype=bool)
+        seen[cs] = True
+        frontier = np.asarray([cs], dtype=np.int32)
+        while len(frontier):
+            nxt = _neighbours(self.dag_indptr, self.dag_indices, frontier)
+            if (nxt == ct).any():
+                return True
+            nxt = np.unique(nxt[~seen[nxt] & (self.level[nxt] < target_level)])
+            seen[nxt] = True
+            frontier = nxt
+        return False
+
+    # --------------------------------------------------
+    # Display
+    # --------------------------------------------------
+    def describe(self, i: int) -> dict:
+        """Component facts for one node (for the Find Connection page)."""
+        c = int(self.wcc[i])
+        lo, hi = self.wcc_subject_indptr[c], self.wcc_subject_indptr[c + 1]
+        return {
+            "component": c,
+            "component_size": int(self.wcc_size[c]),
+            "component_count": len(self.wcc_size),
+            "scc_size": int(self.scc_size[self.scc[i]]),
+            "subjects": [
+                (self.subjects[s], int(k))
+                for s, k in zip(self.wcc_subject_ids[lo:hi].tolist(), self.wcc_subject_counts[lo:hi].tolist())
+            ],
+        }
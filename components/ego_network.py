@@ -0,0 +1,213 @@
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from components.path_engine import PathEngine, csr_slots
+
+# ======================================================
+# EGO NETWORK
+# ======================================================
+#
+# The neighbourhood of a few centre nodes, small enough to send to the
+# browser, instead of the whole graph.
+#
+# Rings are grown level by level over the path engine's CSR arrays (both
+# directions, like undirected search). Each ring's candidates are ranked
+#
+#   1. by the best edge type linking them to the previous ring
+#      (position in type_priority; unlisted types rank after listed),
+#   2. by score (centrality, e.g. the analytics table's PageRank),
+#   3. by node id, so the selection is deterministic,
+#
+# and taken until the node budget is spent. Only the nodes taken go on
+# to seed the next ring.
+#
+# reserve() then picks, for every shown node, its best few hidden
+# neighbours in the same order; they ship with the page so the browser
+# can expand a node without a rerun.
+
+DEFAULT_HOPS = 2
+DEFAULT_BUDGET = 150
+
+# Structural edge types first; everything else (related_to, uses, …) after
+DEFAULT_TYPE_PRIORITY = ["is_a", "instance_of", "part_of", "requires", "foundation_for", "extends"]
+
+# Hidden neighbours shipped per shown node, and in total
+RESERVE_PER_NODE = 10
+RESERVE_BUDGET = 1_000
+
+
+class EgoNetwork(NamedTuple):
+    ids: np.ndarray      # shown node ids: centres, then ring by ring in rank order
+    hops: np.ndarray     # ring of each shown node (0 = centre)
+    src: np.ndarray      # edges among shown nodes, in edge direction
+    dst: np.ndarray
+    types: np.ndarray    # edge type ids (-1 = untyped)
+    hidden: np.ndarray   # neighbours of each shown node that are not shown
+
+
+class Reserve(NamedTuple):
+    ids: np.ndarray      # hidden nodes shipped for expansion
+    parent: np.ndarray   # the shown node each one expands from
+    src: np.ndarray      # edges linking reserve nodes to shown / reserve nodes
+    dst: np.ndarray
+    types: np.ndarray
+
+
+def _type_rank(engine: PathEngine, type_priority: Optional[Sequence[str]]) -> np.ndarray:
+    """Rank by type id; the extra last slot is type -1 (untyped)."""
+    priority = list(type_priority or [])
+    rank = np.full(len(engine.edge_types) + 1, len(priority), dtype=np.int64)
+    for i, name in enumerate(engine.edge_types):
+        if name in priority:
+            rank[i] = priority.index(name)
+    return rank
+
+
+def _incident(engine: PathEngine, nodes: np.ndarray):
+    """(node, neighbour, type id, outgoing?) for every edge touching nodes."""
+    out_slots, out_from = csr_slots(engine.fwd_indptr, nodes)
+    in_slots, in_from = csr_slots(engine.rev_indptr, nodes)
+    return (
+        np.concatenate([out_from, in_from]).astype(np.int64),
+        np.concatenate([engine.fwd_indices[out_slots], engine.rev_indices[in_slots]]).astype(np.int64),
+        np.concatenate([engine.fwd_types[out_slots], engine.rev_types[in_slots]]),
+        np.concatenate([np.ones(len(out_slots), dtype=bool), np.zeros(len(in_slots), dtype=bool)]),
+    )
+
+
+def _ranked(origin, neighbour, rank, score):
+    """Unique (origin, neighbour) pairs, each origin's best first."""
+    order = np.lexsort((neighbour, -score[neighbour], rank, neighbour, origin))
+    origin, neighbour, rank = origin[order], neighbour[order], rank[order]
+
+    # Several edges between a pair: keep the best-ranked one
+    first = np.ones(len(origin), dtype=bool)
+    first[1:] = (origin[1:] != origin[:-1]) | (neighbour[1:] != neighbour[:-1])
+    origin, neighbour, rank = origin[first], neighbour[first], rank[first]
+
+    order = np.lexsort((neighbour, -score[neighbour], rank, origin))
+    return origin[order], neighbour[order]
+
+
+def _edges_within(engine: PathEngine, shown: np.ndarray, members: np.ndarray):
+    """Directed edges from members to any shown node (shown is a mask)."""
+    slots, src = csr_slots(engine.fwd_indptr, members)
+    dst = engine.fwd_indices[slots].astype(np.int64)
+    keep = shown[dst]
+    return src[keep].astype(np.int64), dst[keep], engine.fwd_types[slots][keep]
+
+
+def ego_network(
+    engine: PathEngine,
+    centers: Sequence[int],
+    hops: int = DEFAULT_HOPS,
+    budget: int = DEFAULT_BUDGET,
+    type_priority: Optional[Sequence[str]] = DEFAULT_TYPE_PRIORITY,
+    scores: Optional[np.ndarray] = None,
+) -> EgoNetwork:
+    """The up-to-budget-node, up-to-hops neighbourhood of centers (node ids)."""
+    n = engine.node_count
+    score = np.zeros(n) if scores is None else np.nan_to_num(np.asarray(scores, dtype=np.float64), nan=0.0)
+    rank = _type_rank(engine, type_priority)
+
+    ring = np.full(n, -1, dtype=np.int64)
+    centers = np.asarray(list(dict.fromkeys(int(c) for c in centers)), dtype=np.int64)[:budget]
+    ring[centers] = 0
+    chosen = [centers]
+    count = len(centers)
+
+    frontier = centers
+    for depth in range(1, hops + 1):
+        if count >= budget or not len(frontier):
+            break
+        origin, neighbour, types, _ = _incident(engine, frontier)
+        new = ring[neighbour] < 0
+        _, candidates = _ranked(np.zeros(int(new.sum()), dtype=np.int64), neighbour[new], rank[types[new]], score)
+        frontier = candidates[:budget - count]
+        ring[frontier] = depth
+        chosen.append(frontier)
+        count += len(frontier)
+
+    ids = np.concatenate(chosen)
+    shown = ring >= 0
+    src, dst, types = _edges_within(engine, shown, ids)
+
+    origin, neighbour, _, _ = _incident(engine, ids)
+    keep = ~shown[neighbour]
+    pairs = np.unique(origin[keep] * n + neighbour[keep])
+    hidden = np.bincount(pairs // n, minlength=n)[ids]
+
+    return EgoNetwork(ids, ring[ids], src, dst, types, hidden)
+
+
+def reserve(
+    engine: PathEngine,
+    ego: EgoNetwork,
+    per_node: int = RESERVE_PER_NODE,
+    limit: int = RESERVE_BUDGET,
+    type_priority: Optional[Sequence[str]] = DEFAULT_TYPE_PRIORITY,
+    scores: Optional[np.ndarray] = None,
+) -> Reserve:
+    """
+    Up to per_node hidden neighbours per shown node (ranked like the
+    rings), at most limit overall, taken in the ego network's order; a
+    neighbour of several shown nodes is reserved once, under the first.
+    """
+    n = engine.node_count
+    score = np.zeros(n) if scores is None else np.nan_to_num(np.asarray(scores, dtype=np.float64), nan=0.0)
+    rank = _type_rank(engine, type_priority)
+
+    shown = np.zeros(n, dtype=bool)
+    shown[ego.ids] = True
+    position = np.full(n, -1, dtype=np.int64)
+    position[ego.ids] = np.arange(len(ego.ids))
+
+    origin, neighbour, types, _ = _incident(engine, ego.ids)
+    keep = ~shown[neighbour]
+    origin, neighbour = _ranked(origin[keep], neighbour[keep], rank[types[keep]], score)
+
+    # First per_node per origin, origins in ego order
+    starts = np.flatnonzero(np.r_[True, origin[1:] != origin[:-1]])
+    within = np.arange(len(origin)) - np.repeat(starts, np.diff(np.r_[starts, len(origin)]))
+    keep = within < per_node
+    origin, neighbour, within = origin[keep], neighbour[keep], within[keep]
+    order = np.lexsort((within, position[origin]))
+    origin, neighbour = origin[order], neighbour[order]
+
+    _, first = np.unique(neighbour, return_index=True)
+    first = np.sort(first)[:limit]
+    ids, parent = neighbour[first], origin[first]
+
+    present = shown.copy()
+    present[ids] = True
+    src, dst, types = _edges_within(engine, present, ids)
+    # Edges from shown nodes into the reserve
+    slots, s = csr_slots(engine.rev_indptr, ids)
+    d = engine.rev_indices[slots].astype(np.int64)
+    into = shown[d]
+    src = np.concatenate([src, d[into]])
+    dst = np.concatenate([dst, s[into].astype(np.int64)])
+    types = np.concatenate([types, engine.rev_types[slots][into]])
+
+    return Reserve(ids, parent, src, dst, types)
+
+
+def center_ids(engine: PathEngine, names: Sequence[str], scores: Optional[np.ndarray] = None, limit: Optional[int] = None) -> List[int]:
+    """Node ids for names (unknown names dropped), most central first."""
+    ids = [i for i in (engine.node_id(name) for name in names) if i is not None]
+    if scores is not None:
+        score = np.nan_to_num(np.asarray(scores, dtype=np.float64), nan=0.0)
+        ids.sort(key=lambda i: (-score[i], i))
+    return ids[:limit]
+
+
+def edge_type_names(engine: PathEngine, types: np.ndarray) -> List[str]:
+    return [engine.edge_types[t] if t >= 0 else "" for t in types.tolist()]
+
+
+def type_counts(engine: PathEngine) -> Dict[str, int]:
+    """Edges per type, most common first (for the priority picker)."""
+    counts = np.bincount(engine.fwd_types + 1, minlength=len(engine.edge_types) + 1)[1:]
+    order = np.argsort(-counts, kind="stable")
+    return {engine.edge_types[i]: int(counts[i]) for i in order if counts[i]}
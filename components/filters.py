@@ -1,4 +1,16 @@
-def filter_nodes(G, query="", subject=None):
+from components.graph_loader import load_bitmap_index, load_search_index
+
+
+def _substring_matches(G, query="", subject=None):
+    # Subject membership from the bitmap index instead of every node's list
+    bitmaps = load_bitmap_index() if subject else None
+    if bitmaps is not None:
+        q = query.lower()
+        return [
+            n for n in bitmaps.node_names(bitmaps.bits("subject", subject))
+            if n in G and q in n.lower()
+        ]
+
     nodes = []
 
     for n, props in G.nodes(data=True):
@@ -12,3 +24,24 @@ def filter_nodes(G, query="", subject=None):
         nodes.append(n)
 
     return nodes
+
+
+def filter_nodes(G, query="", subject=None):
+    """
+    Nodes whose name contains query (case-insensitive), limited to subject
+    if given. When the pipeline built the BM25 index its hits are added,
+    best first, ahead of the other matches; it never drops a substring
+    match (BM25 ignores stopwords and partial words).
+    """
+    matches = _substring_matches(G, query, subject)
+
+    index = load_search_index() if query else None
+    if index is None:
+        return matches
+
+    ranked = [
+        n for n, _ in index.search(query, k=None, subjects=[subject] if subject else None)
+        if n in G
+    ]
+    seen = set(ranked)
+    return ranked + [n for n in matches if n not in seen]
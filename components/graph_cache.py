@@ -0,0 +1,319 @@
+import hashlib
+import threading
+import time
+from typing import NamedTuple, Optional
+
+import networkx as nx
+import numpy as np
+
+from components import graph_loader
+from components.analytics import GraphAnalytics, analytics_for_engine
+from components.analytics_table import AnalyticsTable, build_analytics_table
+from components.communities import detect_communities
+from components.graph_layout import Layout
+from components.path_engine import PathEngine
+from components.sampling import DEFAULT_SIZE, DEFAULT_TOP_K, Sample, stratified_sample
+from components.supernodes import Overview, build_overview, subject_labels
+
+# ======================================================
+# SHARED GRAPH HANDLE
+# ======================================================
+#
+# One read-only graph per process, shared by every Streamlit session and
+# page. It is keyed on the graph file's size/mtime (cheap check on every
+# call) and content hash (only computed when the stat changes), and is
+# swapped atomically when the pipeline writes a new graph.
+#
+# A page should call shared_graph() once per rerun and use that handle
+# throughout, so the whole rerun sees one consistent version: every
+# shared_*() helper below takes it, and only uses index files built from
+# that version of the graph.
+
+
+class GraphHandle(NamedTuple):
+    G: nx.DiGraph      # frozen: mutating it raises
+    data: dict         # raw merged_graph.json payload (read-only by convention)
+    version: str       # content hash of merged_graph.json
+    loaded_at: float
+    source: dict       # size / mtime_ns of the file (see source_fingerprint)
+
+
+_lock = threading.Lock()
+_current: Optional[GraphHandle] = None
+_current_stat = None
+_stats = {"hits": 0, "misses": 0, "reloads": 0, "revalidations": 0}
+
+# (graph version, (landmarks, components, reachability), PathEngine) for
+# shared_path_engine(); indexes compared by identity, since
+# graph_loader reloads a changed index file into a new object
+_engine = None
+
+# (graph version, GraphAnalytics) for shared_analytics()
+_analytics = None
+
+# (graph version, AnalyticsTable) computed by shared_analytics_table()
+# while the pipeline's file is missing
+_table = None
+
+# grouping → (graph version, Layout or None, Overview) for shared_overview()
+_overviews = {}
+
+# (size, top_k) → (graph version, Sample) for shared_sample()
+_samples = {}
+SAMPLE_CACHE_SIZE = 16
+
+
+def _stat_key():
+    st = graph_loader.GRAPH_FILE.stat()
+    return st.st_size, st.st_mtime_ns
+
+
+def _content_hash() -> str:
+    digest = hashlib.sha256()
+    with open(graph_loader.GRAPH_FILE, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _build(version: str, stat) -> GraphHandle:
+    G, data = graph_loader.load_graph()
+    source = {"size": stat[0], "mtime_ns": stat[1]}
+    return GraphHandle(nx.freeze(G), data, version, time.time(), source)
+
+
+def _fresh(index, handle: GraphHandle):
+    """index if it was built from handle's graph file, else None."""
+    if index is None or index.meta.get("source") != handle.source:
+        return None
+    return index
+
+
+def shared_graph() -> GraphHandle:
+    """
+    The process-wide graph handle, reloaded if merged_graph.json changed.
+
+    While one thread rebuilds, other callers keep getting the previous
+    version instead of blocking (only the very first load waits).
+    """
+    global _current, _current_stat
+
+    if not graph_loader.GRAPH_FILE.exists():
+        raise FileNotFoundError(f"Graph not found: {graph_loader.GRAPH_FILE}")
+
+    current = _current
+    if current is not None and _current_stat == _stat_key():
+        _stats["hits"] += 1
+        return current
+
+    if not _lock.acquire(blocking=current is None):
+        _stats["hits"] += 1
+        return current
+
+    try:
+        # Another thread may have swapped while we waited for the lock
+        stat = _stat_key()
+        if _current is not None and _current_stat == stat:
+            _stats["hits"] += 1
+            return _current
+
+        version = _content_hash()
+
+        if _current is not None and _current.version == version:
+            # Touched but identical content: indexes are now built
+            # against the new stat
+            _stats["revalidations"] += 1
+            _current = _current._replace(source={"size": stat[0], "mtime_ns": stat[1]})
+            _current_stat = stat
+            return _current
+
+        handle = _build(version, stat)
+        _stats["misses" if _current is None else "reloads"] += 1
+
+        # Publish the handle before the stat so readers never pair a new
+        # stat with an old graph
+        _current = handle
+        _current_stat = stat
+        return handle
+    finally:
+        _lock.release()
+
+
+def shared_path_engine(handle: Optional[GraphHandle] = None) -> PathEngine:
+    """
+    Path engine for handle's graph version (default: the current one):
+    the snapshot's CSR arrays when there is an up-to-date snapshot (else
+    built from the shared DiGraph), with ALT landmarks and the component
+    and reachability indexes when build_path_index.py has run. Rebuilt
+    when those indexes are (re)written for this version.
+    """
+    global _engine
+
+    if handle is None:
+        handle = shared_graph()
+    indexes = (
+        _fresh(graph_loader.load_landmarks(), handle),
+        _fresh(graph_loader.load_component_index(), handle),
+        _fresh(graph_loader.load_reachability_index(), handle),
+    )
+    cached = _engine
+    if cached is not None and cached[0] == handle.version and all(a is b for a, b in zip(cached[1], indexes)):
+        return cached[2]
+
+    landmarks, components, reachability = indexes
+    snapshot = graph_loader.load_snapshot()
+    if snapshot is not None and snapshot.header.get("source") != handle.source:
+        # Written for a newer graph than this rerun's
+        snapshot.close()
+        snapshot = None
+    if snapshot is not None:
+        engine = PathEngine.from_snapshot(snapshot, landmarks, components, reachability)
+    else:
+        engine = PathEngine.from_graph(handle.G, landmarks, components, reachability)
+
+    _engine = (handle.version, indexes, engine)
+    return engine
+
+
+def shared_analytics(handle: Optional[GraphHandle] = None) -> GraphAnalytics:
+    """
+    Centrality analytics over the path engine's arrays. Results live as
+    long as the graph's structure is unchanged (see analytics.py).
+    """
+    global _analytics
+
+    if handle is None:
+        handle = shared_graph()
+    cached = _analytics
+    if cached is not None and cached[0] == handle.version:
+        return cached[1]
+
+    analytics = analytics_for_engine(shared_path_engine(handle))
+    _analytics = (handle.version, analytics)
+    return analytics
+
+
+def shared_analytics_table(handle: Optional[GraphHandle] = None) -> AnalyticsTable:
+    """
+    The per-node analytics table written by build_analytics.py. Without
+    an up-to-date file it is computed here from shared_analytics(),
+    minus communities (left to the pipeline), until the file appears.
+    """
+    global _table
+
+    if handle is None:
+        handle = shared_graph()
+    table = _fresh(graph_loader.load_analytics_table(), handle)
+    if table is not None:
+        return table
+
+    cached = _table
+    if cached is not None and cached[0] == handle.version:
+        return cached[1]
+
+    analytics = shared_analytics(handle)
+    nodes = handle.data.get("nodes", {})
+    subjects = [nodes.get(name, {}).get("metadata", {}).get("subjects", []) for name in analytics.names]
+    table = AnalyticsTable(build_analytics_table(analytics, subjects))
+
+    _table = (handle.version, table)
+    return table
+
+
+def shared_layout(handle: Optional[GraphHandle] = None) -> Optional[Layout]:
+    """
+    Node coordinates written by build_layout.py, or None until that file
+    is up to date: the layout is too slow to compute in a request, and
+    the drawing falls back to vis.js physics.
+    """
+    if handle is None:
+        handle = shared_graph()
+    return _fresh(graph_loader.load_layout(), handle)
+
+
+def _subject_labels(handle: GraphHandle, names):
+    nodes = handle.data.get("nodes", {})
+    return subject_labels([nodes.get(name, {}).get("metadata", {}).get("subjects", []) for name in names])
+
+
+def shared_overview(grouping: str = "community", handle: Optional[GraphHandle] = None) -> Overview:
+    """
+    Supernode overview (supernodes.py) with one supernode per community
+    (the analytics table's, else detected here) or per subject (each
+    node's first), built once per graph version and layout.
+    """
+    if handle is None:
+        handle = shared_graph()
+    layout = shared_layout(handle)
+    cached = _overviews.get(grouping)
+    if cached is not None and cached[0] == handle.version and cached[1] is layout:
+        return cached[2]
+
+    analytics = shared_analytics(handle)
+    table = shared_analytics_table(handle)
+    if grouping == "community":
+        names = None
+        if table.has_communities:
+            labels = table.columns["community"].astype(np.int64)
+        else:
+            labels = detect_communities(analytics).labels()
+    elif grouping == "subject":
+        labels, names = _subject_labels(handle, analytics.names)
+    else:
+        raise ValueError(f"Unknown overview grouping: {grouping}")
+
+    overview = build_overview(
+        analytics, labels, names,
+        scores=table.columns["pagerank"],
+        positions=np.column_stack([layout.x, layout.y]) if layout is not None else None,
+    )
+    _overviews[grouping] = (handle.version, layout, overview)
+    return overview
+
+
+def shared_sample(
+    size: int = DEFAULT_SIZE,
+    top_k: int = DEFAULT_TOP_K,
+    handle: Optional[GraphHandle] = None,
+) -> Sample:
+    """
+    Stratified preview sample (sampling.py) by subject, degree and edge
+    type, always holding the top_k nodes by PageRank. Built once per
+    graph version and parameters.
+    """
+    if handle is None:
+        handle = shared_graph()
+    cached = _samples.get((size, top_k))
+    if cached is not None and cached[0] == handle.version:
+        return cached[1]
+
+    engine = shared_path_engine(handle)
+    labels, _ = _subject_labels(handle, engine.names)
+    sample = stratified_sample(engine, labels, size, top_k, shared_analytics_table(handle).columns["pagerank"])
+
+    _samples[(size, top_k)] = (handle.version, sample)
+    while len(_samples) > SAMPLE_CACHE_SIZE:
+        del _samples[next(iter(_samples))]
+    return sample
+
+
+def cache_stats() -> dict:
+    """hit / miss / reload / revalidation counters plus the live version."""
+    return dict(
+        _stats,
+        version=_current.version if _current is not None else None,
+        loaded_at=_current.loaded_at if _current is not None else None,
+    )
+
+
+def clear_cache():
+    """Drop the shared handle (next call reloads)."""
+    global _current, _current_stat, _engine, _analytics, _table
+    with _lock:
+        _current = None
+        _current_stat = None
+        _engine = None
+        _analytics = None
+        _table = None
+        _overviews.clear()
+        _samples.clear()
@@ -0,0 +1,374 @@
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+# ======================================================
+# SCHEMA
+# ======================================================
+#
+# Optional SQLite mirror of merged_graph.json, written by
+# pipelines/merge_graph.py --sqlite. Consumers that need one node, one
+# neighborhood or one subject query it instead of loading the whole graph.
+
+DB_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE nodes (
+    id          INTEGER PRIMARY KEY,
+    name        TEXT NOT NULL UNIQUE,
+    has_record  INTEGER NOT NULL,
+    type        TEXT,
+    domain      TEXT,
+    definition  TEXT,
+    description TEXT,
+    record      TEXT            -- full node JSON as in merged_graph.json
+);
+
+CREATE TABLE edges (
+    id     INTEGER PRIMARY KEY,  -- position in merged_graph.json
+    source INTEGER NOT NULL REFERENCES nodes(id),
+    target INTEGER NOT NULL REFERENCES nodes(id),
+    type   TEXT
+);
+CREATE INDEX edges_source ON edges(source, type);
+CREATE INDEX edges_target ON edges(target, type);
+CREATE INDEX edges_type   ON edges(type);
+
+CREATE TABLE subjects (
+    id           INTEGER PRIMARY KEY,
+    subject_id   TEXT NOT NULL UNIQUE,
+    display_name TEXT
+);
+
+CREATE TABLE source_files (
+    id      INTEGER PRIMARY KEY,
+    subject INTEGER NOT NULL REFERENCES subjects(id),
+    file    TEXT NOT NULL,
+    UNIQUE (subject, file)
+);
+
+CREATE TABLE node_subjects (
+    subject INTEGER NOT NULL REFERENCES subjects(id),
+    node    INTEGER NOT NULL REFERENCES nodes(id),
+    PRIMARY KEY (subject, node)
+) WITHOUT ROWID;
+CREATE INDEX node_subjects_node ON node_subjects(node);
+
+CREATE TABLE node_source_files (
+    node INTEGER NOT NULL REFERENCES nodes(id),
+    file TEXT NOT NULL,
+    PRIMARY KEY (node, file)
+) WITHOUT ROWID;
+CREATE INDEX node_source_files_file ON node_source_files(file);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE node_text USING fts5(
+    name, definition, description,
+    content='nodes', content_rowid='id'
+);
+"""
+
+
+def _text(value) -> Optional[str]:
+    return value if isinstance(value, str) else None
+
+
+def db_path(graph_path: Path) -> Path:
+    """merged_graph.json → merged_graph.sqlite"""
+    return graph_path.with_suffix(".sqlite")
+
+
+# ======================================================
+# WRITER
+# ======================================================
+
+def write_graph_db(graph: dict, path: Path, source: Optional[dict] = None):
+    """
+    Write the SQLite mirror of a merged graph dict.
+
+    `source` is the fingerprint of the JSON file it mirrors (size /
+    mtime_ns); GraphDB.open ignores a database whose source has changed.
+    The file is replaced atomically.
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    if tmp.exists():
+        tmp.unlink()
+
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.executescript(SCHEMA)
+
+        try:
+            conn.executescript(FTS_SCHEMA)
+            has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5 — search() falls back to LIKE
+            has_fts = False
+
+        nodes = graph.get("nodes", {})
+        ids = {}
+
+        def node_id(name):
+            if name not in ids:
+                ids[name] = len(ids) + 1
+                record = nodes.get(name)
+                if record is None:
+                    node_rows.append((ids[name], name, 0, None, None, None, None, None))
+                else:
+                    node_rows.append((
+                        ids[name], name, 1,
+                        _text(record.get("type")), _text(record.get("domain")),
+                        _text(record.get("definition")), _text(record.get("description")),
+                        json.dumps(record, ensure_ascii=False)
+                    ))
+            return ids[name]
+
+        node_rows = []
+        for name in nodes:
+            node_id(name)
+
+        edge_rows = []
+        for edge in graph.get("edges", []):
+            s, t = edge.get("source"), edge.get("target")
+            if not isinstance(s, str) or not isinstance(t, str):
+                continue
+            edge_rows.append((len(edge_rows), node_id(s), node_id(t), _text(edge.get("type", "related_to"))))
+
+        conn.executemany("INSERT INTO nodes VALUES (?, ?, ?, ?, ?, ?, ?, ?)", node_rows)
+        conn.executemany("INSERT INTO edges VALUES (?, ?, ?, ?)", edge_rows)
+
+        # --------------------------------------------------
+        # Subjects / source files / per-node provenance
+        # --------------------------------------------------
+        subject_ids = {}
+        for subject_id, info in graph.get("metadata", {}).get("subjects", {}).items():
+            cur = conn.execute(
+                "INSERT INTO subjects (subject_id, display_name) VALUES (?, ?)",
+                (subject_id, info.get("display_name"))
+            )
+            subject_ids[subject_id] = cur.lastrowid
+            conn.executemany(
+                "INSERT OR IGNORE INTO source_files (subject, file) VALUES (?, ?)",
+                [(cur.lastrowid, f) for f in info.get("files", [])]
+            )
+
+        for name, record in nodes.items():
+            meta = record.get("metadata", {}) if isinstance(record, dict) else {}
+            for subject_id in meta.get("subjects", []):
+                if subject_id not in subject_ids:
+                    cur = conn.execute(
+                        "INSERT INTO subjects (subject_id, display_name) VALUES (?, NULL)",
+                        (subject_id,)
+                    )
+                    subject_ids[subject_id] = cur.lastrowid
+                conn.execute(
+                    "INSERT OR IGNORE INTO node_subjects VALUES (?, ?)",
+                    (subject_ids[subject_id], ids[name])
+                )
+            conn.executemany(
+                "INSERT OR IGNORE INTO node_source_files VALUES (?, ?)",
+                [(ids[name], f) for f in meta.get("source_files", [])]
+            )
+
+        if has_fts:
+            conn.execute("INSERT INTO node_text(node_text) VALUES ('rebuild')")
+
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("version", str(DB_VERSION)),
+            ("source", json.dumps(source)),
+            ("fts", "1" if has_fts else "0"),
+            ("metadata", json.dumps(graph.get("metadata", {}), ensure_ascii=False)),
+        ])
+
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp, path)
+
+
+# ======================================================
+# QUERY API
+# ======================================================
+
+class GraphDB:
+    """
+    Read-only query API over the SQLite mirror.
+
+    Results use the same shapes as merged_graph.json: node records are
+    the original dicts and subgraphs are {"nodes": {...}, "edges": [...]}.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.meta = dict(conn.execute("SELECT key, value FROM meta"))
+        self.has_fts = self.meta.get("fts") == "1"
+
+    @classmethod
+    def open(cls, path: Path, source: Optional[Path] = None) -> Optional["GraphDB"]:
+        """
+        Open read-only, or return None if the database is missing,
+        unreadable or — when `source` is given — out of date.
+        """
+        if not Path(path).exists():
+            return None
+
+        try:
+            conn = sqlite3.connect(
+                f"file:{Path(path).as_posix()}?mode=ro",
+                uri=True,
+                check_same_thread=False
+            )
+            db = cls(conn)
+        except sqlite3.Error:
+            return None
+
+        if db.meta.get("version") != str(DB_VERSION):
+            conn.close()
+            return None
+
+        if source is not None:
+            try:
+                st = Path(source).stat()
+                current = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+            except OSError:
+                current = None
+            if json.loads(db.meta.get("source") or "null") != current:
+                conn.close()
+                return None
+
+        return db
+
+    def close(self):
+        self.conn.close()
+
+    @property
+    def metadata(self) -> dict:
+        return json.loads(self.meta.get("metadata") or "{}")
+
+    # --------------------------------------------------
+    # Nodes
+    # --------------------------------------------------
+    def node_names(self) -> List[str]:
+        return [r[0] for r in self.conn.execute("SELECT name FROM nodes ORDER BY id")]
+
+    def get_node(self, name: str) -> Optional[dict]:
+        """Node record, {} for an edge endpoint without one, None if unknown."""
+        row = self.conn.execute("SELECT record FROM nodes WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]) if row[0] is not None else {}
+
+    def node_records(self) -> Iterator[Tuple[str, dict]]:
+        """(name, record) for every node with a record, in id order."""
+        for name, record in self.conn.execute("SELECT name, record FROM nodes WHERE has_record ORDER BY id"):
+            yield name, json.loads(record)
+
+    def subject_nodes(self, subject_id: str) -> List[str]:
+        return [r[0] for r in self.conn.execute(
+            """
+            SELECT n.name
+            FROM node_subjects ns
+            JOIN subjects s ON s.id = ns.subject
+            JOIN nodes n ON n.id = ns.node
+            WHERE s.subject_id = ?
+            ORDER BY n.id
+            """,
+            (subject_id,)
+        )]
+
+    def subjects(self) -> List[str]:
+        return [r[0] for r in self.conn.execute("SELECT subject_id FROM subjects ORDER BY id")]
+
+    # --------------------------------------------------
+    # Edges
+    # --------------------------------------------------
+    def successors(self, name: str, edge_type: Optional[str] = None) -> List[dict]:
+        return self._incident(name, "source", "target", edge_type)
+
+    def predecessors(self, name: str, edge_type: Optional[str] = None) -> List[dict]:
+        return self._incident(name, "target", "source", edge_type)
+
+    def _incident(self, name, this, other, edge_type):
+        sql = f"""
+            SELECT s.name, e.type, t.name
+            FROM edges e
+            JOIN nodes s ON s.id = e.source
+            JOIN nodes t ON t.id = e.target
+            WHERE e.{this} = (SELECT id FROM nodes WHERE name = ?)
+        """
+        args = [name]
+        if edge_type is not None:
+            sql += " AND e.type = ?"
+            args.append(edge_type)
+
+        return [
+            {"source": s, "type": k, "target": t}
+            for s, k, t in self.conn.execute(sql + " ORDER BY e.id", args)
+        ]
+
+    def neighborhood(self, name: str, depth: int = 1, direction: str = "both") -> dict:
+        """
+        Subgraph within `depth` hops of a node.
+        direction: "out" (successors), "in" (predecessors) or "both".
+        """
+        if self.get_node(name) is None:
+            return {"nodes": {}, "edges": []}
+
+        seen = {name: None}
+        frontier = [name]
+        edges = {}
+
+        for _ in range(depth):
+            next_frontier = []
+            for current in frontier:
+                incident = []
+                if direction in ("out", "both"):
+                    incident += self.successors(current)
+                if direction in ("in", "both"):
+                    incident += self.predecessors(current)
+
+                for edge in incident:
+                    edges[(edge["source"], edge["type"], edge["target"])] = edge
+                    for endpoint in (edge["source"], edge["target"]):
+                        if endpoint not in seen:
+                            seen[endpoint] = None
+                            next_frontier.append(endpoint)
+            frontier = next_frontier
+
+        return {
+            "nodes": {n: self.get_node(n) for n in seen},
+            "edges": list(edges.values()),
+        }
+
+    # --------------------------------------------------
+    # Full text
+    # --------------------------------------------------
+    def search(self, query: str, limit: int = 20) -> List[str]:
+        """Node names whose name / definition / description match."""
+        if self.has_fts:
+            try:
+                return [r[0] for r in self.conn.execute(
+                    "SELECT name FROM node_text WHERE node_text MATCH ? ORDER BY rank LIMIT ?",
+                    (query, limit)
+                )]
+            except sqlite3.OperationalError:
+                pass  # not valid FTS syntax — plain substring search below
+
+        like = f"%{query}%"
+        return [r[0] for r in self.conn.execute(
+            """
+            SELECT name FROM nodes
+            WHERE name LIKE ? OR definition LIKE ? OR description LIKE ?
+            ORDER BY id LIMIT ?
+            """,
+            (like, like, like, limit)
+        )]
@@ -0,0 +1,265 @@
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from components.npz_store import (
+    decode_meta,
+    encode_meta,
+    load_arrays,
+    pack_strings,
+    save_arrays,
+    unpack_strings,
+)
+
+# ======================================================
+# GRAPH LAYOUT
+# ======================================================
+#
+# Fixed 2-D coordinates per node, computed once by
+# pipelines/build_layout.py so the browser draws the graph with physics
+# off instead of running vis.js' Barnes-Hut on every page load.
+#
+# Multilevel force-directed layout over the undirected sparse adjacency:
+#
+#   1. coarsen: repeatedly contract a matching of the graph (each node
+#      pairs with a neighbour by random edge priority, mutual choices
+#      win) until it is small or stops shrinking;
+#   2. lay out the coarsest graph from random positions;
+#   3. walk back up, placing every node at its coarse node's position
+#      (plus jitter) and refining with a few cooler iterations.
+#
+# Each iteration is Fruchterman-Reingold, vectorized: attraction d²/k
+# along edges, repulsion k²/d from every node (exactly below
+# EXACT_REPULSION_NODES, else from the mass centroids of a uniform grid).
+# Positions are then scaled so the median edge is EDGE_LENGTH pixels.
+
+LAYOUT_VERSION = 1
+
+EDGE_LENGTH = 120.0
+
+# Stop coarsening at this size, or when a round shrinks the graph < 20%
+COARSEST_NODES = 200
+MIN_SHRINK = 0.8
+
+# Pairwise repulsion up to this many nodes, grid centroids past it
+EXACT_REPULSION_NODES = 2_000
+GRID_CELLS = 32
+
+COARSEST_ITERATIONS = 300
+LEVEL_ITERATIONS = 40
+
+# Rows per block when evaluating repulsion (bounds temporary memory)
+BLOCK = 2_048
+
+
+def layout_path(graph_path: Path) -> Path:
+    """merged_graph.json → merged_graph.layout.npz"""
+    return graph_path.with_suffix(".layout.npz")
+
+
+# ======================================================
+# COARSENING
+# ======================================================
+
+def _symmetric(A: sp.csr_array) -> sp.csr_array:
+    A = sp.csr_array(A, dtype=np.float64)
+    A.setdiag(0)
+    A.eliminate_zeros()
+    return A
+
+
+def _matching(A: sp.csr_array, rng: np.random.Generator) -> Tuple[np.ndarray, int]:
+    """(coarse id per node, coarse count) from a few rounds of mutual proposals."""
+    n = A.shape[0]
+    partner = np.full(n, -1, dtype=np.int64)
+    rows = np.repeat(np.arange(n), np.diff(A.indptr))
+    cols = A.indices.astype(np.int64)
+
+    for _ in range(3):
+        free = (partner[rows] < 0) & (partner[cols] < 0)
+        if not free.any():
+            break
+        r, c = rows[free], cols[free]
+
+        # Each free node proposes along its highest-priority free edge
+        priority = rng.random(len(r))
+        order = np.lexsort((-priority, r))
+        r, c = r[order], c[order]
+        first = np.concatenate([[True], r[1:] != r[:-1]])
+        choice = np.full(n, -1, dtype=np.int64)
+        choice[r[first]] = c[first]
+
+        proposers = np.flatnonzero(choice >= 0)
+        mutual = proposers[choice[choice[proposers]] == proposers]
+        partner[mutual] = choice[mutual]
+
+    leader = np.where((partner >= 0) & (partner < np.arange(n)), partner, np.arange(n))
+    used = np.zeros(n, dtype=bool)
+    used[leader] = True
+    coarse = np.cumsum(used) - 1
+    return coarse[leader], int(used.sum())
+
+
+def _coarsen(A: sp.csr_array, rng: np.random.Generator) -> List[Tuple[sp.csr_array, Optional[np.ndarray]]]:
+    """[(graph, coarse id per node of the previous graph)], finest first."""
+    levels = [(A, None)]
+    while A.shape[0] > COARSEST_NODES:
+        mapping, count = _matching(A, rng)
+        if count > MIN_SHRINK * A.shape[0]:
+            break
+        C = A.tocoo()
+        A = _symmetric(sp.csr_array((C.data, (mapping[C.row], mapping[C.col])), shape=(count, count)))
+        levels.append((A, mapping))
+    return levels
+
+
+# ======================================================
+# FORCES
+# ======================================================
+
+def _push(points: np.ndarray, sources: np.ndarray, mass: np.ndarray, k: float) -> np.ndarray:
+    """
+    Σ over sources of mass * k² / d, away from each source. With
+    w = mass / d², the force on p is p Σ w - Σ w s: two matrix products
+    per block instead of (points × sources × 2) temporaries.
+    """
+    force = np.zeros_like(points)
+    norms = (sources ** 2).sum(axis=1)
+    floor = 1e-9 * k * k
+    for start in range(0, len(points), BLOCK):
+        block = points[start:start + BLOCK]
+        dist2 = (block ** 2).sum(axis=1)[:, None] + norms[None, :] - 2.0 * (block @ sources.T)
+        w = mass / np.maximum(dist2, floor)
+        force[start:start + BLOCK] = (block * w.sum(axis=1)[:, None] - w @ sources) * k * k
+    return force
+
+
+def _repulsion(pos: np.ndarray, k: float) -> np.ndarray:
+    n = len(pos)
+    if n < 2:
+        return np.zeros_like(pos)
+    if n <= EXACT_REPULSION_NODES:
+        return _push(pos, pos, np.ones(n), k)
+
+    # Far-away nodes act through the mass centroids of a uniform grid
+    lo, hi = pos.min(axis=0), pos.max(axis=0)
+    cell = np.minimum(((pos - lo) / np.maximum(hi - lo, 1e-9) * GRID_CELLS).astype(np.int64), GRID_CELLS - 1)
+    cell = cell[:, 0] * GRID_CELLS + cell[:, 1]
+    mass = np.bincount(cell, minlength=GRID_CELLS ** 2).astype(np.float64)
+    sums = np.stack([np.bincount(cell, weights=pos[:, d], minlength=GRID_CELLS ** 2) for d in (0, 1)], axis=1)
+    occupied = np.flatnonzero(mass)
+    centroid = sums[occupied] / mass[occupied, None]
+    force = _push(pos, centroid, mass[occupied], k)
+
+    # A node's own cell: swap the centroid it is part of for the
+    # centroid of the other nodes in that cell
+    slot = np.searchsorted(occupied, cell)
+    own_mass = mass[cell]
+    delta = pos - centroid[slot]
+    force -= delta * (own_mass * k * k / np.maximum((delta ** 2).sum(axis=1), 1e-9 * k * k))[:, None]
+    others = own_mass > 1
+    rest = (sums[cell[others]] - pos[others]) / (own_mass[others] - 1)[:, None]
+    delta = pos[others] - rest
+    force[others] += delta * ((own_mass[others] - 1) * k * k / np.maximum((delta ** 2).sum(axis=1), 1e-9 * k * k))[:, None]
+    return force
+
+
+def _attraction(pos: np.ndarray, rows: np.ndarray, cols: np.ndarray, weights: np.ndarray, k: float) -> np.ndarray:
+    delta = pos[rows] - pos[cols]
+    dist = np.sqrt((delta ** 2).sum(axis=1))
+    pull = delta * (weights * dist / k)[:, None]
+    return -np.stack([np.bincount(rows, weights=pull[:, d], minlength=len(pos)) for d in (0, 1)], axis=1)
+
+
+def _refine(A: sp.csr_array, pos: np.ndarray, iterations: int, temperature: float) -> np.ndarray:
+    k = 1.0
+    C = A.tocoo()
+    rows, cols = C.row.astype(np.int64), C.col.astype(np.int64)
+    weights = np.sqrt(C.data)  # contracted edges pull harder, but not linearly
+
+    for step in range(iterations):
+        force = _repulsion(pos, k) + _attraction(pos, rows, cols, weights, k)
+        length = np.maximum(np.sqrt((force ** 2).sum(axis=1)), 1e-12)
+        limit = temperature * (1.0 - step / iterations) + 1e-3
+        pos = pos + force * (np.minimum(length, limit) / length)[:, None]
+    return pos
+
+
+# ======================================================
+# LAYOUT
+# ======================================================
+
+def force_layout(A: sp.csr_array, seed: int = 0) -> np.ndarray:
+    """(n, 2) float32 positions for a (possibly directed) adjacency."""
+    n = A.shape[0]
+    if n == 0:
+        return np.zeros((0, 2), dtype=np.float32)
+
+    rng = np.random.default_rng(seed)
+    A = _symmetric(A + A.T)
+    levels = _coarsen(A, rng)
+
+    coarsest = levels[-1][0]
+    m = coarsest.shape[0]
+    pos = rng.uniform(-1.0, 1.0, size=(m, 2)) * np.sqrt(m)
+    pos = _refine(coarsest, pos, COARSEST_ITERATIONS, temperature=np.sqrt(m) / 4)
+
+    for (graph, _), (_, mapping) in zip(reversed(levels[:-1]), reversed(levels[1:])):
+        # Children start on their parent (scaled for the larger graph)
+        pos = pos[mapping] * np.sqrt(2.0) + rng.normal(scale=0.1, size=(len(mapping), 2))
+        pos = _refine(graph, pos, LEVEL_ITERATIONS, temperature=1.0)
+
+    # Median edge → EDGE_LENGTH pixels, centred on the origin
+    C = A.tocoo()
+    if len(C.row):
+        median = np.median(np.sqrt(((pos[C.row] - pos[C.col]) ** 2).sum(axis=1)))
+        pos = pos * (EDGE_LENGTH / max(median, 1e-9))
+    return (pos - pos.mean(axis=0)).astype(np.float32)
+
+
+def build_layout(analytics, seed: int = 0, source: Optional[dict] = None) -> Dict[str, np.ndarray]:
+    """Layout arrays for a GraphAnalytics (ids in snapshot order), ready for np.savez."""
+    pos = force_layout(analytics.adjacency(False), seed=seed)
+    meta = {
+        "version": LAYOUT_VERSION,
+        "source": source,
+        "graph_key": analytics.key,
+        "node_count": analytics.node_count,
+        "seed": seed,
+    }
+    offsets, blob = pack_strings([str(name) for name in analytics.names])
+    return {
+        "meta": encode_meta(meta),
+        "x": pos[:, 0],
+        "y": pos[:, 1],
+        "names_offsets": offsets,
+        "names_blob": blob,
+    }
+
+
+def save_layout(arrays: Dict[str, np.ndarray], path: Path):
+    save_arrays(arrays, path)
+
+
+class Layout:
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.meta = decode_meta(arrays["meta"])
+        self.x = arrays["x"]
+        self.y = arrays["y"]
+        self.names = unpack_strings(arrays["names_offsets"], arrays["names_blob"])
+        self.node_id = {name: i for i, name in enumerate(self.names)}
+
+    @classmethod
+    def load(cls, path: Path) -> "Layout":
+        return cls(load_arrays(path))
+
+    def __len__(self):
+        return len(self.names)
+
+    def position(self, name) -> Optional[Tuple[float, float]]:
+        i = self.node_id.get(str(name))
+        if i is None:
+            return None
+        return float(self.x[i]), float(self.y[i])
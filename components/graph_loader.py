@@ -2,14 +2,218 @@ import json
 import networkx as nx
 from pathlib import Path
 
+from components.graph_db import GraphDB, db_path
+from components.graph_layout import Layout, layout_path
+from components.graph_snapshot import (
+    NodeAttributes,
+    open_snapshot,
+    snapshot_path,
+    source_fingerprint,
+)
+from components.analytics_table import AnalyticsTable, analytics_table_path
+from components.autocomplete import AutocompleteIndex
+from components.betweenness import Betweenness, betweenness_path
+from components.bitmap_index import BitmapIndex, bitmap_path
+from components.component_index import ComponentIndex, component_path
+from components.path_engine import Landmarks, landmark_path
+from components.reachability_index import ReachabilityIndex, reachability_path
+from components.search_index import SearchIndex
+
 BASE_DIR = Path(__file__).resolve().parents[1]
 GRAPH_FILE = BASE_DIR / "data" / "graphs" / "merged_graph.json"
+SNAPSHOT_FILE = snapshot_path(GRAPH_FILE)
+DB_FILE = db_path(GRAPH_FILE)
+BITMAP_FILE = bitmap_path(GRAPH_FILE)
+LANDMARK_FILE = landmark_path(GRAPH_FILE)
+COMPONENT_FILE = component_path(GRAPH_FILE)
+REACHABILITY_FILE = reachability_path(GRAPH_FILE)
+BETWEENNESS_FILE = betweenness_path(GRAPH_FILE)
+ANALYTICS_FILE = analytics_table_path(GRAPH_FILE)
+LAYOUT_FILE = layout_path(GRAPH_FILE)
+SEARCH_INDEX_FILE = BASE_DIR / "data" / "indexes" / "search_index.npz"
+AUTOCOMPLETE_INDEX_FILE = BASE_DIR / "data" / "indexes" / "autocomplete_index.npz"
+
+# path → (index file mtime, index) — each index is loaded once per process
+_index_cache = {}
+
+# (database mtime, graph source fingerprint, GraphDB) — one read-only
+# connection per process, replaced (and the old one left to the garbage
+# collector, as other sessions may still be reading it) when either changes
+_graph_db = None
+
+
+class SnapshotGraphData(dict):
+    """
+    Stand-in for the raw JSON dict when loading from a snapshot.
+    "metadata" is available immediately; "nodes" / "edges" are decoded
+    from the snapshot the first time they are read.
+    """
+
+    def __init__(self, snapshot):
+        super().__init__(metadata=snapshot.metadata)
+        self._snapshot = snapshot
+
+    def __missing__(self, key):
+        if key not in ("nodes", "edges"):
+            raise KeyError(key)
+        self.update(self._snapshot.to_graph_dict())
+        return self[key]
+
+    def get(self, key, default=None):
+        if key in ("nodes", "edges"):
+            return self[key]
+        return super().get(key, default)
+
+
+class SnapshotDiGraph(nx.DiGraph):
+    """
+    DiGraph whose node attribute dicts are lazy NodeAttributes views of
+    a snapshot's records, through networkx's node_attr_dict_factory hook.
+    Nodes must be added in snapshot id order; the nodes past the last
+    record, and every node of a copy, get plain dicts.
+    """
+
+    def __init__(self, incoming_graph_data=None, snapshot=None, **attr):
+        self._snapshot = snapshot
+        self._records = iter(range(snapshot.header["record_count"] if snapshot is not None else 0))
+        super().__init__(incoming_graph_data, **attr)
+
+    def node_attr_dict_factory(self):
+        i = next(self._records, None)
+        return {} if i is None else NodeAttributes(self._snapshot, i)
+
+
+def graph_from_snapshot(snapshot):
+    """
+    Build the DiGraph from a snapshot without parsing any JSON text.
+    Node attributes are NodeAttributes views, decoded on first access.
+    """
+    names = snapshot.names()
+
+    G = SnapshotDiGraph(snapshot=snapshot)
+    G.add_nodes_from(names)
+
+    types = snapshot.edge_types
+    G.add_edges_from(
+        (names[s], names[t], {"type": types[k] if k >= 0 else None})
+        for s, t, k in zip(
+            snapshot.edge_src.tolist(),
+            snapshot.edge_dst.tolist(),
+            snapshot.edge_type.tolist()
+        )
+    )
+
+    return G
+
+
+def load_snapshot():
+    """
+    The memory-mapped snapshot itself (integer ids, CSR adjacency, lazy
+    text), or None if the pipeline has not written an up-to-date one.
+    """
+    return open_snapshot(SNAPSHOT_FILE, source=GRAPH_FILE)
+
+
+def load_graph_db():
+    """
+    Query API over the SQLite mirror (see graph_db.py), or None if the
+    pipeline was not run with --sqlite or the mirror is out of date.
+    Shared by every caller in the process: do not close it.
+    """
+    global _graph_db
+
+    try:
+        mtime = DB_FILE.stat().st_mtime_ns
+        source = source_fingerprint(GRAPH_FILE)
+    except OSError:
+        return None
+
+    cached = _graph_db
+    if cached is None or cached[:2] != (mtime, source):
+        cached = (mtime, source, GraphDB.open(DB_FILE, source=GRAPH_FILE))
+        _graph_db = cached
+    return cached[2]
+
+
+def _load_index(path, loader):
+    """
+    Index file derived from merged_graph.json, or None if it is missing
+    or was built from a different version of the graph.
+    """
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+    cached = _index_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, loader(path))
+        _index_cache[path] = cached
+
+    index = cached[1]
+    try:
+        if index.meta.get("source") != source_fingerprint(GRAPH_FILE):
+            return None
+    except OSError:
+        return None
+
+    return index
+
+
+def load_search_index():
+    """BM25 index written by pipelines/build_search_index.py, or None."""
+    return _load_index(SEARCH_INDEX_FILE, SearchIndex.load)
+
+
+def load_autocomplete_index():
+    """Node-name autocomplete index (see autocomplete.py), or None."""
+    return _load_index(AUTOCOMPLETE_INDEX_FILE, AutocompleteIndex.load)
+
+
+def load_bitmap_index():
+    """Subject / domain / type / source-file bitsets (see bitmap_index.py), or None."""
+    return _load_index(BITMAP_FILE, BitmapIndex.load)
+
+
+def load_landmarks():
+    """ALT landmark distances written by pipelines/build_path_index.py, or None."""
+    return _load_index(LANDMARK_FILE, Landmarks.load)
+
+
+def load_component_index():
+    """WCC / SCC ids and condensation DAG from build_path_index.py, or None."""
+    return _load_index(COMPONENT_FILE, ComponentIndex.load)
+
+
+def load_reachability_index():
+    """2-hop reachability labels per edge-type profile (see reachability_index.py), or None."""
+    return _load_index(REACHABILITY_FILE, ReachabilityIndex.load)
+
+
+def load_betweenness():
+    """Betweenness scores from pipelines/build_betweenness.py, or None."""
+    return _load_index(BETWEENNESS_FILE, Betweenness.load)
+
+
+def load_analytics_table():
+    """Per-node metrics and communities from pipelines/build_analytics.py, or None."""
+    return _load_index(ANALYTICS_FILE, AnalyticsTable.load)
+
+
+def load_layout():
+    """Fixed node coordinates from pipelines/build_layout.py, or None."""
+    return _load_index(LAYOUT_FILE, Layout.load)
 
 
 def load_graph():
     if not GRAPH_FILE.exists():
         raise FileNotFoundError(f"Graph not found: {GRAPH_FILE}")
 
+    # Fast path: memory-mapped snapshot written by the pipeline
+    snapshot = load_snapshot()
+    if snapshot is not None:
+        return graph_from_snapshot(snapshot), SnapshotGraphData(snapshot)
+
     with open(GRAPH_FILE, "r", encoding="utf-8") as f:
         data = json.load(f)
 
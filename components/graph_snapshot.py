@@ -0,0 +1,416 @@
+import copy
+import json
+import mmap
+import os
+import struct
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+# ======================================================
+# SNAPSHOT FORMAT
+# ======================================================
+#
+# One file, memory-mapped read-only by every reader:
+#
+#   MAGIC | u64 header length | header JSON | sections (8-byte aligned)
+#
+# The header lists every section as [offset, dtype, count]:
+#
+#   str_offsets  u64[N+1]   node name i = str_blob[str_offsets[i]:str_offsets[i+1]]
+#   str_blob     u8         UTF-8 node names (node id = position in the table)
+#   node_flags   u8[N]      HAS_RECORD / DEFINITION_TEXT / DESCRIPTION_TEXT
+#   edge_src     i32[E]     edges in merged_graph.json order
+#   edge_dst     i32[E]
+#   edge_type    i32[E]     index into header["edge_types"], -1 = missing
+#   fwd_indptr   i64[N+1]   CSR by source: edge ids fwd_eids[fwd_indptr[i]:...]
+#   fwd_eids     i32[E]
+#   fwd_indices  i32[E]     = edge_dst[fwd_eids]
+#   rev_indptr   i64[N+1]   CSR by target
+#   rev_eids     i32[E]
+#   rev_indices  i32[E]     = edge_src[rev_eids]
+#   text_offsets u64[3N+1]  per node: definition, description, remaining JSON
+#   text_blob    u8
+#
+# Nodes listed in graph["nodes"] come first (in file order), followed by
+# edge endpoints that have no record, in first-seen order — the same order
+# load_graph() builds the DiGraph in.
+
+MAGIC = b"KGSNAP01"
+SNAPSHOT_VERSION = 1
+
+HAS_RECORD = 1
+DEFINITION_TEXT = 2
+DESCRIPTION_TEXT = 4
+
+TEXT_FIELDS = ("definition", "description")
+TEXT_FLAGS = {"definition": DEFINITION_TEXT, "description": DESCRIPTION_TEXT}
+
+
+def snapshot_path(graph_path: Path) -> Path:
+    """merged_graph.json → merged_graph.snapshot"""
+    return graph_path.with_suffix(".snapshot")
+
+
+def source_fingerprint(graph_path: Path) -> dict:
+    st = graph_path.stat()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+# ======================================================
+# WRITER
+# ======================================================
+
+def _string_table(strings):
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    if encoded:
+        offsets[1:] = np.cumsum([len(b) for b in encoded])
+    return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def _csr(keys: np.ndarray, n: int):
+    order = np.argsort(keys, kind="stable").astype(np.int32)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=n), out=indptr[1:])
+    return indptr, order
+
+
+def write_snapshot(graph: dict, path: Path, source: Optional[dict] = None):
+    """
+    Write the binary snapshot of a merged graph dict.
+
+    `source` is the fingerprint of the JSON file the snapshot mirrors
+    (see source_fingerprint); readers ignore a snapshot whose source no
+    longer matches. The file is replaced atomically, so processes that
+    still map the previous snapshot keep a consistent view.
+    """
+    nodes = graph.get("nodes", {})
+
+    # --------------------------------------------------
+    # Node ids
+    # --------------------------------------------------
+    ids = {name: i for i, name in enumerate(nodes)}
+
+    edge_types = {}
+    src, dst, etype = [], [], []
+
+    for edge in graph.get("edges", []):
+        s, t = edge.get("source"), edge.get("target")
+        if not isinstance(s, str) or not isinstance(t, str):
+            continue  # not a valid DiGraph node
+
+        src.append(ids.setdefault(s, len(ids)))
+        dst.append(ids.setdefault(t, len(ids)))
+
+        kind = edge.get("type", "related_to")
+        etype.append(edge_types.setdefault(kind, len(edge_types)) if isinstance(kind, str) else -1)
+
+    n = len(ids)
+    names = list(ids)
+
+    edge_src = np.asarray(src, dtype=np.int32)
+    edge_dst = np.asarray(dst, dtype=np.int32)
+    fwd_indptr, fwd_eids = _csr(edge_src, n)
+    rev_indptr, rev_eids = _csr(edge_dst, n)
+
+    # --------------------------------------------------
+    # Node records: text fields split from the rest
+    # --------------------------------------------------
+    flags = np.zeros(n, dtype=np.uint8)
+    chunks = []
+
+    for i, name in enumerate(names):
+        record = nodes.get(name)
+        if record is None:
+            chunks.extend([b"", b"", b""])
+            continue
+
+        flags[i] |= HAS_RECORD
+        rest = dict(record)
+        for field in TEXT_FIELDS:
+            value = record.get(field)
+            if isinstance(value, str):
+                flags[i] |= TEXT_FLAGS[field]
+                rest[field] = None  # keeps the key order
+                chunks.append(value.encode("utf-8"))
+            else:
+                chunks.append(b"")
+
+        chunks.append(json.dumps(rest, ensure_ascii=False).encode("utf-8"))
+
+    text_offsets = np.zeros(len(chunks) + 1, dtype=np.uint64)
+    if chunks:
+        text_offsets[1:] = np.cumsum([len(c) for c in chunks])
+
+    str_offsets, str_blob = _string_table(names)
+
+    sections = {
+        "str_offsets": str_offsets,
+        "str_blob": str_blob,
+        "node_flags": flags,
+        "edge_src": edge_src,
+        "edge_dst": edge_dst,
+        "edge_type": np.asarray(etype, dtype=np.int32),
+        "fwd_indptr": fwd_indptr,
+        "fwd_eids": fwd_eids,
+        "fwd_indices": edge_dst[fwd_eids],
+        "rev_indptr": rev_indptr,
+        "rev_eids": rev_eids,
+        "rev_indices": edge_src[rev_eids],
+        "text_offsets": text_offsets,
+        "text_blob": np.frombuffer(b"".join(chunks), dtype=np.uint8),
+    }
+
+    # --------------------------------------------------
+    # Layout
+    # --------------------------------------------------
+    header = {
+        "version": SNAPSHOT_VERSION,
+        "source": source,
+        "node_count": n,
+        "record_count": len(nodes),
+        "edge_count": len(src),
+        "edge_types": list(edge_types),
+        "metadata": graph.get("metadata", {}),
+        "sections": {},
+    }
+
+    # Section offsets depend on the header size, which depends on the
+    # offsets: iterate to a fixed point, then pad to 8 bytes.
+    body_offset = 0
+    layout = {}
+    for name, array in sections.items():
+        layout[name] = (body_offset, array)
+        body_offset += (array.nbytes + 7) // 8 * 8
+
+    def encode_header(base):
+        header["sections"] = {
+            name: [base + off, array.dtype.str, int(array.size)]
+            for name, (off, array) in layout.items()
+        }
+        return json.dumps(header, ensure_ascii=False).encode("utf-8")
+
+    prefix = len(MAGIC) + 8
+    base = 0
+    while True:
+        raw = encode_header(base)
+        needed = (prefix + len(raw) + 7) // 8 * 8
+        if needed == base:
+            break
+        base = needed
+
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(raw)))
+        f.write(raw)
+        f.write(b"\0" * (base - prefix - len(raw)))
+        for name, (off, array) in layout.items():
+            data = array.tobytes()
+            f.write(data)
+            f.write(b"\0" * ((len(data) + 7) // 8 * 8 - len(data)))
+
+    os.replace(tmp, path)
+
+
+# ======================================================
+# READER
+# ======================================================
+
+class GraphSnapshot:
+    """
+    Read-only, memory-mapped view of a snapshot.
+
+    Arrays are zero-copy views into the mapping, so pages are shared by
+    every process that opens the same file, and text is only decoded for
+    the nodes that are actually looked at.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a graph snapshot: {self.path}")
+
+        (length,) = struct.unpack_from("<Q", self._mm, len(MAGIC))
+        start = len(MAGIC) + 8
+        self.header = json.loads(self._mm[start:start + length].decode("utf-8"))
+
+        if self.header.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {self.path}")
+
+        for name, (offset, dtype, count) in self.header["sections"].items():
+            array = np.frombuffer(self._mm, dtype=np.dtype(dtype), count=count, offset=offset)
+            setattr(self, name, array)
+
+        self.node_count = self.header["node_count"]
+        self.edge_count = self.header["edge_count"]
+        self.edge_types = self.header["edge_types"]
+        self.metadata = self.header["metadata"]
+        self._ids = None
+
+    # --------------------------------------------------
+    # Names
+    # --------------------------------------------------
+    def name(self, i: int) -> str:
+        start, end = self.str_offsets[i], self.str_offsets[i + 1]
+        return self.str_blob[start:end].tobytes().decode("utf-8")
+
+    def names(self):
+        blob = self.str_blob.tobytes()
+        offsets = self.str_offsets.tolist()
+        return [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(self.node_count)]
+
+    def node_id(self, name: str) -> Optional[int]:
+        if self._ids is None:
+            self._ids = {n: i for i, n in enumerate(self.names())}
+        return self._ids.get(name)
+
+    # --------------------------------------------------
+    # Adjacency
+    # --------------------------------------------------
+    def successors(self, i: int) -> np.ndarray:
+        return self.fwd_indices[self.fwd_indptr[i]:self.fwd_indptr[i + 1]]
+
+    def predecessors(self, i: int) -> np.ndarray:
+        return self.rev_indices[self.rev_indptr[i]:self.rev_indptr[i + 1]]
+
+    def edge_type_name(self, edge_id: int) -> Optional[str]:
+        t = int(self.edge_type[edge_id])
+        return self.edge_types[t] if t >= 0 else None
+
+    # --------------------------------------------------
+    # Node records
+    # --------------------------------------------------
+    def has_record(self, i: int) -> bool:
+        return bool(self.node_flags[i] & HAS_RECORD)
+
+    def _chunk(self, i: int, slot: int) -> str:
+        k = 3 * i + slot
+        start, end = self.text_offsets[k], self.text_offsets[k + 1]
+        return self.text_blob[start:end].tobytes().decode("utf-8")
+
+    def node_text(self, i: int, field: str, default=None):
+        """One text field (definition / description) without the rest."""
+        if not self.node_flags[i] & TEXT_FLAGS[field]:
+            return self.node_record(i).get(field, default)
+        return self._chunk(i, TEXT_FIELDS.index(field))
+
+    def node_record(self, i: int) -> dict:
+        """Full node dict as stored in merged_graph.json."""
+        if not self.has_record(i):
+            return {}
+
+        record = json.loads(self._chunk(i, 2))
+        for slot, field in enumerate(TEXT_FIELDS):
+            if self.node_flags[i] & TEXT_FLAGS[field]:
+                record[field] = self._chunk(i, slot)
+        return record
+
+    # --------------------------------------------------
+    # Reconstruction
+    # --------------------------------------------------
+    def to_graph_dict(self) -> dict:
+        """Rebuild the merged graph dict (decodes everything)."""
+        names = self.names()
+        records = self.header["record_count"]
+
+        edges = []
+        for s, t, k in zip(self.edge_src.tolist(), self.edge_dst.tolist(), self.edge_type.tolist()):
+            edge = {"source": names[s], "type": self.edge_types[k] if k >= 0 else None}
+            edge["target"] = names[t]
+            edges.append(edge)
+
+        return {
+            "nodes": {names[i]: self.node_record(i) for i in range(records)},
+            "edges": edges,
+            "metadata": self.metadata,
+        }
+
+    def close(self):
+        # Views into the mapping must go before the mapping itself
+        for name in self.header["sections"]:
+            self.__dict__.pop(name, None)
+        self._mm.close()
+
+
+def open_snapshot(path: Path, source: Optional[Path] = None) -> Optional[GraphSnapshot]:
+    """
+    Open a snapshot, or return None if it is missing, unreadable or —
+    when `source` is given — out of date with that JSON file.
+    """
+    try:
+        snapshot = GraphSnapshot(path)
+    except (OSError, ValueError):
+        return None
+
+    if source is not None:
+        try:
+            current = source_fingerprint(source)
+        except OSError:
+            current = None
+        if snapshot.header.get("source") != current:
+            snapshot.close()
+            return None
+
+    return snapshot
+
+
+# ======================================================
+# LAZY NODE ATTRIBUTES
+# ======================================================
+
+class NodeAttributes(MutableMapping):
+    """
+    Node attribute mapping backed by a snapshot.
+
+    `definition` / `description` are decoded on their own when asked for;
+    everything else is decoded on first access. Writes stay in memory.
+    """
+
+    __slots__ = ("_snapshot", "_index", "_data")
+
+    def __init__(self, snapshot: GraphSnapshot, index: int):
+        self._snapshot = snapshot
+        self._index = index
+        self._data = None
+
+    def _load(self) -> dict:
+        if self._data is None:
+            self._data = self._snapshot.node_record(self._index)
+        return self._data
+
+    def get(self, key, default=None):
+        if self._data is None and key in TEXT_FLAGS and self._snapshot.node_flags[self._index] & TEXT_FLAGS[key]:
+            return self._snapshot.node_text(self._index, key)
+        return self._load().get(key, default)
+
+    def __getitem__(self, key):
+        return self._load()[key]
+
+    def __setitem__(self, key, value):
+        self._load()[key] = value
+
+    def __delitem__(self, key):
+        del self._load()[key]
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def __len__(self):
+        return len(self._load())
+
+    def copy(self) -> dict:
+        return dict(self._load())
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(self._load(), memo)
+
+    def __repr__(self):
+        return repr(self._load())
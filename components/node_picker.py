@@ -0,0 +1,46 @@
+from typing import Optional
+
+import streamlit as st
+
+from components.autocomplete import AutocompleteIndex
+from components.graph_cache import shared_graph
+from components.graph_loader import load_autocomplete_index
+
+# (graph version, AutocompleteIndex) built in-process when the pipeline
+# has not written an up-to-date index file
+_fallback = {}
+
+
+def autocomplete_index() -> AutocompleteIndex:
+    index = load_autocomplete_index()
+    if index is not None:
+        return index
+
+    handle = shared_graph()
+    cached = _fallback.get("index")
+    if cached is None or cached[0] != handle.version:
+        cached = (handle.version, AutocompleteIndex.from_graph(handle.data))
+        _fallback["index"] = cached
+    return cached[1]
+
+
+def node_picker(label: str, key: str, limit: int = 20) -> Optional[str]:
+    """
+    Search-as-you-type node selector: a text box plus a selectbox holding
+    only the top `limit` matches (the most connected nodes when empty),
+    instead of every node in the graph.
+    """
+    index = autocomplete_index()
+
+    query = st.text_input(label, key=f"{key}_query", placeholder="Type to search nodes…")
+    options = [name for name, _ in index.complete(query, limit)]
+
+    if not options:
+        st.caption(f"No node matches “{query}”.")
+        return None
+
+    return st.selectbox(
+        f"{label} — {len(options)} best matches" if query else f"{label} — most connected",
+        options,
+        key=key,
+    )
@@ -0,0 +1,55 @@
+import json
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# ======================================================
+# NPZ STORE
+# ======================================================
+#
+# Shared encoding for the index files derived from merged_graph.json
+# (search, autocomplete, bitmaps, landmarks, components, reachability,
+# betweenness, analytics, layout, communities):
+#
+#   - "meta" is a JSON document stored as a uint8 array, so files load
+#     with allow_pickle=False;
+#   - string lists are packed as (offsets, utf-8 blob) pairs;
+#   - files are written to a temporary name and renamed into place, so a
+#     reader never sees a half-written index.
+
+
+def pack_strings(strings: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    if encoded:
+        offsets[1:] = np.cumsum([len(b) for b in encoded])
+    return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def unpack_strings(offsets: np.ndarray, blob: np.ndarray) -> List[str]:
+    raw = blob.tobytes()
+    bounds = offsets.tolist()
+    return [raw[bounds[i]:bounds[i + 1]].decode("utf-8") for i in range(len(bounds) - 1)]
+
+
+def encode_meta(meta: dict) -> np.ndarray:
+    return np.frombuffer(json.dumps(meta, ensure_ascii=False).encode("utf-8"), dtype=np.uint8)
+
+
+def decode_meta(array: np.ndarray) -> dict:
+    return json.loads(array.tobytes().decode("utf-8"))
+
+
+def save_arrays(arrays: Dict[str, np.ndarray], path: Path):
+    """np.savez to path, atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp.npz")
+    np.savez(tmp, **arrays)
+    tmp.replace(path)
+
+
+def load_arrays(path: Path) -> Dict[str, np.ndarray]:
+    """Every array of an .npz file, read into memory."""
+    with np.load(path, allow_pickle=False) as arrays:
+        return {k: arrays[k] for k in arrays.files}
@@ -0,0 +1,707 @@
+import heapq
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from components.npz_store import decode_meta, encode_meta, load_arrays, save_arrays
+
+# ======================================================
+# PATH ENGINE
+# ======================================================
+#
+# Shortest paths over integer CSR adjacency (the snapshot's arrays, or the
+# same layout built from a DiGraph), with no per-query Python graph walk.
+#
+# Queries run a level-synchronous bidirectional BFS, expanding the smaller
+# frontier one whole level at a time with vectorized numpy gathers. ALT
+# landmarks (distances to / from a handful of well-spread nodes, computed
+# once by pipelines/build_path_index.py) make it goal-directed:
+#   - lower bounds prune frontier nodes that cannot lead to a shorter path
+#     and answer many unreachable pairs before any search,
+#   - s → landmark → t gives an upper bound and a fallback path.
+#
+# Two modes: directed (follow edge direction) and undirected ("related in
+# any direction", every edge usable both ways).
+
+INDEX_VERSION = 1
+
+# Unreachable in the uint16 landmark distance tables
+INF = np.iinfo(np.uint16).max
+
+# Lower bound used for provably unreachable nodes
+UNREACHABLE = 1 << 30
+
+DEFAULT_LANDMARKS = 16
+
+# Landmarks consulted per query (those with the best bound for the pair)
+ACTIVE_LANDMARKS = 4
+
+# Smaller levels are cheaper to expand than to bound
+PRUNE_MIN_FRONTIER = 2048
+
+# Default budget for k_shortest_paths
+DEFAULT_MAX_SECONDS = 2.0
+DEFAULT_MAX_EXPANSIONS = 2_000_000
+
+
+def landmark_path(graph_path: Path) -> Path:
+    """merged_graph.json → merged_graph.landmarks.npz"""
+    return graph_path.with_suffix(".landmarks.npz")
+
+
+def _csr(keys: np.ndarray, values: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    order = np.argsort(keys, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=n), out=indptr[1:])
+    return indptr, values[order].astype(np.int32)
+
+
+def csr_slots(indptr: np.ndarray, frontier: np.ndarray):
+    """
+    (CSR slots of every edge out of the frontier, the node each leaves).
+    Shared with ego_network.py and other vectorized traversals.
+    """
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64), frontier[:0]
+
+    block_start = np.cumsum(counts) - counts
+    positions = np.repeat(starts - block_start, counts) + np.arange(total)
+    return positions, np.repeat(frontier, counts)
+
+
+def _gather(indptr: np.ndarray, indices: np.ndarray, frontier: np.ndarray):
+    """(neighbours, the frontier node each came from) for a whole frontier."""
+    positions, origins = csr_slots(indptr, frontier)
+    return indices[positions], origins
+
+
+def bfs_distances(indptr: np.ndarray, indices: np.ndarray, source: int) -> np.ndarray:
+    """Hop distance from source to every node (INF if unreachable)."""
+    n = len(indptr) - 1
+    dist = np.full(n, INF, dtype=np.uint16)
+    dist[source] = 0
+
+    frontier = np.asarray([source], dtype=np.int32)
+    depth = 0
+    while len(frontier):
+        depth += 1
+        neighbours, _ = _gather(indptr, indices, frontier)
+        neighbours = np.unique(neighbours[dist[neighbours] == INF])
+        dist[neighbours] = min(depth, INF - 1)
+        frontier = neighbours
+    return dist
+
+
+# ======================================================
+# LANDMARKS
+# ======================================================
+
+class Landmarks:
+    """
+    Per landmark L (rows) and node v (columns), uint16 hop counts:
+        dist_from[L, v] = d(L, v)      dist_to[L, v] = d(v, L)
+        dist_any[L, v]  = undirected distance
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.meta = decode_meta(arrays["meta"])
+        self.ids = arrays["landmarks"]
+        self.dist_from = arrays["dist_from"]
+        self.dist_to = arrays["dist_to"]
+        self.dist_any = arrays["dist_any"]
+
+    @classmethod
+    def load(cls, path: Path) -> "Landmarks":
+        return cls(load_arrays(path))
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def build_landmarks(engine: "PathEngine", count: int = DEFAULT_LANDMARKS, source: Optional[dict] = None) -> Dict[str, np.ndarray]:
+    """
+    Pick landmarks by farthest-point selection on the undirected graph
+    (ties and unreached components broken by degree, so every sizeable
+    component gets one) and BFS from each in all three modes.
+    """
+    n = engine.node_count
+    count = min(count, n)
+    und_indptr, und_indices = engine.undirected()
+    degree = np.diff(und_indptr)
+
+    # Distance to the closest chosen landmark; unreached nodes come first
+    closest = np.full(n, INF, dtype=np.int64)
+    chosen = []
+    dist_from, dist_to, dist_any = [], [], []
+
+    for _ in range(count):
+        far = closest.max()
+        candidates = np.flatnonzero(closest == far)
+        if far == 0 or len(candidates) == 0:
+            break
+        landmark = int(candidates[np.argmax(degree[candidates])])
+        chosen.append(landmark)
+
+        any_dist = bfs_distances(und_indptr, und_indices, landmark)
+        dist_any.append(any_dist)
+        dist_from.append(bfs_distances(engine.fwd_indptr, engine.fwd_indices, landmark))
+        dist_to.append(bfs_distances(engine.rev_indptr, engine.rev_indices, landmark))
+
+        closest = np.minimum(closest, any_dist)
+
+    def stack(rows):
+        return np.vstack(rows) if rows else np.zeros((0, n), dtype=np.uint16)
+
+    meta = {"version": INDEX_VERSION, "source": source, "node_count": n}
+    return {
+        "meta": encode_meta(meta),
+        "landmarks": np.asarray(chosen, dtype=np.int32),
+        "dist_from": stack(dist_from),
+        "dist_to": stack(dist_to),
+        "dist_any": stack(dist_any),
+    }
+
+
+def save_landmarks(arrays: Dict[str, np.ndarray], path: Path):
+    save_arrays(arrays, path)
+
+
+# ======================================================
+# ENGINE
+# ======================================================
+
+class PathEngine:
+    def __init__(
+        self,
+        names: List[str],
+        fwd_indptr: np.ndarray,
+        fwd_indices: np.ndarray,
+        rev_indptr: np.ndarray,
+        rev_indices: np.ndarray,
+        landmarks: Optional[Landmarks] = None,
+        edge_types: Optional[List[str]] = None,
+        fwd_types: Optional[np.ndarray] = None,
+        rev_types: Optional[np.ndarray] = None,
+        components=None,
+        reachability=None,
+    ):
+        self.names = names
+        self.node_count = len(names)
+        self.fwd_indptr, self.fwd_indices = fwd_indptr, fwd_indices
+        self.rev_indptr, self.rev_indices = rev_indptr, rev_indices
+        self._ids = None
+        self._undirected = None
+
+        # Edge type id per CSR slot (-1 = no type), aligned with *_indices
+        self.edge_types = list(edge_types or [])
+        self.fwd_types = fwd_types if fwd_types is not None else np.full(len(fwd_indices), -1, dtype=np.int32)
+        self.rev_types = rev_types if rev_types is not None else np.full(len(rev_indices), -1, dtype=np.int32)
+
+        if landmarks is not None and landmarks.meta.get("node_count") != self.node_count:
+            landmarks = None
+        self.landmarks = landmarks
+
+        # Optional ComponentIndex (component_index.py) for O(1) "no path"
+        if components is not None and components.node_count != self.node_count:
+            components = None
+        self.components = components
+
+        # Optional ReachabilityIndex (reachability_index.py): exact directed "no path"
+        if reachability is not None and reachability.node_count != self.node_count:
+            reachability = None
+        self.reachability = reachability
+
+        # Search scratch space, reset after every query
+        self._lock = threading.Lock()
+        self._dist = (np.full(self.node_count, -1, dtype=np.int32), np.full(self.node_count, -1, dtype=np.int32))
+        self._parent = (np.full(self.node_count, -1, dtype=np.int32), np.full(self.node_count, -1, dtype=np.int32))
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        snapshot,
+        landmarks: Optional[Landmarks] = None,
+        components=None,
+        reachability=None,
+    ) -> "PathEngine":
+        return cls(
+            snapshot.names(),
+            snapshot.fwd_indptr, snapshot.fwd_indices,
+            snapshot.rev_indptr, snapshot.rev_indices,
+            landmarks,
+            snapshot.edge_types,
+            snapshot.edge_type[snapshot.fwd_eids],
+            snapshot.edge_type[snapshot.rev_eids],
+            components,
+            reachability,
+        )
+
+    @classmethod
+    def from_graph(
+        cls,
+        G,
+        landmarks: Optional[Landmarks] = None,
+        components=None,
+        reachability=None,
+    ) -> "PathEngine":
+        """Same arrays built from a DiGraph (ids in G's node order)."""
+        names = list(G.nodes())
+        ids = {name: i for i, name in enumerate(names)}
+        type_ids = {}
+
+        rows = []
+        for u, v, kind in G.edges(data="type"):
+            t = type_ids.setdefault(kind, len(type_ids)) if isinstance(kind, str) else -1
+            rows.append((ids[u], ids[v], t))
+
+        edges = np.asarray(rows, dtype=np.int32).reshape(-1, 3)
+        src, dst, types = edges[:, 0], edges[:, 1], edges[:, 2]
+        n = len(names)
+        return cls(
+            names,
+            *_csr(src, dst, n),
+            *_csr(dst, src, n),
+            landmarks,
+            list(type_ids),
+            _csr(src, types, n)[1],
+            _csr(dst, types, n)[1],
+            components,
+            reachability,
+        )
+
+    def node_id(self, name: str) -> Optional[int]:
+        if self._ids is None:
+            self._ids = {n: i for i, n in enumerate(self.names)}
+        return self._ids.get(name)
+
+    def undirected(self) -> Tuple[np.ndarray, np.ndarray]:
+        """CSR with every edge in both directions (built on first use)."""
+        if self._undirected is None:
+            n = self.node_count
+            src = np.repeat(np.arange(n, dtype=np.int32), np.diff(self.fwd_indptr))
+            dst = self.fwd_indices
+            keys = np.concatenate([src, dst])
+            self._undirected_types = _csr(keys, np.concatenate([self.fwd_types, self.fwd_types]), n)[1]
+            self._undirected = _csr(keys, np.concatenate([dst, src]), n)
+        return self._undirected
+
+    def _adjacency(self, directed: bool, forward: bool = True):
+        """(indptr, indices, types) for one search direction."""
+        if not directed:
+            indptr, indices = self.undirected()
+            return indptr, indices, self._undirected_types
+        if forward:
+            return self.fwd_indptr, self.fwd_indices, self.fwd_types
+        return self.rev_indptr, self.rev_indices, self.rev_types
+
+    def type_mask(self, edge_types: Optional[Iterable[Optional[str]]]) -> Optional[np.ndarray]:
+        """
+        Boolean lookup by type id for an edge-type filter (None = no
+        filter). The extra last slot is type -1, i.e. edges without one.
+        """
+        if edge_types is None:
+            return None
+        wanted = set(edge_types)
+        mask = np.zeros(len(self.edge_types) + 1, dtype=bool)
+        for i, name in enumerate(self.edge_types):
+            mask[i] = name in wanted
+        mask[-1] = None in wanted
+        return mask
+
+    # --------------------------------------------------
+    # Landmark bounds
+    # --------------------------------------------------
+    def _lower_bound(self, s: int, t: int, directed: bool) -> np.ndarray:
+        """
+        Per landmark, a lower bound on d(s, t) from the triangle inequality,
+        or UNREACHABLE when that landmark proves there is no path.
+        """
+        lm = self.landmarks
+        if directed:
+            fs, ft = lm.dist_from[:, s].astype(np.int32), lm.dist_from[:, t].astype(np.int32)
+            ts, tt = lm.dist_to[:, s].astype(np.int32), lm.dist_to[:, t].astype(np.int32)
+            bound = np.maximum(
+                np.where((fs != INF) & (ft != INF), ft - fs, 0),
+                np.where((ts != INF) & (tt != INF), ts - tt, 0),
+            )
+            # L reaches s but not t, or t reaches L but s does not
+            impossible = ((fs != INF) & (ft == INF)) | ((tt != INF) & (ts == INF))
+        else:
+            a_s, a_t = lm.dist_any[:, s].astype(np.int32), lm.dist_any[:, t].astype(np.int32)
+            bound = np.where((a_s != INF) & (a_t != INF), np.abs(a_s - a_t), 0)
+            impossible = (a_s == INF) != (a_t == INF)
+
+        return np.where(impossible, UNREACHABLE, bound)
+
+    def _heuristic(self, anchor: int, towards: bool, directed: bool, active: np.ndarray):
+        """
+        Vectorized lower bound on d(v, anchor) (towards=True, forward
+        search) or d(anchor, v) (backward search) for an array of nodes v,
+        over the active landmarks. The anchor's columns are read once.
+        """
+        lm = self.landmarks
+        rows = active[:, None]
+
+        if not directed:
+            a = lm.dist_any[active, anchor].astype(np.int32)[:, None]
+            known = a != INF
+
+            def bound(v):
+                av = lm.dist_any[rows, v].astype(np.int32)
+                b = np.where(known & (av != INF), np.abs(av - a), 0)
+                b = np.where(known != (av != INF), UNREACHABLE, b)
+                return b.max(axis=0)
+
+            return bound
+
+        f = lm.dist_from[active, anchor].astype(np.int32)[:, None]
+        t = lm.dist_to[active, anchor].astype(np.int32)[:, None]
+        f_known, t_known = f != INF, t != INF
+        sign = 1 if towards else -1
+
+        def bound(v):
+            fv = lm.dist_from[rows, v].astype(np.int32)
+            tv = lm.dist_to[rows, v].astype(np.int32)
+            fv_known, tv_known = fv != INF, tv != INF
+            b = np.maximum(
+                np.where(f_known & fv_known, sign * (f - fv), 0),
+                np.where(t_known & tv_known, sign * (tv - t), 0),
+            )
+            if towards:
+                # L reaches v but not the target, or the target reaches L but v does not
+                impossible = (fv_known & ~f_known) | (t_known & ~tv_known)
+            else:
+                # L reaches the source but not v, or v reaches L but the source does not
+                impossible = (f_known & ~fv_known) | (tv_known & ~t_known)
+            return np.where(impossible, UNREACHABLE, b).max(axis=0)
+
+        return bound
+
+    def _landmark_route(self, s: int, t: int, directed: bool) -> Tuple[float, Optional[int]]:
+        """Length of the best s → L → t route and its landmark."""
+        lm = self.landmarks
+        if lm is None or len(lm) == 0:
+            return float("inf"), None
+
+        if directed:
+            to_l, from_l = lm.dist_to[:, s].astype(np.int64), lm.dist_from[:, t].astype(np.int64)
+        else:
+            to_l, from_l = lm.dist_any[:, s].astype(np.int64), lm.dist_any[:, t].astype(np.int64)
+
+        total = np.where((to_l != INF) & (from_l != INF), to_l + from_l, UNREACHABLE)
+        best = int(np.argmin(total))
+        if total[best] >= UNREACHABLE:
+            return float("inf"), None
+        return int(total[best]), best
+
+    def _descend(self, start: int, row: np.ndarray, indptr, indices) -> List[int]:
+        """Follow strictly decreasing landmark distance down to the landmark."""
+        path = [start]
+        current = start
+        while row[current] != 0:
+            neighbours = indices[indptr[current]:indptr[current + 1]]
+            current = int(neighbours[np.argmax(row[neighbours] == row[current] - 1)])
+            path.append(current)
+        return path
+
+    def _route_through(self, s: int, t: int, k: int, directed: bool) -> List[int]:
+        lm = self.landmarks
+        if directed:
+            head = self._descend(s, lm.dist_to[k], self.fwd_indptr, self.fwd_indices)
+            tail = self._descend(t, lm.dist_from[k], self.rev_indptr, self.rev_indices)
+        else:
+            indptr, indices = self.undirected()
+            head = self._descend(s, lm.dist_any[k], indptr, indices)
+            tail = self._descend(t, lm.dist_any[k], indptr, indices)
+        return head + tail[::-1][1:]
+
+    # --------------------------------------------------
+    # Search
+    # --------------------------------------------------
+    def shortest_path_ids(self, s: int, t: int, directed: bool = True) -> Optional[List[int]]:
+        """Node ids of one shortest s → t path, or None if there is none."""
+        with self._lock:
+            return self._bidirectional(s, t, directed, (self._dist, self._parent))
+
+    def _bidirectional(
+        self,
+        s: int,
+        t: int,
+        directed: bool,
+        scratch,
+        removed: Optional[np.ndarray] = None,
+        banned: Optional[np.ndarray] = None,
+        type_mask: Optional[np.ndarray] = None,
+        budget=None,
+    ) -> Optional[List[int]]:
+        """
+        The search itself. `scratch` is a (dist, parent) pair of per-side
+        arrays, all -1, and is left that way.
+
+        Optional constraints: `removed` (bool per node) nodes are skipped,
+        edges s → banned are skipped and type_mask filters edges by type.
+        Landmark lower bounds stay valid under constraints (they only make
+        paths longer), the s → L → t route does not and is not used.
+        `budget(n)` is told how many nodes each level reached and returns
+        False to abandon the search.
+        """
+        if s == t:
+            return [s]
+
+        if self.components is not None and self.components.why_unreachable(s, t, directed):
+            return None
+        if directed and self.reachability is not None and not self.reachability.reachable_ids(s, t):
+            return None
+
+        # Only the landmarks that bound this pair best guide the search
+        heuristics = None
+        if self.landmarks is not None and len(self.landmarks):
+            per_landmark = self._lower_bound(s, t, directed)
+            if per_landmark.max() >= UNREACHABLE:
+                return None
+            active = np.argsort(-per_landmark, kind="stable")[:ACTIVE_LANDMARKS]
+            heuristics = (self._heuristic(t, True, directed, active), self._heuristic(s, False, directed, active))
+
+        constrained = removed is not None or banned is not None or type_mask is not None
+        if constrained:
+            best, landmark = float("inf"), None
+        else:
+            best, landmark = self._landmark_route(s, t, directed)
+
+        sides = (self._adjacency(directed, True), self._adjacency(directed, False))
+        dist, parent = scratch
+        meeting = None
+
+        touched = [[np.asarray([s])], [np.asarray([t])]]
+        dist[0][s], dist[1][t] = 0, 0
+        frontiers = [np.asarray([s], dtype=np.int32), np.asarray([t], dtype=np.int32)]
+        depth = [0, 0]
+
+        try:
+            while len(frontiers[0]) and len(frontiers[1]):
+                if depth[0] + depth[1] + 1 >= best:
+                    break
+
+                # Expand the side whose next level is cheaper
+                cost = [
+                    int((sides[i][0][frontiers[i] + 1] - sides[i][0][frontiers[i]]).sum())
+                    for i in (0, 1)
+                ]
+                side = 0 if cost[0] <= cost[1] else 1
+                other = 1 - side
+                indptr, indices, types = sides[side]
+
+                positions, origins = csr_slots(indptr, frontiers[side])
+                neighbours = indices[positions]
+
+                keep = dist[side][neighbours] < 0
+                if removed is not None:
+                    keep &= ~removed[neighbours]
+                if type_mask is not None:
+                    keep &= type_mask[types[positions]]
+                if banned is not None:
+                    if side == 0:
+                        keep &= ~((origins == s) & np.isin(neighbours, banned))
+                    else:
+                        keep &= ~((neighbours == s) & np.isin(origins, banned))
+
+                neighbours, first = np.unique(neighbours[keep], return_index=True)
+                origins = origins[keep][first]
+
+                if budget is not None and not budget(len(neighbours)):
+                    return None
+
+                depth[side] += 1
+                dist[side][neighbours] = depth[side]
+                parent[side][neighbours] = origins
+                touched[side].append(neighbours)
+
+                # Did this level reach the other search?
+                met = neighbours[dist[other][neighbours] >= 0]
+                if len(met):
+                    lengths = depth[side] + dist[other][met]
+                    i = int(np.argmin(lengths))
+                    if lengths[i] < best:
+                        best, meeting = int(lengths[i]), int(met[i])
+
+                # Goal direction: drop nodes that cannot beat the best route
+                if heuristics is not None and len(neighbours) >= PRUNE_MIN_FRONTIER:
+                    bound = heuristics[side](neighbours)
+                    neighbours = neighbours[depth[side] + bound < best]
+                frontiers[side] = neighbours
+
+            if meeting is not None:
+                path = [meeting]
+                while path[-1] != s:
+                    path.append(int(parent[0][path[-1]]))
+                path.reverse()
+                while path[-1] != t:
+                    path.append(int(parent[1][path[-1]]))
+                return path
+        finally:
+            for i in (0, 1):
+                for ids in touched[i]:
+                    dist[i][ids] = -1
+                    parent[i][ids] = -1
+
+        if landmark is not None:
+            return self._route_through(s, t, landmark, directed)
+        return None
+
+    def why_unreachable(self, source: str, target: str, directed: bool = True) -> Optional[str]:
+        """
+        Constant-time reason there is no path ("unknown_node",
+        "different_components", "target_upstream", "no_directed_path"),
+        or None if there may be one. The last three need the component
+        and reachability indexes.
+        """
+        s, t = self.node_id(source), self.node_id(target)
+        if s is None or t is None:
+            return "unknown_node"
+        if self.components is not None:
+            reason = self.components.why_unreachable(s, t, directed)
+            if reason is not None:
+                return reason
+        if directed and self.reachability is not None and not self.reachability.reachable_ids(s, t):
+            return "no_directed_path"
+        return None
+
+    def shortest_path(self, source: str, target: str, directed: bool = True) -> Optional[List[str]]:
+        """Node names of one shortest path, or None (also for unknown nodes)."""
+        s, t = self.node_id(source), self.node_id(target)
+        if s is None or t is None:
+            return None
+        path = self.shortest_path_ids(s, t, directed)
+        return [self.names[i] for i in path] if path is not None else None
+
+    def k_shortest_paths(
+        self,
+        source: str,
+        target: str,
+        k: int = 5,
+        directed: bool = True,
+        edge_types: Optional[Iterable[Optional[str]]] = None,
+        max_seconds: float = DEFAULT_MAX_SECONDS,
+        max_expansions: int = DEFAULT_MAX_EXPANSIONS,
+    ) -> "PathStream":
+        """
+        Up to k loopless paths, shortest first, as a lazy stream of node
+        name lists (see PathStream). Unknown nodes give an empty stream.
+        """
+        return PathStream(
+            self, self.node_id(source), self.node_id(target), k,
+            directed, self.type_mask(edge_types), max_seconds, max_expansions,
+        )
+
+
+# ======================================================
+# K SHORTEST PATHS
+# ======================================================
+#
+# Yen's algorithm: path i+1 is the best "spur" deviation from paths 1..i.
+# Each spur search is the engine's bidirectional search with constraints
+# (root-path nodes removed, the edges already used out of the spur node
+# removed, optional edge-type filter).
+# Work is capped by wall time and by nodes reached over all searches, so
+# dense subjects cannot hang the page the way all_simple_paths did.
+
+
+class PathStream:
+    """
+    Iterate to get paths as they are found: the first one right away,
+    later ones as Yen's algorithm confirms them. After iteration,
+    `truncated` tells whether the budget ran out before k paths (or
+    before proving there are fewer), and `expansions` the work done.
+    """
+
+    def __init__(self, engine: PathEngine, s, t, k, directed, type_mask, max_seconds, max_expansions):
+        self.engine = engine
+        self.s, self.t, self.k = s, t, k
+        self.directed = directed
+        self.type_mask = type_mask
+        self.max_seconds = max_seconds
+        self.max_expansions = max_expansions
+        self.truncated = False
+        self.expansions = 0
+
+    def __iter__(self) -> Iterator[List[str]]:
+        names = self.engine.names
+        for path in self._yen():
+            yield [names[i] for i in path]
+
+    # --------------------------------------------------
+    # Budget
+    # --------------------------------------------------
+    def _spend(self, reached: int) -> bool:
+        self.expansions += reached
+        return not self._over_budget()
+
+    def _over_budget(self) -> bool:
+        if self.expansions > self.max_expansions or time.perf_counter() > self._deadline:
+            self.truncated = True
+        return self.truncated
+
+    # --------------------------------------------------
+    # Yen
+    # --------------------------------------------------
+    def _yen(self) -> Iterator[List[int]]:
+        s, t, engine = self.s, self.t, self.engine
+        if s is None or t is None or self.k <= 0:
+            return
+
+        self._deadline = time.perf_counter() + self.max_seconds
+        n = engine.node_count
+        scratch = (
+            (np.full(n, -1, dtype=np.int32), np.full(n, -1, dtype=np.int32)),
+            (np.full(n, -1, dtype=np.int32), np.full(n, -1, dtype=np.int32)),
+        )
+        removed = np.zeros(n, dtype=bool)
+
+        def search(spur, **constraints):
+            return engine._bidirectional(
+                spur, t, self.directed, scratch,
+                type_mask=self.type_mask, budget=self._spend, **constraints
+            )
+
+        first = search(s)
+        if first is None:
+            return
+
+        accepted = [first]
+        seen = {tuple(first)}
+        candidates = []
+        yield first
+
+        while len(accepted) < self.k:
+            previous = accepted[-1]
+
+            for i in range(len(previous) - 1):
+                if self._over_budget():
+                    return
+
+                spur, root = previous[i], previous[:i + 1]
+                banned = np.asarray([p[i + 1] for p in accepted if len(p) > i + 1 and p[:i + 1] == root])
+
+                removed[root[:-1]] = True
+                tail = search(spur, removed=removed, banned=banned)
+                removed[root[:-1]] = False
+
+                if tail is not None:
+                    path = root[:-1] + tail
+                    if tuple(path) not in seen:
+                        seen.add(tuple(path))
+                        heapq.heappush(candidates, (len(path), path))
+
+            if not candidates:
+                return
+
+            path = heapq.heappop(candidates)[1]
+            accepted.append(path)
+            yield path
+
@@ -0,0 +1,439 @@
+from bisect import insort
+from collections import defaultdict
+from pathlib import Path
+from typing import DefaultDict, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from components.component_index import condensation, strong_components
+from components.npz_store import (
+    decode_meta,
+    encode_meta,
+    load_arrays,
+    pack_strings,
+    save_arrays,
+    unpack_strings,
+)
+
+# ======================================================
+# REACHABILITY INDEX
+# ======================================================
+#
+# "Does A eventually lead to B?" answered from 2-hop labels instead of a
+# traversal. Written next to merged_graph.json by build_path_index.py.
+#
+# Per profile (a set of edge types), the graph is condensed to its SCC
+# DAG and labelled by pruned landmark labeling: vertices are ranked by
+# degree, and every vertex v gets
+#   out[v] = hubs v reaches,   in[v] = hubs that reach v,
+# such that u reaches v iff out[u] and in[v] share a hub. Each hub's
+# BFS stops wherever an earlier hub already covers the pair, which keeps
+# the labels a handful of entries long on real graphs.
+#
+# Profiles normalize type names ("Requires" == "requires") and may flip
+# types that point the other way, so that every edge of the
+# "prerequisite" profile reads "source depends on target".
+#
+# The edge list is stored too: when a later merge only adds nodes and
+# edges, update_reachability_index() inserts the new edges into the
+# existing labels (resumed pruned BFS) instead of rebuilding.
+
+INDEX_VERSION = 1
+
+PROFILES = {
+    "all": None,
+    "prerequisite": {
+        "types": [
+            "requires", "depends_on", "based_on", "built_on", "is_based_on",
+            "derived_from", "relies_on", "assumes", "follows",
+            "requires_fulfillment_of", "requires_reliance_on",
+        ],
+        "reverse": [
+            "required_by", "is_required_by", "required_for", "is_required_for",
+            "foundation_for", "foundation_of", "basis_for", "is_basis_for",
+            "is_prerequisite_for", "precedes", "is_precursor_to",
+            "predecessor_of", "building_block_of",
+        ],
+    },
+}
+
+# Above this many new edges a full rebuild gives tighter labels
+MAX_INCREMENTAL_EDGES = 5_000
+MAX_INCREMENTAL_FRACTION = 0.1
+
+
+def reachability_path(graph_path: Path) -> Path:
+    """merged_graph.json → merged_graph.reachability.npz"""
+    return graph_path.with_suffix(".reachability.npz")
+
+
+def normalize_type(name: str) -> str:
+    return "_".join(name.strip().lower().split())
+
+
+def _csr(keys: np.ndarray, values: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    order = np.argsort(keys, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=n), out=indptr[1:])
+    return indptr, values[order].astype(np.int32)
+
+
+def _pack_lists(lists: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    indptr = np.zeros(len(lists) + 1, dtype=np.int64)
+    np.cumsum([len(x) for x in lists], out=indptr[1:])
+    flat = np.fromiter((h for x in lists for h in x), dtype=np.int32, count=int(indptr[-1]))
+    return indptr, flat
+
+
+def _unpack_lists(indptr: np.ndarray, flat: np.ndarray) -> List[List[int]]:
+    flat = flat.tolist()
+    bounds = indptr.tolist()
+    return [flat[bounds[i]:bounds[i + 1]] for i in range(len(bounds) - 1)]
+
+
+def _profile_edges(
+    src: np.ndarray,
+    dst: np.ndarray,
+    types: np.ndarray,
+    type_names: List[str],
+    spec: Optional[dict],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Edges of a profile, reversed types flipped to point forwards."""
+    if spec is None:
+        return src, dst
+
+    normalized = [normalize_type(t) for t in type_names]
+    forward = np.asarray([t in set(spec.get("types", [])) for t in normalized] + [False])
+    reverse = np.asarray([t in set(spec.get("reverse", [])) for t in normalized] + [False])
+
+    # Type -1 (untyped) indexes the extra last slot
+    keep, flip = forward[types], reverse[types]
+    return (
+        np.concatenate([src[keep], dst[flip]]),
+        np.concatenate([dst[keep], src[flip]]),
+    )
+
+
+# ======================================================
+# LABELS
+# ======================================================
+
+class _Labels:
+    """2-hop labels of one profile. Hubs are vertex ranks, kept sorted."""
+
+    def __init__(self, vertex: np.ndarray, order: List[int], out: List[List[int]], into: List[List[int]]):
+        self.vertex = vertex          # node id → vertex (SCC of the profile)
+        self.order = order            # rank → vertex
+        self.out = out                # vertex → hubs it reaches
+        self.into = into              # vertex → hubs reaching it
+
+    def covers(self, a: int, b: int) -> bool:
+        """Vertex a reaches vertex b."""
+        return a == b or not set(self.out[a]).isdisjoint(self.into[b])
+
+    def size(self) -> int:
+        return sum(map(len, self.out)) + sum(map(len, self.into))
+
+    # --------------------------------------------------
+    # Pruned landmark labeling
+    # --------------------------------------------------
+    @classmethod
+    def build(cls, src: np.ndarray, dst: np.ndarray, n: int) -> "_Labels":
+        indptr, indices = _csr(src, dst, n)
+        scc = strong_components(indptr, indices)
+        count = int(scc.max()) + 1 if n else 0
+        dag_indptr, dag_indices, _ = condensation(indptr, indices, scc, count)
+
+        dag_src = np.repeat(np.arange(count, dtype=np.int32), np.diff(dag_indptr))
+        rev_indptr, rev_indices = _csr(dag_indices, dag_src, count)
+        succ = _unpack_lists(dag_indptr, dag_indices)
+        pred = _unpack_lists(rev_indptr, rev_indices)
+
+        # Hubs that sit on many paths first: high in × out degree
+        degree = (np.diff(dag_indptr) + 1) * (np.diff(rev_indptr) + 1)
+        order = np.lexsort((np.arange(count), -degree)).tolist()
+
+        labels = cls(scc, order, [[] for _ in range(count)], [[] for _ in range(count)])
+        for rank, v in enumerate(order):
+            labels._sweep(rank, v, succ, labels.into, labels.out[v])
+            labels._sweep(rank, v, pred, labels.out, labels.into[v])
+        return labels
+
+    def _sweep(self, rank: int, start: int, adjacency, target, anchor):
+        """
+        BFS from `start` adding `rank` to target[u] of every vertex u not
+        yet covered; `anchor` is the hub's own label on the other side.
+        """
+        hubs = set(anchor)
+        seen = {start}
+        queue = [start]
+        for u in queue:
+            if not hubs.isdisjoint(target[u]):
+                continue
+            insort(target[u], rank)
+            for w in adjacency[u]:
+                if w not in seen:
+                    seen.add(w)
+                    queue.append(w)
+
+    # --------------------------------------------------
+    # Incremental insertion
+    # --------------------------------------------------
+    def insert(self, a: int, b: int, succ: DefaultDict[int, set], pred: DefaultDict[int, set]):
+        """
+        Add vertex edge a → b, resuming the BFS of every hub that now
+        reaches further (in rank order, as in the original build).
+        """
+        succ[a].add(b)
+        pred[b].add(a)
+        if self.covers(a, b):
+            return
+
+        for rank in sorted(set(self.into[a]) | set(self.out[b])):
+            hub = self.order[rank]
+            if rank in self.into[a]:
+                self._sweep(rank, b, succ, self.into, self.out[hub])
+            if rank in self.out[b]:
+                self._sweep(rank, a, pred, self.out, self.into[hub])
+
+    def add_vertices(self, count: int):
+        """New, unconnected vertices, ranked last."""
+        for _ in range(count):
+            v = len(self.out)
+            rank = len(self.order)
+            self.order.append(v)
+            self.out.append([rank])
+            self.into.append([rank])
+
+    # --------------------------------------------------
+    # Persistence
+    # --------------------------------------------------
+    def to_arrays(self, prefix: str) -> Dict[str, np.ndarray]:
+        out_indptr, out_hubs = _pack_lists(self.out)
+        in_indptr, in_hubs = _pack_lists(self.into)
+        return {
+            f"{prefix}_vertex": np.asarray(self.vertex, dtype=np.int32),
+            f"{prefix}_order": np.asarray(self.order, dtype=np.int32),
+            f"{prefix}_out_indptr": out_indptr,
+            f"{prefix}_out_hubs": out_hubs,
+            f"{prefix}_in_indptr": in_indptr,
+            f"{prefix}_in_hubs": in_hubs,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], prefix: str) -> "_Labels":
+        return cls(
+            arrays[f"{prefix}_vertex"],
+            arrays[f"{prefix}_order"].tolist(),
+            _unpack_lists(arrays[f"{prefix}_out_indptr"], arrays[f"{prefix}_out_hubs"]),
+            _unpack_lists(arrays[f"{prefix}_in_indptr"], arrays[f"{prefix}_in_hubs"]),
+        )
+
+
+# ======================================================
+# BUILD / UPDATE / SAVE
+# ======================================================
+
+def _engine_edges(engine) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    src = np.repeat(np.arange(engine.node_count, dtype=np.int32), np.diff(engine.fwd_indptr))
+    return src, engine.fwd_indices.astype(np.int32), engine.fwd_types.astype(np.int32)
+
+
+def _arrays(names, type_names, src, dst, types, profiles, labels, source, built) -> Dict[str, np.ndarray]:
+    meta = {
+        "version": INDEX_VERSION,
+        "source": source,
+        "node_count": len(names),
+        "profiles": profiles,
+        "built": built,
+    }
+    name_offsets, name_blob = pack_strings(list(names))
+    type_offsets, type_blob = pack_strings(list(type_names))
+    arrays = {
+        "meta": encode_meta(meta),
+        "name_offsets": name_offsets,
+        "name_blob": name_blob,
+        "type_offsets": type_offsets,
+        "type_blob": type_blob,
+        "edge_src": src,
+        "edge_dst": dst,
+        "edge_type": types,
+    }
+    for name, profile_labels in labels.items():
+        arrays.update(profile_labels.to_arrays(name))
+    return arrays
+
+
+def build_reachability_index(
+    engine,
+    profiles: Optional[Dict[str, Optional[dict]]] = None,
+    source: Optional[dict] = None,
+) -> Dict[str, np.ndarray]:
+    """Arrays for ReachabilityIndex from a PathEngine's CSR adjacency."""
+    profiles = PROFILES if profiles is None else profiles
+    src, dst, types = _engine_edges(engine)
+
+    labels = {
+        name: _Labels.build(*_profile_edges(src, dst, types, engine.edge_types, spec), engine.node_count)
+        for name, spec in profiles.items()
+    }
+    return _arrays(engine.names, engine.edge_types, src, dst, types, profiles, labels, source, "full")
+
+
+def update_reachability_index(
+    previous: "ReachabilityIndex",
+    engine,
+    source: Optional[dict] = None,
+) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Arrays for the engine's graph by inserting what was added since
+    `previous` was built, or None if anything was removed (or too much
+    was added) and a full build is needed.
+    """
+    if previous.meta.get("version") != INDEX_VERSION:
+        return None
+
+    old_names = previous.names()
+    new_ids = {name: i for i, name in enumerate(engine.names)}
+    if len(new_ids) != engine.node_count or any(name not in new_ids for name in old_names):
+        return None
+
+    # Old node id → new node id, old edges in new ids
+    remap = np.asarray([new_ids[name] for name in old_names], dtype=np.int64)
+    old_types = previous.edge_types()
+    src, dst, types = _engine_edges(engine)
+    type_ids = {name: i for i, name in enumerate(engine.edge_types)}
+    type_remap = np.asarray([type_ids.get(name, -2) for name in old_types] + [-1], dtype=np.int64)
+
+    n = engine.node_count
+    old_keys = (remap[previous.edge_src] * n + remap[previous.edge_dst]) * (len(type_ids) + 2) \
+        + type_remap[previous.edge_type] + 1
+    new_keys = (src.astype(np.int64) * n + dst) * (len(type_ids) + 2) + types + 1
+    if not np.isin(old_keys, new_keys).all():
+        return None
+
+    added = ~np.isin(new_keys, old_keys)
+    if added.sum() > max(MAX_INCREMENTAL_EDGES, MAX_INCREMENTAL_FRACTION * len(new_keys)):
+        return None
+
+    # New node id → old node id (-1 for nodes the old index never saw)
+    back = np.full(n, -1, dtype=np.int64)
+    back[remap] = np.arange(len(remap))
+    fresh = np.flatnonzero(back < 0)
+
+    labels = {}
+    for name, spec in previous.meta["profiles"].items():
+        old = previous.labels(name)
+        profile = _Labels(None, list(old.order), [list(x) for x in old.out], [list(x) for x in old.into])
+
+        # Existing nodes keep their vertex, new ones get their own
+        vertex = np.empty(n, dtype=np.int32)
+        known = back >= 0
+        vertex[known] = old.vertex[back[known]]
+        vertex[fresh] = len(profile.out) + np.arange(len(fresh))
+        profile.add_vertices(len(fresh))
+        profile.vertex = vertex
+
+        # Vertex graph of the profile as it stands, then the new edges
+        a, b = _profile_edges(src[~added], dst[~added], types[~added], engine.edge_types, spec)
+        succ: DefaultDict[int, set] = defaultdict(set)
+        pred: DefaultDict[int, set] = defaultdict(set)
+        for u, v in zip(vertex[a].tolist(), vertex[b].tolist()):
+            if u != v:
+                succ[u].add(v)
+                pred[v].add(u)
+
+        a, b = _profile_edges(src[added], dst[added], types[added], engine.edge_types, spec)
+        for u, v in zip(vertex[a].tolist(), vertex[b].tolist()):
+            if u != v:
+                profile.insert(u, v, succ, pred)
+
+        labels[name] = profile
+
+    return _arrays(
+        engine.names, engine.edge_types, src, dst, types,
+        previous.meta["profiles"], labels, source, "incremental",
+    )
+
+
+def save_reachability_index(index: Dict[str, np.ndarray], path: Path):
+    save_arrays(index, path)
+
+
+# ======================================================
+# QUERY
+# ======================================================
+
+class ReachabilityIndex:
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.meta = decode_meta(arrays["meta"])
+        self._arrays = arrays
+        self.edge_src = arrays["edge_src"]
+        self.edge_dst = arrays["edge_dst"]
+        self.edge_type = arrays["edge_type"]
+        self._labels: Dict[object, _Labels] = {}
+        self._names = None
+        self._ids = None
+
+    @classmethod
+    def load(cls, path: Path) -> "ReachabilityIndex":
+        return cls(load_arrays(path))
+
+    @property
+    def node_count(self) -> int:
+        return self.meta["node_count"]
+
+    def profiles(self) -> List[str]:
+        return list(self.meta["profiles"])
+
+    def names(self) -> List[str]:
+        if self._names is None:
+            self._names = unpack_strings(self._arrays["name_offsets"], self._arrays["name_blob"])
+        return self._names
+
+    def edge_types(self) -> List[str]:
+        return unpack_strings(self._arrays["type_offsets"], self._arrays["type_blob"])
+
+    def node_id(self, name: str) -> Optional[int]:
+        if self._ids is None:
+            self._ids = {n: i for i, n in enumerate(self.names())}
+        return self._ids.get(name)
+
+    def labels(self, profile: str = "all") -> _Labels:
+        if profile not in self._labels:
+            if profile not in self.meta["profiles"]:
+                raise KeyError(f"Unknown reachability profile: {profile}")
+            self._labels[profile] = _Labels.from_arrays(self._arrays, profile)
+        return self._labels[profile]
+
+    def for_edge_types(self, edge_types: Iterable[str]) -> _Labels:
+        """Labels over edges of the given types, built on first use."""
+        key = frozenset(normalize_type(t) for t in edge_types)
+        if key not in self._labels:
+            spec = {"types": sorted(key)}
+            edges = _profile_edges(self.edge_src, self.edge_dst, self.edge_type, self.edge_types(), spec)
+            self._labels[key] = _Labels.build(*edges, self.node_count)
+        return self._labels[key]
+
+    # --------------------------------------------------
+    # Queries
+    # --------------------------------------------------
+    def reachable_ids(self, s: int, t: int, profile: str = "all", edge_types: Optional[Iterable[str]] = None) -> bool:
+        labels = self.for_edge_types(edge_types) if edge_types is not None else self.labels(profile)
+        return labels.covers(int(labels.vertex[s]), int(labels.vertex[t]))
+
+    def reachable(
+        self,
+        source: str,
+        target: str,
+        profile: str = "all",
+        edge_types: Optional[Iterable[str]] = None,
+    ) -> Optional[bool]:
+        """
+        Whether source leads to target along edges of the profile (or of
+        the given edge types), None for unknown nodes.
+        """
+        s, t = self.node_id(source), self.node_id(target)
+        if s is None or t is None:
+            return None
+        return self.reachable_ids(s, t, profile, edge_types)
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+# ======================================================
+# RENDER CACHE
+# ======================================================
+#
+# Generated pyvis HTML, content-addressed by
+#
+#     (graph version, subgraph selection, visual options)
+#
+# so a rerun with the same graph and parameters reads one file instead of
+# rebuilding the Network node by node. Files live under data/indexes/html/;
+# a hit refreshes the file's mtime and writes evict the least recently
+# used files once the directory passes MAX_BYTES.
+#
+# HTML is cached as pyvis generated it. On the way out, the script and
+# stylesheet tags for vis.js, tom-select and pyvis' bindings are pointed
+# at the copies vendored under static/lib/ (Streamlit static serving, see
+# .streamlit/config.toml), so the browser fetches them once and caches
+# them instead of each page inlining or re-downloading them.
+
+CACHE_VERSION = 1
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+CACHE_DIR = BASE_DIR / "data" / "indexes" / "html"
+
+MAX_BYTES = 64 << 20
+
+# Where Streamlit serves static/lib/ (under server.baseUrlPath)
+STATIC_LIB = "app/static/lib"
+
+_CDN_VIS_CSS = re.compile(r'<link rel="stylesheet" href="https://cdnjs\.cloudflare\.com/ajax/libs/vis-network/[^"]*\.css"[^>]*>')
+_CDN_VIS_JS = re.compile(r'<script src="https://cdnjs\.cloudflare\.com/ajax/libs/vis-network/[^"]*\.js"[^>]*></script>')
+_LOCAL_LIB = re.compile(r'(src|href)="lib/')
+
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+# path → (size, mtime_ns, sha256) for file_version()
+_file_versions = {}
+
+
+def render_key(graph_version: str, selection, options=None) -> str:
+    """Cache key; selection and options must be JSON-serializable."""
+    payload = json.dumps([CACHE_VERSION, graph_version, selection, options], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def file_version(path: Path) -> str:
+    """Content hash of a file, rehashed only when its size/mtime change."""
+    st = os.stat(path)
+    cached = _file_versions.get(str(path))
+    if cached is not None and cached[:2] == (st.st_size, st.st_mtime_ns):
+        return cached[2]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    _file_versions[str(path)] = (st.st_size, st.st_mtime_ns, digest.hexdigest())
+    return digest.hexdigest()
+
+
+def _prune(cache_dir: Path, max_bytes: int):
+    files = []
+    for path in cache_dir.glob("*.html"):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        files.append((st.st_mtime_ns, st.st_size, path))
+    files.sort(reverse=True)
+
+    total = 0
+    for _, size, path in files:
+        total += size
+        if total > max_bytes:
+            path.unlink(missing_ok=True)
+            _stats["evictions"] += 1
+
+
+def _static_lib_url() -> Optional[str]:
+    """
+    URL prefix of static/lib/, or None outside a Streamlit run, with
+    static serving off, or when the running app (e.g. past_codes/) has no
+    static/lib/ next to its main script.
+    """
+    try:
+        import streamlit as st
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+
+    ctx = get_script_run_ctx()
+    if ctx is None or not st.get_option("server.enableStaticServing"):
+        return None
+    if not (Path(ctx.main_script_path).parent / "static" / "lib").is_dir():
+        return None
+    base = st.get_option("server.baseUrlPath").strip("/")
+    return "/" + "/".join(p for p in (base, STATIC_LIB) if p)
+
+
+def serve_assets(html: str) -> str:
+    """Point pyvis' asset tags at the vendored copies Streamlit serves."""
+    prefix = _static_lib_url()
+    if prefix is None:
+        return html
+    html = _CDN_VIS_CSS.sub(f'<link rel="stylesheet" href="{prefix}/vis-9.1.2/vis-network.css">', html)
+    html = _CDN_VIS_JS.sub(f'<script src="{prefix}/vis-9.1.2/vis-network.min.js"></script>', html)
+    return _LOCAL_LIB.sub(rf'\1="{prefix}/', html)
+
+
+def cached_html(
+    key: str,
+    render: Callable[[], str],
+    cache_dir: Optional[Path] = CACHE_DIR,
+    max_bytes: int = MAX_BYTES,
+) -> str:
+    """
+    render()'s HTML for key, from disk when it was rendered before, with
+    the asset tags rewritten by serve_assets(). cache_dir=None skips the
+    disk cache.
+    """
+    path = cache_dir / f"{key}.html" if cache_dir is not None else None
+    if path is not None:
+        try:
+            html = path.read_text(encoding="utf-8")
+            os.utime(path)
+            _stats["hits"] += 1
+            return serve_assets(html)
+        except FileNotFoundError:
+            pass
+
+    _stats["misses"] += 1
+    html = render()
+
+    if path is not None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(html, encoding="utf-8")
+        tmp.replace(path)
+        with _lock:
+            _prune(cache_dir, max_bytes)
+    return serve_assets(html)
+
+
+def render_stats() -> dict:
+    """hit / miss / eviction counters for this process."""
+    return dict(_stats)
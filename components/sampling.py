@@ -0,0 +1,152 @@
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from components.path_engine import PathEngine
+
+# ======================================================
+# SAMPLING
+# ======================================================
+#
+# A representative subgraph of at most `size` nodes for previews and
+# thumbnails, deterministic for a given graph and seed.
+#
+# Nodes are taken in three passes, each limited by what is left of the
+# budget:
+#
+#   1. the top_k nodes by score (e.g. PageRank), always;
+#   2. edge-type coverage: for every edge type, the endpoints of its edge
+#      with the highest endpoint degree sum (most common types first, at
+#      most half of what is left of the budget);
+#   3. strata of (subject, degree bin), degree bins being powers of two:
+#      every stratum gets one node (largest strata first while that
+#      fits), the rest of the budget is split in proportion to stratum
+#      size (largest remainder). Within a stratum, nodes are taken in
+#      seeded random order.
+#
+# Everything is O(V + E) passes over the CSR arrays. Stratum picks use a
+# per-stratum threshold on each node's random priority (expected count a
+# little above the quota), so only that small candidate set is sorted.
+
+DEFAULT_SIZE = 300
+DEFAULT_TOP_K = 20
+
+# Degree bins: 0, 1, 2-3, 4-7, …, the last one open-ended
+DEGREE_BINS = 8
+
+
+class Sample(NamedTuple):
+    ids: np.ndarray        # sampled node ids, guaranteed ones first
+    required: int          # ids[:required] are the top_k / edge-type picks
+    src: np.ndarray        # induced edges, in edge direction
+    dst: np.ndarray
+    types: np.ndarray      # edge type ids (-1 = untyped)
+
+
+def _quotas(sizes: np.ndarray, budget: int) -> np.ndarray:
+    """Per-stratum counts summing to min(budget, total), at most each size."""
+    quota = np.zeros(len(sizes), dtype=np.int64)
+    if budget <= 0:
+        return quota
+
+    # One per non-empty stratum, largest first, while the budget lasts
+    nonempty = np.flatnonzero(sizes)
+    first = nonempty[np.argsort(-sizes[nonempty], kind="stable")][:budget]
+    quota[first] = 1
+    budget -= len(first)
+
+    # The rest in proportion to what is left in each stratum
+    left = sizes - quota
+    total = int(left.sum())
+    if budget <= 0 or total == 0:
+        return quota
+    share = left * min(budget, total) / total
+    extra = np.floor(share).astype(np.int64)
+    remainder = min(budget, total) - int(extra.sum())
+    if remainder:
+        order = np.argsort(-(share - extra), kind="stable")
+        extra[order[:remainder]] += 1
+    return quota + np.minimum(extra, left)
+
+
+def stratified_sample(
+    engine: PathEngine,
+    subjects: np.ndarray,
+    size: int = DEFAULT_SIZE,
+    top_k: int = DEFAULT_TOP_K,
+    scores: Optional[np.ndarray] = None,
+    seed: int = 0,
+) -> Sample:
+    """
+    At most size node ids of engine's graph. subjects is one integer
+    label per node (see supernodes.subject_labels); scores rank the
+    top_k guaranteed nodes.
+    """
+    n = engine.node_count
+    size = min(size, n)
+    src = np.repeat(np.arange(n, dtype=np.int64), np.diff(engine.fwd_indptr))
+    dst = engine.fwd_indices.astype(np.int64)
+    types = engine.fwd_types
+    degree = np.diff(engine.fwd_indptr) + np.diff(engine.rev_indptr)
+
+    taken = np.zeros(n, dtype=bool)
+    picked = []
+
+    def take(ids, limit=None):
+        # In order, skipping repeats (edge endpoints) and nodes already in
+        ids = np.asarray(list(dict.fromkeys(ids.tolist())), dtype=np.int64)
+        left = size - int(taken.sum())
+        ids = ids[~taken[ids]][:left if limit is None else min(limit, left)]
+        taken[ids] = True
+        picked.append(ids)
+
+    # 1. Top-k central nodes
+    if scores is not None and top_k > 0 and size > 0:
+        score = np.nan_to_num(np.asarray(scores, dtype=np.float64), nan=-np.inf)
+        k = min(top_k, size)
+        top = np.argpartition(-score, k - 1)[:k] if k < n else np.arange(n)
+        take(top[np.lexsort((top, -score[top]))])
+
+    # 2. One edge per type (the best-connected one), most common types
+    #    first, using at most half of the remaining budget
+    if len(src):
+        weight = degree[src] + degree[dst]
+        slot = np.where(types >= 0, types, len(engine.edge_types))
+        best = np.full(len(engine.edge_types) + 1, -1, dtype=np.int64)
+        np.maximum.at(best, slot, weight)
+        winners = np.flatnonzero(weight == best[slot])[::-1]
+        first = np.full(len(best), -1, dtype=np.int64)
+        first[slot[winners]] = winners  # the last write is the lowest edge index
+        counts = np.bincount(slot, minlength=len(best))
+        order = np.argsort(-counts, kind="stable")
+        edges = first[order[first[order] >= 0]]
+        take(np.column_stack([src[edges], dst[edges]]).ravel(), limit=(size - int(taken.sum())) // 2)
+    required = int(taken.sum())
+
+    # 3. (subject, degree bin) strata
+    budget = size - required
+    if budget > 0:
+        degree_bin = np.minimum(np.floor(np.log2(degree + 1)).astype(np.int64), DEGREE_BINS - 1)
+        stratum = np.asarray(subjects, dtype=np.int64) * DEGREE_BINS + degree_bin
+        free = ~taken
+        sizes = np.bincount(stratum[free], minlength=int(stratum.max()) + 1)
+        quota = _quotas(sizes, budget)
+
+        priority = np.random.default_rng(seed).random(n)
+        rate = np.minimum(1.0, (quota + 3 * np.sqrt(quota) + 2) / np.maximum(sizes, 1))
+        candidates = np.flatnonzero(free & (priority < rate[stratum]))
+        candidates = candidates[np.lexsort((priority[candidates], stratum[candidates]))]
+
+        groups = stratum[candidates]
+        starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]]) if len(groups) else groups
+        within = np.arange(len(candidates)) - np.repeat(starts, np.diff(np.r_[starts, len(candidates)]))
+        chosen = within < quota[groups]
+        take(candidates[chosen])
+
+        # A stratum short of candidates leaves budget: fill in priority order
+        rest = candidates[~chosen]
+        take(rest[np.argsort(priority[rest], kind="stable")])
+
+    ids = np.concatenate(picked) if picked else np.zeros(0, dtype=np.int64)
+    keep = taken[src] & taken[dst]
+    return Sample(ids, required, src[keep], dst[keep], types[keep])
@@ -0,0 +1,340 @@
+import bisect
+import re
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from components.npz_store import (
+    decode_meta,
+    encode_meta,
+    load_arrays,
+    pack_strings,
+    save_arrays,
+    unpack_strings,
+)
+
+# ======================================================
+# TOKENIZER
+# ======================================================
+#
+# Definitions are full of inline LaTeX ("$f: \mathbb{R}^{n}\rightarrow
+# \mathbb{R}$"). Formatting commands are dropped, symbol commands become
+# words (\nabla → nabla, \alpha → alpha), and the markup characters
+# ($ { } ^ _ \) act as separators, so "$\mathbb{R}^{n}$" → ["r", "n"].
+
+LATEX_COMMAND = re.compile(r"\\([A-Za-z]+)")
+WORD = re.compile(r"[^\W_]+")
+
+LATEX_FORMATTING = {
+    "mathbb", "mathrm", "mathbf", "mathcal", "mathit", "mathsf", "mathfrak",
+    "boldsymbol", "bm", "text", "textbf", "textit", "operatorname",
+    "left", "right", "big", "bigl", "bigr", "quad", "qquad",
+    "displaystyle", "limits", "begin", "end",
+}
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in",
+    "is", "it", "its", "of", "on", "or", "that", "the", "this", "to",
+    "with", "which", "where", "when", "can", "used", "such", "into",
+}
+
+
+def _latex_word(match):
+    command = match.group(1)
+    return " " if command in LATEX_FORMATTING else f" {command} "
+
+
+def _normalize(word: str) -> str:
+    """Light plural folding, applied identically to documents and queries."""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def tokenize_raw(text: str) -> List[str]:
+    """Words before stopword removal and plural folding."""
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(c for c in text if not unicodedata.combining(c))
+    return WORD.findall(LATEX_COMMAND.sub(_latex_word, text).lower())
+
+
+def tokenize(text: str) -> List[str]:
+    return [_normalize(w) for w in tokenize_raw(text) if w not in STOPWORDS]
+
+
+# ======================================================
+# DOCUMENTS
+# ======================================================
+
+# Field weights for the weighted term frequency (BM25F-style)
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "definition": 1.5,
+    "description": 1.0,
+    "properties": 0.5,
+}
+
+K1 = 1.2
+B = 0.75
+INDEX_VERSION = 1
+
+
+def _property_text(value) -> Iterable[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for v in value.values():
+            yield from _property_text(v)
+    elif isinstance(value, list):
+        for v in value:
+            yield from _property_text(v)
+    elif value is not None:
+        yield str(value)
+
+
+def _fields(name: str, record: dict) -> Dict[str, str]:
+    return {
+        "name": name,
+        "definition": record.get("definition") if isinstance(record.get("definition"), str) else "",
+        "description": record.get("description") if isinstance(record.get("description"), str) else "",
+        "properties": " ".join(_property_text(record.get("properties", {}))),
+    }
+
+
+def iter_documents(graph: dict):
+    """(name, record) for every node, then edge endpoints without a record."""
+    nodes = graph.get("nodes", {})
+    seen = set(nodes)
+    for name, record in nodes.items():
+        yield name, record if isinstance(record, dict) else {}
+    for edge in graph.get("edges", []):
+        for endpoint in (edge.get("source"), edge.get("target")):
+            if isinstance(endpoint, str) and endpoint not in seen:
+                seen.add(endpoint)
+                yield endpoint, {}
+
+
+# ======================================================
+# BUILD / SAVE
+# ======================================================
+
+def build_search_index(graph: dict, source: Optional[dict] = None) -> Dict[str, np.ndarray]:
+    """
+    Inverted index over node names, definitions, descriptions and
+    property values, as a dict of arrays ready for np.savez.
+    """
+    names = []
+    doc_len = []
+    domains = {}
+    doc_domain = []
+    subjects = {}
+    subject_docs = []
+    postings: Dict[str, List[Tuple[int, float]]] = {}
+
+    for doc, (name, record) in enumerate(iter_documents(graph)):
+        names.append(name)
+
+        tf = Counter()
+        length = 0.0
+        for field, text in _fields(name, record).items():
+            weight = FIELD_WEIGHTS[field]
+            for token in tokenize(text):
+                tf[token] += weight
+                length += weight
+
+        doc_len.append(length)
+        for term, weight in tf.items():
+            postings.setdefault(term, []).append((doc, weight))
+
+        domain = record.get("domain")
+        doc_domain.append(domains.setdefault(domain, len(domains)) if isinstance(domain, str) else -1)
+
+        for subject in record.get("metadata", {}).get("subjects", []):
+            subject_docs.append((subjects.setdefault(subject, len(subjects)), doc))
+
+    terms = sorted(postings)
+    indptr = np.zeros(len(terms) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(postings[t]) for t in terms])
+    docs = np.fromiter((d for t in terms for d, _ in postings[t]), dtype=np.int32, count=int(indptr[-1]))
+    tfs = np.fromiter((w for t in terms for _, w in postings[t]), dtype=np.float32, count=int(indptr[-1]))
+
+    subject_docs.sort()
+    subject_indptr = np.zeros(len(subjects) + 1, dtype=np.int64)
+    np.cumsum(np.bincount([s for s, _ in subject_docs], minlength=len(subjects)), out=subject_indptr[1:])
+
+    term_offsets, term_blob = pack_strings(terms)
+    name_offsets, name_blob = pack_strings(names)
+
+    meta = {
+        "version": INDEX_VERSION,
+        "source": source,
+        "k1": K1,
+        "b": B,
+        "subjects": list(subjects),
+        "domains": list(domains),
+    }
+
+    return {
+        "meta": encode_meta(meta),
+        "term_offsets": term_offsets,
+        "term_blob": term_blob,
+        "postings_indptr": indptr,
+        "postings_docs": docs,
+        "postings_tf": tfs,
+        "doc_len": np.asarray(doc_len, dtype=np.float32),
+        "doc_domain": np.asarray(doc_domain, dtype=np.int32),
+        "name_offsets": name_offsets,
+        "name_blob": name_blob,
+        "subject_indptr": subject_indptr,
+        "subject_docs": np.asarray([d for _, d in subject_docs], dtype=np.int32),
+    }
+
+
+def save_search_index(index: Dict[str, np.ndarray], path: Path):
+    save_arrays(index, path)
+
+
+# ======================================================
+# QUERY
+# ======================================================
+
+class SearchIndex:
+    """BM25 ranking over the arrays written by build_search_index."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.meta = decode_meta(arrays["meta"])
+        self.terms = unpack_strings(arrays["term_offsets"], arrays["term_blob"])
+        self.term_ids = {t: i for i, t in enumerate(self.terms)}
+        self.names = unpack_strings(arrays["name_offsets"], arrays["name_blob"])
+        self.doc_ids = {n: i for i, n in enumerate(self.names)}
+
+        self.indptr = arrays["postings_indptr"]
+        self.docs = arrays["postings_docs"]
+        self.doc_domain = arrays["doc_domain"]
+        self.subject_indptr = arrays["subject_indptr"]
+        self.subject_docs = arrays["subject_docs"]
+
+        self.subjects = {s: i for i, s in enumerate(self.meta["subjects"])}
+        self.domains = {d: i for i, d in enumerate(self.meta["domains"])}
+
+        # Precompute the BM25 term weight of every posting once
+        k1, b = self.meta["k1"], self.meta["b"]
+        doc_len = arrays["doc_len"]
+        n = max(len(self.names), 1)
+        avgdl = float(doc_len.mean()) if len(doc_len) and doc_len.mean() > 0 else 1.0
+
+        tf = arrays["postings_tf"]
+        norm = k1 * (1 - b + b * doc_len[self.docs] / avgdl)
+        df = np.diff(self.indptr)
+        idf = np.log(1 + (n - df + 0.5) / (df + 0.5)).astype(np.float32)
+        self.weights = (np.repeat(idf, df) * tf * (k1 + 1) / (tf + norm)).astype(np.float32)
+
+    @classmethod
+    def load(cls, path: Path) -> "SearchIndex":
+        return cls(load_arrays(path))
+
+    def __len__(self):
+        return len(self.names)
+
+    # --------------------------------------------------
+    # Query terms
+    # --------------------------------------------------
+    def _prefix_terms(self, prefix: str, limit: int = 50) -> List[int]:
+        start = bisect.bisect_left(self.terms, prefix)
+        ids = []
+        for i in range(start, min(start + limit, len(self.terms))):
+            if not self.terms[i].startswith(prefix):
+                break
+            ids.append(i)
+        return ids
+
+    def _query_terms(self, query: str, prefix: bool) -> List[List[int]]:
+        """One group of term ids per query token (the last may be a prefix)."""
+        tokens = tokenize(query)
+        groups = []
+        for i, token in enumerate(tokens):
+            ids = [self.term_ids[token]] if token in self.term_ids else []
+            if prefix and i == len(tokens) - 1:
+                # Expand the word as typed ("gradi" → gradient, gradients…)
+                typed = tokenize_raw(query)
+                if typed and _normalize(typed[-1]) == token:
+                    ids = sorted(set(ids) | set(self._prefix_terms(typed[-1])))
+            groups.append(ids)
+        return groups
+
+    # --------------------------------------------------
+    # Filters
+    # --------------------------------------------------
+    def _mask(self, subjects, domains) -> Optional[np.ndarray]:
+        if not subjects and not domains:
+            return None
+
+        mask = np.ones(len(self.names), dtype=bool)
+
+        if subjects:
+            allowed = np.zeros(len(self.names), dtype=bool)
+            for subject in subjects:
+                s = self.subjects.get(subject)
+                if s is not None:
+                    allowed[self.subject_docs[self.subject_indptr[s]:self.subject_indptr[s + 1]]] = True
+            mask &= allowed
+
+        if domains:
+            ids = [self.domains[d] for d in domains if d in self.domains]
+            mask &= np.isin(self.doc_domain, ids)
+
+        return mask
+
+    # --------------------------------------------------
+    # Search
+    # --------------------------------------------------
+    def search(
+        self,
+        query: str,
+        k: Optional[int] = 20,
+        subjects: Optional[Iterable[str]] = None,
+        domains: Optional[Iterable[str]] = None,
+        prefix: bool = True,
+    ) -> List[Tuple[str, float]]:
+        """
+        Top-k (name, score) by BM25, best first; k=None returns every match.
+
+        All query tokens must match (AND). With prefix=True the last token
+        also matches as a prefix, for search-as-you-type.
+        """
+        groups = self._query_terms(query, prefix)
+        if not groups:
+            return []
+
+        scores = np.zeros(len(self.names), dtype=np.float32)
+        hits = np.zeros(len(self.names), dtype=np.int32)
+
+        for group in groups:
+            if not group:
+                return []
+            seen = np.zeros(len(self.names), dtype=bool)
+            for t in group:
+                lo, hi = self.indptr[t], self.indptr[t + 1]
+                docs = self.docs[lo:hi]
+                scores[docs] += self.weights[lo:hi]
+                seen[docs] = True
+            hits += seen
+
+        matched = hits == len(groups)
+        mask = self._mask(subjects, domains)
+        if mask is not None:
+            matched &= mask
+
+        candidates = np.flatnonzero(matched)
+        if k is not None and len(candidates) > k:
+            top = np.argpartition(-scores[candidates], k - 1)[:k]
+            candidates = candidates[top]
+
+        order = candidates[np.lexsort((candidates, -scores[candidates]))]
+        return [(self.names[i], float(scores[i])) for i in order]
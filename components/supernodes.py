@@ -0,0 +1,146 @@
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import scipy.sparse as sp
+
+# ======================================================
+# SUPERNODES
+# ======================================================
+#
+# Overview of a large graph: one supernode per cluster (a community, or a
+# subject), superedges weighted by how many edges run between clusters.
+#
+# With M the n × k cluster membership matrix and A the directed 0/1
+# adjacency, W = Mᵀ A M counts edges from cluster to cluster in one sparse
+# product; its diagonal is the edges inside each cluster. Everything
+# shipped to the browser is bounded independently of the graph's size:
+#
+#   - at most MAX_SUPERNODES clusters (the largest; the rest share an
+#     "Other" supernode),
+#   - the MAX_SUPEREDGES heaviest superedges,
+#   - per cluster, its EXPAND_MEMBERS most central members, the edges
+#     among all those members, and each member's edge count to every
+#     other supernode (rows of A·M), so a click can expand a cluster in
+#     place.
+
+MAX_SUPERNODES = 50
+MAX_SUPEREDGES = 200
+EXPAND_MEMBERS = 25
+
+OTHER = "Other"
+
+
+class Overview(NamedTuple):
+    labels: List[str]          # per supernode
+    sizes: np.ndarray          # nodes per supernode
+    internal: np.ndarray       # edges inside each supernode
+    x: Optional[np.ndarray]    # supernode position: centroid of its nodes
+    y: Optional[np.ndarray]    # (None without positions)
+    edge_src: np.ndarray       # superedges (src < dst), heaviest first
+    edge_dst: np.ndarray
+    edge_weight: np.ndarray    # edges between the two clusters, either direction
+    members: np.ndarray        # shown member ids, supernode by supernode, best first
+    member_cluster: np.ndarray
+    member_src: np.ndarray     # edges among shown members (member ids)
+    member_dst: np.ndarray
+    link_member: np.ndarray    # shown member → other supernode edge counts
+    link_cluster: np.ndarray
+    link_weight: np.ndarray
+
+
+def _collapse(labels: np.ndarray):
+    """(supernode per node, kept cluster labels, whether there is an Other supernode)."""
+    labels = np.asarray(labels, dtype=np.int64)
+    sizes = np.bincount(labels) if len(labels) else np.zeros(0, dtype=np.int64)
+    order = np.argsort(-sizes, kind="stable")
+    order = order[sizes[order] > 0]
+
+    kept = order if len(order) <= MAX_SUPERNODES else order[:MAX_SUPERNODES - 1]
+    remap = np.full(len(sizes), len(kept), dtype=np.int64)
+    remap[kept] = np.arange(len(kept))
+    return remap[labels], kept, len(kept) < len(order)
+
+
+def _top_members(cluster: np.ndarray, score: np.ndarray, per_cluster: int) -> np.ndarray:
+    order = np.lexsort((np.arange(len(cluster)), -score, cluster))
+    grouped = cluster[order]
+    starts = np.flatnonzero(np.r_[True, grouped[1:] != grouped[:-1]])
+    within = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+    return order[within < per_cluster]
+
+
+def build_overview(
+    analytics,
+    labels: np.ndarray,
+    names: Optional[Sequence[str]] = None,
+    scores: Optional[np.ndarray] = None,
+    positions: Optional[np.ndarray] = None,
+) -> Overview:
+    """
+    Overview of a GraphAnalytics' graph for one cluster label per node.
+    names labels the clusters (else a cluster is named after its most
+    central member); scores rank members (e.g. PageRank); positions are
+    (n, 2) node coordinates (e.g. a Layout) for placing supernodes, else
+    x / y are None.
+    """
+    n = analytics.node_count
+    score = np.zeros(n) if scores is None else np.nan_to_num(np.asarray(scores, dtype=np.float64), nan=0.0)
+    cluster, kept, other = _collapse(labels)
+    k = int(cluster.max()) + 1 if n else 0
+
+    M = sp.csr_array((np.ones(n), (np.arange(n), cluster)), shape=(n, k))
+    A = analytics.adjacency(True)
+    W = (M.T @ (A @ M)).tocsr()
+
+    sizes = np.bincount(cluster, minlength=k)
+    internal = W.diagonal().astype(np.int64)
+
+    S = sp.triu(W + W.T, k=1).tocoo()
+    heaviest = np.lexsort((S.col, S.row, -S.data))[:MAX_SUPEREDGES]
+
+    centroid = None
+    if positions is not None:
+        centroid = (M.T @ np.asarray(positions, dtype=np.float64)) / np.maximum(sizes, 1)[:, None]
+
+    members = _top_members(cluster, score, EXPAND_MEMBERS)
+    member_cluster = cluster[members]
+
+    among = A[members][:, members].tocoo()
+    links = (analytics.adjacency(False)[members] @ M).tocoo()
+    outside = links.col != member_cluster[links.row]
+
+    if names is not None:
+        cluster_names = [names[c] for c in kept.tolist()]
+    else:
+        first = np.r_[True, member_cluster[1:] != member_cluster[:-1]]
+        leaders = dict(zip(member_cluster[first].tolist(), members[first].tolist()))
+        cluster_names = [str(analytics.names[leaders[c]]) for c in range(len(kept))]
+    if other:
+        cluster_names.append(OTHER)
+
+    return Overview(
+        labels=list(cluster_names),
+        sizes=sizes,
+        internal=internal,
+        x=centroid[:, 0] if centroid is not None else None,
+        y=centroid[:, 1] if centroid is not None else None,
+        edge_src=S.row[heaviest].astype(np.int64),
+        edge_dst=S.col[heaviest].astype(np.int64),
+        edge_weight=S.data[heaviest].astype(np.int64),
+        members=members,
+        member_cluster=member_cluster,
+        member_src=members[among.row],
+        member_dst=members[among.col],
+        link_member=members[links.row[outside]],
+        link_cluster=links.col[outside].astype(np.int64),
+        link_weight=links.data[outside].astype(np.int64),
+    )
+
+
+def subject_labels(subjects: Sequence[Sequence[str]], unassigned: str = "(no subject)"):
+    """(label per node, subject per label) from each node's first subject."""
+    index = {}
+    labels = np.empty(len(subjects), dtype=np.int64)
+    for i, values in enumerate(subjects):
+        labels[i] = index.setdefault(values[0] if values else unassigned, len(index))
+    return labels, list(index)
@@ -1,15 +1,197 @@
+import json
+
+import numpy as np
 from pyvis.network import Network
 
+from components.ego_network import edge_type_names
+
+# Double-click a node to add its reserved hidden neighbours (and their
+# edges to what is already drawn) to the page's vis.js DataSets, with no
+# Streamlit rerun. pyvis' template keeps the DataSets in globals.
+EXPAND_SCRIPT = """
+<script>
+(function () {
+  var reserve = %s;
+  network.on("doubleClick", function (params) {
+    if (!params.nodes.length) return;
+    var more = reserve.children[params.nodes[0]] || [];
+    var added = more.filter(function (id) { return nodes.get(id) === null; });
+    nodes.add(added.map(function (id) { return reserve.nodes[id]; }));
+    edges.add(reserve.edges.filter(function (e) {
+      return edges.get(e.id) === null && nodes.get(e.from) !== null && nodes.get(e.to) !== null;
+    }));
+  });
+})();
+</script>
+"""
+
+
+# Click a supernode to swap it for its members: edges among members that
+# are now drawn, plus member → supernode edges to the still-collapsed
+# clusters. Same globals as above.
+CLUSTER_SCRIPT = """
+<script>
+(function () {
+  var overview = %s;
+  network.on("click", function (params) {
+    if (!params.nodes.length) return;
+    var id = params.nodes[0];
+    var cluster = overview.members[id];
+    if (!cluster || nodes.get(id) === null) return;
+    edges.remove(network.getConnectedEdges(id));
+    nodes.remove(id);
+    nodes.add(cluster);
+    var shown = function (e) { return nodes.get(e.from) !== null && nodes.get(e.to) !== null; };
+    edges.add(overview.edges.filter(function (e) { return edges.get(e.id) === null && shown(e); }));
+    var gone = edges.get({ filter: function (e) { return !shown(e); } });
+    edges.remove(gone.map(function (e) { return e.id; }));
+  });
+})();
+</script>
+"""
+
+
+def _embed(html: str, script: str, payload) -> str:
+    # </script> inside a definition must not end the script block
+    script = script % json.dumps(payload).replace("</", "<\\/")
+    return html.replace("</body>", script + "</body>", 1)
+
 
-def draw_graph(G):
+def _new_network(layout):
     net = Network(height="700px", width="100%", directed=True)
-    net.barnes_hut()
+    if layout is None:
+        net.barnes_hut()
+    else:
+        net.toggle_physics(False)
+        # Dynamic smoothing adds a simulated support node per edge
+        net.options.edges.smooth.enabled = False
+    return net
+
+
+def _node(n, props, layout, **extra):
+    node = dict(label=n, title=f"{n}<br>{props.get('definition','')}", **extra)
+    position = layout.position(n) if layout is not None else None
+    if position is not None:
+        node.update(x=position[0], y=position[1], physics=False)
+    return node
+
+
+def draw_graph(G, layout=None):
+    """
+    pyvis network for G. With a Layout (graph_layout.py) nodes are pinned
+    at its coordinates and physics is off, so the browser draws straight
+    away instead of simulating; without one vis.js runs Barnes-Hut.
+    """
+    net = _new_network(layout)
 
     for n, props in G.nodes(data=True):
-        title = f"{n}<br>{props.get('definition','')}"
-        net.add_node(n, label=n, title=title)
+        net.add_node(n, **_node(n, props, layout))
 
     for u, v, d in G.edges(data=True):
         net.add_edge(u, v, label=d.get("type", ""))
 
     return net
+
+
+def draw_ego_network(G, engine, ego, reserve=None, layout=None) -> str:
+    """
+    HTML for an ego network (ego_network.py): centres drawn larger, and
+    with a Reserve every node with hidden neighbours expands on
+    double-click, client-side.
+    """
+    net = _new_network(layout)
+    names = engine.names
+    reserved = set(reserve.parent.tolist()) if reserve is not None else set()
+
+    for i, ring, hidden in zip(ego.ids.tolist(), ego.hops.tolist(), ego.hidden.tolist()):
+        n = names[i]
+        node = _node(n, G.nodes[n], layout, borderWidth=3 if ring == 0 else 1, size=25 if ring == 0 else 15)
+        if hidden:
+            hint = "double-click to expand" if i in reserved else "re-centre to see them"
+            node["title"] += f"<br><i>{hidden} more neighbours — {hint}</i>"
+        net.add_node(n, **node)
+
+    for u, v, label in zip(ego.src.tolist(), ego.dst.tolist(), edge_type_names(engine, ego.types)):
+        net.add_edge(names[u], names[v], label=label)
+
+    html = net.generate_html()
+    if reserve is None or not len(reserve.ids):
+        return html
+
+    children = {}
+    for child, parent in zip(reserve.ids.tolist(), reserve.parent.tolist()):
+        children.setdefault(names[parent], []).append(names[child])
+    payload = {
+        "children": children,
+        "nodes": {
+            names[i]: dict(_node(names[i], G.nodes[names[i]], layout, size=15), id=names[i])
+            for i in reserve.ids.tolist()
+        },
+        "edges": [
+            {"id": f"{names[u]}→{names[v]}:{label}", "from": names[u], "to": names[v], "label": label, "arrows": "to"}
+            for u, v, label in zip(reserve.src.tolist(), reserve.dst.tolist(), edge_type_names(engine, reserve.types))
+        ],
+    }
+    return _embed(html, EXPAND_SCRIPT, payload)
+
+
+def draw_overview(G, names, overview) -> str:
+    """
+    HTML for a supernode overview (supernodes.py): supernodes sized by
+    node count at their clusters' centroids, superedges weighted by edge
+    count. Clicking a supernode expands it into its top members. Without
+    positions (no layout yet) vis.js physics places everything.
+    """
+    placed = overview.x is not None
+    net = Network(height="700px", width="100%")
+    if placed:
+        net.toggle_physics(False)
+        net.options.edges.smooth.enabled = False
+    else:
+        net.barnes_hut()
+
+    top = max(int(overview.sizes.max()), 1) if len(overview.sizes) else 1
+    for c, label in enumerate(overview.labels):
+        size = int(overview.sizes[c])
+        position = dict(x=float(overview.x[c]), y=float(overview.y[c]), physics=False) if placed else {}
+        net.add_node(
+            f"cluster:{c}",
+            label=f"{label} ({size})",
+            title=f"{label}<br>{size} nodes, {int(overview.internal[c])} edges inside<br><i>click to expand</i>",
+            shape="dot",
+            size=10 + 40 * (size / top) ** 0.5,
+            group=c,
+            **position,
+        )
+
+    for u, v, w in zip(overview.edge_src.tolist(), overview.edge_dst.tolist(), overview.edge_weight.tolist()):
+        net.add_edge(f"cluster:{u}", f"cluster:{v}", value=w, title=f"{w} edges")
+
+    html = net.generate_html()
+
+    # Members fan out around their supernode (the centroid of the whole
+    # cluster, so the layout's own coordinates may sit far from it)
+    members = {}
+    for i, c in zip(overview.members.tolist(), overview.member_cluster.tolist()):
+        cluster = members.setdefault(f"cluster:{c}", [])
+        angle = 2.399963 * len(cluster)  # golden angle
+        radius = 30 * (len(cluster) + 1) ** 0.5
+        node = _node(names[i], G.nodes[names[i]], None, group=c, size=12)
+        node["id"] = names[i]
+        if placed:
+            node.update(
+                x=float(overview.x[c]) + radius * np.cos(angle),
+                y=float(overview.y[c]) + radius * np.sin(angle),
+                physics=False,
+            )
+        cluster.append(node)
+
+    edges = [
+        {"id": f"{names[u]}→{names[v]}", "from": names[u], "to": names[v], "arrows": "to"}
+        for u, v in zip(overview.member_src.tolist(), overview.member_dst.tolist())
+    ]
+    edges += [
+        {"id": f"{names[i]}→cluster:{c}", "from": names[i], "to": f"cluster:{c}", "value": w, "title": f"{w} edges"}
+        for i, c, w in zip(overview.link_member.tolist(), overview.link_cluster.tolist(), overview.link_weight.tolist())
+    ]
+    return _embed(html, CLUSTER_SCRIPT, {"members": members, "edges": edges})
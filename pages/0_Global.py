@@ -1,18 +1,25 @@
 import streamlit as st
-from components.graph_loader import load_graph
+from components.graph_cache import shared_analytics_table
 import pandas as pd
 
 st.title("🌍 Global Overview")
 
-G, _ = load_graph()
+table = shared_analytics_table()
 
-rows = []
-for n, props in G.nodes(data=True):
-    rows.append({
-        "node": n,
-        "degree": G.degree(n),
-        "subjects": ", ".join(props.get("metadata", {}).get("subjects", []))
-    })
+columns = ["degree", "pagerank"]
+if table.has_communities:
+    columns.append("community")
 
-df = pd.DataFrame(rows).sort_values("degree", ascending=False)
+# Rows come pre-sorted by degree: showing the top N costs N, not the graph
+total = len(table)
+limit = st.number_input(
+    "Rows",
+    min_value=1,
+    max_value=max(total, 1),
+    value=min(total, 1000) or 1,
+    step=100,
+)
+
+df = pd.DataFrame(table.rows(table.top_ids("degree", int(limit)), columns))
 st.dataframe(df, use_container_width=True)
+st.caption(f"Top {min(int(limit), total)} of {total} nodes by degree.")
@@ -1,13 +1,56 @@
 import streamlit as st
-import networkx as nx
-from components.graph_loader import load_graph
+from components import graph_loader
+from components.betweenness import job_status, start_betweenness_job
+from components.graph_cache import shared_analytics_table
 
 st.title("📖 Global Narrative")
 
-G, _ = load_graph()
-deg = nx.degree_centrality(G)
+table = shared_analytics_table()
 
-top = sorted(deg.items(), key=lambda x: -x[1])[:10]
+top = table.top("degree_centrality", 10)
 st.markdown("### 🔝 Most Central Concepts")
 for n, s in top:
     st.write(f"- **{n}** ({round(s,3)})")
+
+# ======================================================
+# Bridging concepts (betweenness, computed in the background)
+# ======================================================
+st.markdown("### 🌉 Bridging Concepts")
+
+
+@st.fragment(run_every="2s")
+def job_progress():
+    status = job_status(graph_loader.GRAPH_FILE) or {}
+    if status.get("state") != "running":
+        st.rerun()
+    done, total = status.get("done", 0), status.get("total")
+    st.progress(done / total if total else 0.0, text=f"Computing betweenness… {done}/{total or '?'} sources")
+
+
+betweenness = graph_loader.load_betweenness()
+status = job_status(graph_loader.GRAPH_FILE) or {}
+
+if betweenness is not None and len(betweenness.scores) == len(table):
+    ids = betweenness.top_ids(10)
+    for n, s in zip(table.names(ids), betweenness.scores[ids].tolist()):
+        st.write(f"- **{n}** ({round(s,4)})")
+    meta = betweenness.meta
+    if meta["mode"] == "approximate":
+        st.caption(
+            f"Approximate: {meta['samples']} sampled sources, each score within "
+            f"±{meta['epsilon']} with probability {1 - meta['delta']:.0%}."
+        )
+    else:
+        st.caption(f"Exact over all {meta['samples']} sources.")
+
+if status.get("state") == "running":
+    job_progress()
+else:
+    if status.get("state") == "failed":
+        st.error(f"Betweenness job failed: {status.get('error', 'unknown error')}")
+    elif betweenness is None:
+        st.info("Betweenness has not been computed for this version of the graph.")
+
+    if st.button("Recompute in background" if betweenness is not None else "Compute in background"):
+        start_betweenness_job(graph_loader.GRAPH_FILE)
+        st.rerun()
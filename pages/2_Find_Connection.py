@@ -1,18 +1,75 @@
 import streamlit as st
-import networkx as nx
-from components.graph_loader import load_graph
+from components.graph_cache import shared_path_engine
+from components.node_picker import node_picker
 
 st.title("🔗 Find Connection")
 
-G, _ = load_graph()
-nodes = sorted(G.nodes())
+engine = shared_path_engine()
 
-src = st.selectbox("Source", nodes)
-dst = st.selectbox("Target", nodes)
+src = node_picker("Source", key="source")
+dst = node_picker("Target", key="target")
 
-if st.button("Find Path"):
-    try:
-        path = nx.shortest_path(G, src, dst)
-        st.success(" → ".join(path))
-    except:
-        st.error("No path found.")
+directed = st.radio(
+    "Direction",
+    ["Follow edge direction", "Related in any direction"],
+    horizontal=True
+) == "Follow edge direction"
+
+REASONS = {
+    "different_components": "the two nodes are in different connected components",
+    "target_upstream": "the target comes before the source in the dependency order",
+    "no_directed_path": "no chain of edges leads from the source to the target",
+    "unknown_node": "one of the nodes is not in the graph",
+}
+
+
+def show_component(label, name):
+    info = engine.components.describe(engine.node_id(name))
+    subjects = ", ".join(f"{s} ({n})" for s, n in info["subjects"]) or "none"
+    cycle = f", on a cycle of {info['scc_size']}" if info["scc_size"] > 1 else ""
+    st.caption(
+        f"**{label}:** component {info['component'] + 1} of {info['component_count']} "
+        f"({info['component_size']} nodes{cycle}) · subjects: {subjects}"
+    )
+
+
+if engine.components is not None:
+    for label, name in (("Source", src), ("Target", dst)):
+        if name is not None and engine.node_id(name) is not None:
+            show_component(label, name)
+
+# Prerequisite chains, answered from the reachability labels
+if engine.reachability is not None and src is not None and dst is not None:
+    depends = engine.reachability.reachable(src, dst, profile="prerequisite")
+    if depends is not None:
+        st.caption(
+            f"**{src}** {'builds on' if depends else 'does not build on'} **{dst}** "
+            f"through prerequisite edges."
+        )
+
+cols = st.columns(2)
+with cols[0]:
+    k = st.slider("Paths to show", min_value=1, max_value=10, value=1)
+with cols[1]:
+    edge_types = st.multiselect("Only through edge types", options=sorted(engine.edge_types))
+
+if st.button("Find Path", disabled=src is None or dst is None):
+    if k == 1 and not edge_types:
+        path = engine.shortest_path(src, dst, directed=directed)
+        paths = [path] if path is not None else []
+        stream = None
+    else:
+        # Alternatives are rendered one by one as they are found
+        stream = engine.k_shortest_paths(src, dst, k, directed=directed, edge_types=edge_types or None)
+        paths = stream
+
+    found = 0
+    for path in paths:
+        found += 1
+        st.success(f"**{found}.** ({len(path) - 1} hops) " + " → ".join(path))
+
+    if not found:
+        reason = engine.why_unreachable(src, dst, directed=directed)
+        st.error(f"No path found: {REASONS[reason]}." if reason else "No path found.")
+    if stream is not None and stream.truncated:
+        st.caption(f"Stopped after {found} path(s): search budget reached.")
@@ -1,12 +1,26 @@
 import streamlit as st
-from components.graph_loader import load_graph
+from components.graph_cache import shared_graph
+from components.graph_loader import load_graph_db
+from components.node_picker import node_picker
 
 st.title("📘 Learn From Node")
 
-G, _ = load_graph()
-node = st.selectbox("Select node", sorted(G.nodes()))
+# Indexed SQLite store when the pipeline wrote one: no full graph load
+db = load_graph_db()
+
+node = node_picker("Select node", key="node")
+if node is None:
+    st.stop()
+
+if db is not None:
+    props = db.get_node(node) or {}
+    # One row per edge: a pair linked by several types repeats the target
+    neighbors = list(dict.fromkeys(e["target"] for e in db.successors(node)))
+else:
+    G = shared_graph().G
+    props = G.nodes[node]
+    neighbors = list(G.successors(node))
 
-props = G.nodes[node]
 st.write("### Definition")
 st.write(props.get("definition", "N/A"))
 
@@ -14,4 +28,4 @@ st.write("### Subjects")
 st.write(", ".join(props.get("metadata", {}).get("subjects", [])))
 
 st.write("### Neighbors")
-st.write(list(G.successors(node)))
+st.write(neighbors)
@@ -2,6 +2,8 @@ import streamlit as st
 import json
 from pathlib import Path
 
+from components.graph_loader import load_search_index
+
 # =====================================================
 # PATH RESOLUTION
 # =====================================================
@@ -74,9 +76,19 @@ with cols[2]:
 # FILTER + SORT
 # =====================================================
 
+# BM25 index lookup once per rerun; its hits are added to the substring
+# matches (it ignores stopwords and partial words, so it can't replace them)
+search_index = load_search_index() if search_query else None
+search_hits = None
+if search_index is not None:
+    search_hits = {n for n, _ in search_index.search(search_query, k=None)}
+
+
 def match_query(card):
     if not search_query:
         return True
+    if search_hits is not None and card.get("entity", "") in search_hits:
+        return True
     q = search_query.lower()
     return (
         q in card.get("entity", "").lower()
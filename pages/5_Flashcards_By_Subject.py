@@ -2,6 +2,8 @@ import streamlit as st
 import json
 from pathlib import Path
 
+from components.graph_loader import load_bitmap_index, load_search_index
+
 # =====================================================
 # PATH RESOLUTION
 # =====================================================
@@ -81,6 +83,19 @@ selected_subjects = st.multiselect(
     default=all_subjects[:1]  # avoid massive initial rendering
 )
 
+cols = st.columns(2)
+with cols[0]:
+    match_all = st.radio(
+        "Match",
+        ["Any selected subject", "All selected subjects"],
+        horizontal=True
+    ) == "All selected subjects"
+with cols[1]:
+    excluded_subjects = st.multiselect(
+        "🚫 Exclude subject(s):",
+        options=[s for s in all_subjects if s not in selected_subjects]
+    )
+
 search_query = st.text_input("🔍 Optional search inside selected subjects:")
 
 cols = st.columns(2)
@@ -93,13 +108,42 @@ with cols[1]:
 # FILTER
 # =====================================================
 
+# Subject filters as bitwise operations on the graph's bitmap index
+bitmaps = load_bitmap_index()
+subject_hits = None
+if bitmaps is not None:
+    subject_hits = set(bitmaps.node_names(bitmaps.select(
+        "subject",
+        all_of=selected_subjects if match_all else None,
+        any_of=None if match_all else selected_subjects,
+        none_of=excluded_subjects,
+    ))) if selected_subjects else set()
+
+
 def subject_match(card):
-    return any(s in selected_subjects for s in card.get("subjects", []))
+    if subject_hits is not None:
+        return card.get("entity", "") in subject_hits
+    subjects = card.get("subjects", [])
+    if any(s in excluded_subjects for s in subjects):
+        return False
+    if match_all:
+        return bool(selected_subjects) and all(s in subjects for s in selected_subjects)
+    return any(s in selected_subjects for s in subjects)
+
+
+# BM25 index lookup once per rerun; its hits are added to the substring
+# matches (it ignores stopwords and partial words, so it can't replace them)
+search_index = load_search_index() if search_query else None
+search_hits = None
+if search_index is not None:
+    search_hits = {n for n, _ in search_index.search(search_query, k=None)}
 
 
 def text_match(card):
     if not search_query:
         return True
+    if search_hits is not None and card.get("entity", "") in search_hits:
+        return True
     q = search_query.lower()
     return (
         q in card.get("entity", "").lower()
@@ -1,9 +1,9 @@
 import streamlit as st
-from components.graph_loader import load_graph
+from components.graph_cache import shared_graph
 
 st.title("🧹 Node Cleanup")
 
-G, raw = load_graph()
+G = shared_graph().G
 
 incomplete = [
     n for n, p in G.nodes(data=True)
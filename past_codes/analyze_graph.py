@@ -2,9 +2,20 @@
 # analyze_graph.py
 # =======================================
 import json
+import sys
+from pathlib import Path
+
 import networkx as nx
 from networkx.algorithms import community
 
+# Repo root, for the shared components package
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from components.analytics import GraphAnalytics
+from components.betweenness import approximate_betweenness
+
 
 def load_graph_from_json(json_path: str):
     """Load graph structure from a merged JSON file."""
@@ -27,8 +38,11 @@ def structural_summary(json_path: str = "merged_graph.json"):
     G = load_graph_from_json(json_path)
 
     # --- Compute key metrics ---
-    degree_centrality = nx.degree_centrality(G)
-    betweenness = nx.betweenness_centrality(G)
+    analytics = GraphAnalytics.from_graph(G)
+    degree_centrality = analytics.as_dict(analytics.degree_centrality())
+    # Exact for small graphs, sampled pivot sources beyond EXACT_MAX_NODES
+    scores, _ = approximate_betweenness(analytics, directed=True)
+    betweenness = analytics.as_dict(scores)
 
     # Convert to undirected for community detection
     G_undirected = G.to_undirected()
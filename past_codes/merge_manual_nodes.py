@@ -1,5 +1,11 @@
 import json
+import sys
 from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pipelines.edge_store import EdgeStore
 
 GRAPH_FILE = "merged_graph.json"
 MERGE_LOG = "merge_log.txt"
@@ -34,12 +40,10 @@ def merge_nodes(graph, old_node, new_node):
     if not new_data.get("domain") and old_data.get("domain"):
         new_data["domain"] = old_data["domain"]
 
-    # Redirect edges
-    for edge in graph["edges"]:
-        if edge["source"] == old_node:
-            edge["source"] = new_node
-        if edge["target"] == old_node:
-            edge["target"] = new_node
+    # Redirect edges (duplicates created by the redirect collapse)
+    edges = EdgeStore(graph["edges"])
+    edges.redirect_node(old_node, new_node)
+    graph["edges"] = edges.to_list()
 
     # Remove duplicate node
     del graph["nodes"][old_node]
@@ -1,6 +1,12 @@
 import json
 import os
+import sys
 from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pipelines.edge_store import EdgeStore
 
 # --- CONFIG ---
 INPUT_FOLDER = "json_nodes"
@@ -31,6 +37,7 @@ def load_json_nodes(folder):
 # --- STEP 2: Merge nodes and edges ---
 def merge_graph(json_list):
     graph = {"nodes": {}, "edges": []}
+    edges = EdgeStore()
 
     for entry in json_list:
         # Case 1: Graph-type JSON (optimization.json)
@@ -39,8 +46,7 @@ def merge_graph(json_list):
                 if name not in graph["nodes"]:
                     graph["nodes"][name] = node
             for edge in entry["edges"]:
-                if edge not in graph["edges"]:
-                    graph["edges"].append(edge)
+                edges.add(edge)
 
         # Case 2: Entity-based JSON (FFT)
         elif "entity" in entry:
@@ -60,8 +66,9 @@ def merge_graph(json_list):
             # Add relations as edges
             for rel in entry.get("relations", []):
                 edge = {"source": entity, "type": rel["type"], "target": rel["target"]}
-                if edge not in graph["edges"]:
-                    graph["edges"].append(edge)
+                edges.add(edge)
+
+    graph["edges"] = edges.to_list()
     return graph
 
 
@@ -69,6 +76,7 @@ def merge_graph(json_list):
 def normalize_nodes(graph):
     normalized_map = {}
     renamed_count = 0
+    edges = EdgeStore(graph["edges"])
 
     for node_name in list(graph["nodes"].keys()):
         normalized = node_name.strip().lower()
@@ -82,17 +90,14 @@ def normalize_nodes(graph):
                 existing_node["domain"] = new_node["domain"]
 
             # Repoint edges
-            for edge in graph["edges"]:
-                if edge["source"] == node_name:
-                    edge["source"] = existing_name
-                if edge["target"] == node_name:
-                    edge["target"] = existing_name
+            edges.redirect_node(node_name, existing_name)
 
             del graph["nodes"][node_name]
             renamed_count += 1
         else:
             normalized_map[normalized] = node_name
 
+    graph["edges"] = edges.to_list()
     print(f"🧩 Normalized {renamed_count} duplicate nodes (case/spacing).")
     return graph
 
@@ -1,18 +1,19 @@
 # pages/4_Global_Narrative.py
 import streamlit as st
 import json
+import sys
 from pathlib import Path
 import networkx as nx
-import itertools
 import pandas as pd
 from datetime import datetime
 
-# Try to import Louvain (python-louvain)
-try:
-    import community as community_louvain
-    _LOUVAIN_AVAILABLE = True
-except Exception:
-    _LOUVAIN_AVAILABLE = False
+# Repo root, for the shared components package
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from components.analytics import analytics_for_graph
+from components.communities import detect_communities
 
 st.set_page_config(page_title="📖 Global Narrative", layout="wide")
 st.title("📖 Global Narrative — Auto-generated Chapter Overviews")
@@ -43,63 +44,31 @@ if G.number_of_nodes() == 0:
 
 # Sidebar options
 st.sidebar.header("Options")
-algo_options = []
-if _LOUVAIN_AVAILABLE:
-    algo_options.append("Louvain Modularity (recommended)")
-algo_options += ["Greedy Modularity", "Label Propagation", "Girvan-Newman (edge betweenness)"]
+algo_options = ["Louvain Modularity (recommended)", "Label Propagation"]
 algorithm = st.sidebar.selectbox("Clustering algorithm", algo_options)
 max_chapters = st.sidebar.slider("Max chapters to produce/display", 1, 50, 12)
 include_examples = st.sidebar.checkbox("Include short chapter examples (from definitions)", True)
 compute_centrality = st.sidebar.checkbox("Compute centralities (degree & pagerank)", True)
-gn_levels = st.sidebar.slider("Girvan-Newman levels (if used)", 1, 3, 1)
+zoom = st.sidebar.slider("Louvain level (0 = finest, lower = smaller chapters)", 0, 9, 9)
 
 st.info("This page produces a narrative summary of the graph: chapter titles, descriptions, recommended learning order, and a downloadable Markdown.")
 
-# --- helper clustering functions (streamlit-caching safe naming) ---
-@st.cache_data(ttl=3600)
-def _run_louvain(_graph):
-    partition = community_louvain.best_partition(_graph.to_undirected())
-    clusters = {}
-    for n, com in partition.items():
-        clusters.setdefault(com, []).append(n)
-    return {k: sorted(v) for k, v in clusters.items()}
-
-@st.cache_data(ttl=3600)
-def _run_greedy(_graph):
-    und = _graph.to_undirected()
-    comms = list(nx.algorithms.community.greedy_modularity_communities(und))
-    return {i: sorted(list(c)) for i, c in enumerate(comms)}
-
-@st.cache_data(ttl=3600)
-def _run_label_prop(_graph):
-    und = _graph.to_undirected()
-    comms = list(nx.algorithms.community.label_propagation_communities(und))
-    return {i: sorted(list(c)) for i, c in enumerate(comms)}
-
-@st.cache_data(ttl=3600)
-def _run_girvan(_graph, _levels=1):
-    und = _graph.to_undirected()
-    comp = nx.algorithms.community.girvan_newman(und)
-    limited = list(itertools.islice(comp, _levels))
-    if not limited:
-        return {}
-    partition = limited[-1]
-    return {i: sorted(list(c)) for i, c in enumerate(partition)}
+# --- clustering: integer ids, cached on disk by graph content + parameters ---
+analytics = analytics_for_graph(G)
+
+
+def _run_clustering(algorithm_name):
+    result = detect_communities(analytics, algorithm_name)
+    return result.clusters(analytics.names, min(zoom, len(result) - 1))
+
 
 # run selected clustering
 with st.spinner("Running clustering..."):
     try:
         if algorithm.startswith("Louvain"):
-            if not _LOUVAIN_AVAILABLE:
-                st.error("Louvain not installed. Choose another algorithm.")
-                st.stop()
-            clusters = _run_louvain(G)
-        elif algorithm == "Greedy Modularity":
-            clusters = _run_greedy(G)
+            clusters = _run_clustering("louvain")
         elif algorithm == "Label Propagation":
-            clusters = _run_label_prop(G)
-        elif algorithm.startswith("Girvan-Newman"):
-            clusters = _run_girvan(G, _levels=gn_levels)
+            clusters = _run_clustering("label_propagation")
         else:
             st.error("Unknown algorithm selected")
             st.stop()
@@ -115,9 +84,10 @@ if not clusters:
 pagerank = {}
 deg = dict(G.degree())
 if compute_centrality:
+    # Shared sparse analytics: computed once per graph content
     try:
-        pagerank = nx.pagerank(G.to_undirected())
-    except Exception:
+        pagerank = analytics.as_dict(analytics.pagerank())
+    except nx.PowerIterationFailedConvergence:
         pagerank = {n: 0.0 for n in G.nodes()}
 
 # prepare cluster summaries
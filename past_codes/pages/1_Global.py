@@ -3,17 +3,19 @@
 # ==============================================
 import streamlit as st
 import json
+import sys
 from pathlib import Path
 import networkx as nx
 import pandas as pd
-import itertools
 
-# Try importing Louvain modularity algorithm
-try:
-    import community as community_louvain   # package name: python-louvain
-    _LOUVAIN_AVAILABLE = True
-except Exception:
-    _LOUVAIN_AVAILABLE = False
+# Repo root, for the shared components package
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from components.analytics import analytics_for_graph
+from components.betweenness import approximate_betweenness
+from components.communities import detect_communities
 
 # ==============================================
 # Streamlit Configuration
@@ -46,6 +48,16 @@ for edge in data.get("edges", []):
     if src and tgt:
         G.add_edge(src, tgt, type=rel)
 
+# Degree / PageRank computed once per graph content, not per call
+analytics = analytics_for_graph(G)
+
+
+def pagerank_scores():
+    try:
+        return analytics.as_dict(analytics.pagerank())
+    except nx.PowerIterationFailedConvergence:
+        return {n: 0 for n in G.nodes()}
+
 # ==============================================
 # Sidebar Options
 # ==============================================
@@ -54,70 +66,33 @@ st.sidebar.header("⚙️ Options")
 algo = st.sidebar.selectbox(
     "Clustering Algorithm",
     [
-        "Louvain Modularity (recommended)" if _LOUVAIN_AVAILABLE else "Louvain (missing)",
-        "Greedy Modularity",
+        "Louvain Modularity (recommended)",
         "Label Propagation",
-        "Girvan-Newman (edge betweenness)"
     ]
 )
 
 max_clusters_to_show = st.sidebar.slider("How many clusters to display:", 1, 40, 12)
-gn_levels = st.sidebar.slider("Girvan–Newman Levels", 1, 4, 1)
+zoom = st.sidebar.slider(
+    "Louvain level (0 = finest)", 0, 9, 9,
+    help="Lower levels split chapters into smaller concept groups"
+)
 show_visual = st.sidebar.checkbox("Show PyVis Visualization", True)
 compute_centrality = st.sidebar.checkbox("Compute Centrality Scores", True)
 
 # ==============================================
-# Cached Helper Functions (Streamlit-Safe)
+# Clustering (integer ids, cached on disk by graph content + parameters)
 # ==============================================
 
-@st.cache_data(ttl=3600)
-def run_louvain(_graph):
-    if not _LOUVAIN_AVAILABLE:
-        raise RuntimeError("python-louvain is not installed.")
-    partition = community_louvain.best_partition(_graph.to_undirected())
-
-    clusters = {}
-    for node, com in partition.items():
-        clusters.setdefault(com, []).append(node)
-
-    # sort clusters
-    return {cid: sorted(members) for cid, members in clusters.items()}
-
-
-@st.cache_data(ttl=3600)
-def run_greedy(_graph):
-    und = _graph.to_undirected()
-    comms = list(nx.algorithms.community.greedy_modularity_communities(und))
-    return {i: sorted(list(c)) for i, c in enumerate(comms)}
-
-
-@st.cache_data(ttl=3600)
-def run_label_prop(_graph):
-    und = _graph.to_undirected()
-    comms = list(nx.algorithms.community.label_propagation_communities(und))
-    return {i: sorted(list(c)) for i, c in enumerate(comms)}
-
-
-@st.cache_data(ttl=3600)
-def run_girvan_newman(_graph, _levels=1):
-    und = _graph.to_undirected()
-    comp = nx.algorithms.community.girvan_newman(und)
-    limited = list(itertools.islice(comp, _levels))
-    if not limited:
-        return {}
-
-    partition = limited[-1]
-    return {i: sorted(list(c)) for i, c in enumerate(partition)}
+def run_clustering(algorithm):
+    result = detect_communities(analytics, algorithm)
+    level = min(zoom, len(result) - 1)
+    return result.clusters(analytics.names, level), level, len(result)
 
 
 def summarize_clusters(clusters, G, top_k=6):
     rows = []
     deg = dict(G.degree())
-
-    try:
-        pr = nx.pagerank(G.to_undirected())
-    except Exception:
-        pr = {n: 0 for n in G.nodes()}
+    pr = pagerank_scores()
 
     for cid, members in sorted(clusters.items(), key=lambda x: -len(x[1]))[:max_clusters_to_show]:
         ranked = sorted(members, key=lambda n: (-deg.get(n, 0), -pr.get(n, 0)))
@@ -148,13 +123,9 @@ def clusters_to_json(clusters, G):
 with st.spinner(f"Running {algo} clustering..."):
     try:
         if algo.startswith("Louvain"):
-            clusters = run_louvain(G)
-        elif algo == "Greedy Modularity":
-            clusters = run_greedy(G)
+            clusters, level, level_count = run_clustering("louvain")
         elif algo == "Label Propagation":
-            clusters = run_label_prop(G)
-        elif algo.startswith("Girvan-Newman"):
-            clusters = run_girvan_newman(G, _levels=gn_levels)
+            clusters, level, level_count = run_clustering("label_propagation")
         else:
             st.error("Unknown algorithm")
             st.stop()
@@ -169,6 +140,8 @@ st.subheader("🔎 Chapters (Clusters) Discovered")
 
 num_clusters = len(clusters)
 st.markdown(f"**Number of clusters:** `{num_clusters}`")
+if level_count > 1:
+    st.caption(f"Level {level} of {level_count - 1} in the Louvain hierarchy.")
 
 summary_df = summarize_clusters(clusters, G)
 st.dataframe(summary_df, use_container_width=True)
@@ -193,10 +166,7 @@ view_n = st.number_input(
 )
 
 deg = dict(G.degree())
-try:
-    pr = nx.pagerank(G.to_undirected())
-except:
-    pr = {}
+pr = pagerank_scores()
 
 for cid, members in sorted(clusters.items(), key=lambda x: -len(x[1]))[:view_n]:
     with st.expander(f"Cluster {cid} — size {len(members)}"):
@@ -228,7 +198,9 @@ if compute_centrality:
             pr_sorted = []
 
         try:
-            bc = nx.betweenness_centrality(G.to_undirected())
+            # Exact on small graphs, sampled sources (ε = 0.05) past that
+            scores, _ = approximate_betweenness(analytics, directed=False)
+            bc = analytics.as_dict(scores)
             bc_sorted = sorted(bc.items(), key=lambda x: -x[1])[:20]
         except:
             bc_sorted = []
@@ -301,10 +273,8 @@ st.markdown("---")
 st.info("""
 ### How to interpret this page:
 - **Clusters = Chapters**  
-- Louvain → Best for topic structure  
-- Greedy → Hierarchical clusters  
+- Louvain → Best for topic structure; lower levels zoom into sub-topics  
 - Label Propagation → Broad fuzzy groups  
-- Girvan–Newman → Sharp conceptual splits  
 - Centrality shows the *core curriculum topics*  
 - Visualization reveals how chapters connect  
 """)
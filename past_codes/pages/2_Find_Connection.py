@@ -7,6 +7,14 @@ import networkx as nx
 from pathlib import Path
 from pyvis.network import Network
 import os
+import sys
+
+# Repo root, for the shared components package
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from components.render_cache import cached_html, file_version, render_key
 
 # ==============================
 # --- CONFIGURATION ---
@@ -90,7 +98,12 @@ def find_shortest_path_length(G, source, target):
 # --- VISUALIZATION FUNCTION ---
 # ==============================
 def visualize_path(G, path_nodes):
-    """Generate PyVis visualization entirely in memory (no temp files)."""
+    """PyVis visualization, rendered once per graph version and path."""
+    key = render_key(file_version(GRAPH_FILE), {"path": list(path_nodes)}, {"view": "find_connection"})
+    html_str = cached_html(key, lambda: path_html(G, path_nodes))
+    st.components.v1.html(html_str, height=750)
+
+def path_html(G, path_nodes):
     net = Network(height="700px", width="100%", bgcolor="#0e1117", font_color="white", directed=True)
     net.barnes_hut(gravity=-20000, central_gravity=0.3, spring_length=150, spring_strength=0.02)
 
@@ -109,9 +122,7 @@ def visualize_path(G, path_nodes):
     for src, tgt, rel in subgraph.edges(data=True):
         net.add_edge(src, tgt, title=rel["type"], label=rel["type"])
 
-    # Render in-memory HTML
-    html_str = net.generate_html()
-    st.components.v1.html(html_str, height=750)
+    return net.generate_html()
 
 # ==============================
 # --- MAIN EXECUTION ---
@@ -5,8 +5,16 @@ import streamlit as st
 import json
 import networkx as nx
 from pathlib import Path
+import sys
 from pyvis.network import Network
 
+# Repo root, for the shared components package
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from components.render_cache import cached_html, file_version, render_key
+
 # ==============================
 # --- CONFIGURATION ---
 # ==============================
@@ -168,6 +176,12 @@ st.markdown("---")
 st.subheader("🌐 Concept Neighborhood")
 
 def visualize_node_context(G, center, incoming, outgoing):
+    selection = {"center": center, "incoming": list(incoming), "outgoing": list(outgoing)}
+    key = render_key(file_version(GRAPH_FILE), selection, {"view": "learn_from_node"})
+    html = cached_html(key, lambda: node_context_html(center, incoming, outgoing))
+    st.components.v1.html(html, height=750)
+
+def node_context_html(center, incoming, outgoing):
     net = Network(height="750px", width="100%", bgcolor="#0e1117", font_color="white", directed=True)
     net.barnes_hut()
 
@@ -184,8 +198,7 @@ def visualize_node_context(G, center, incoming, outgoing):
         net.add_node(v, color="#FFA500")
         net.add_edge(u, v, label=rel)
 
-    html = net.generate_html()
-    st.components.v1.html(html, height=750)
+    return net.generate_html()
 
 visualize_node_context(G, selected_node, incoming_edges, outgoing_edges)
 
@@ -0,0 +1,71 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# ======================================================
+# PATH CONFIG
+# ======================================================
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from pipelines.merge_graph import merge_graph
+
+# ======================================================
+# TIMING
+# ======================================================
+
+def timed_merge(workers: int, repeat: int):
+    """Best-of-`repeat` wall time for merge_graph(workers=...)."""
+    best = float("inf")
+    graph = None
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            graph = merge_graph(workers=workers)
+        best = min(best, time.perf_counter() - started)
+
+    graph["metadata"]["built_at"] = None
+    return best, json.dumps(graph, ensure_ascii=False)
+
+
+def benchmark(worker_counts, repeat: int = 3):
+    serial_time, serial_output = timed_merge(1, repeat)
+
+    print("\n⏱  Merge timing (best of %d)" % repeat)
+    print(f"   {'workers':>7} | {'seconds':>8} | {'speedup':>7} | identical")
+    print(f"   {1:>7} | {serial_time:>8.3f} | {1.0:>6.2f}x | —")
+
+    for workers in worker_counts:
+        if workers <= 1:
+            continue
+        elapsed, output = timed_merge(workers, repeat)
+        same = "yes" if output == serial_output else "NO"
+        print(f"   {workers:>7} | {elapsed:>8.3f} | {serial_time / elapsed:>6.2f}x | {same}")
+
+
+# ======================================================
+# MAIN
+# ======================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare serial and parallel merges.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[2, 4, os.cpu_count() or 1],
+        help="worker counts to compare against the serial run"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    benchmark(sorted(set(args.workers)), args.repeat)
@@ -0,0 +1,117 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# ======================================================
+# PATH CONFIG
+# ======================================================
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from components.analytics import GraphAnalytics
+from components.analytics_table import (
+    AnalyticsTable,
+    analytics_table_path,
+    build_analytics_table,
+    save_analytics_table,
+    update_analytics_table,
+)
+from components.communities import detect_communities
+from components.graph_snapshot import source_fingerprint
+from components.npz_store import decode_meta
+from pipelines.build_path_index import load_engine, node_subjects
+
+GRAPH_FILE = BASE_DIR / "data" / "graphs" / "merged_graph.json"
+ANALYTICS_FILE = analytics_table_path(GRAPH_FILE)
+
+
+# ======================================================
+# BUILD
+# ======================================================
+
+def updated_arrays(analytics, subjects, source, seed: int = 0):
+    """
+    The previous table updated for this graph, or None when there is no
+    usable previous table or its report asks for a full build.
+    """
+    if not ANALYTICS_FILE.exists():
+        return None
+
+    result = update_analytics_table(AnalyticsTable.load(ANALYTICS_FILE), analytics, subjects, source, seed)
+    if result is None:
+        return None
+
+    arrays, report = result
+    print(
+        f"   Delta: +{report['nodes_added']}/-{report['nodes_removed']} nodes, "
+        f"+{report['edges_added']}/-{report['edges_removed']} edges "
+        f"({report['changed_fraction']:.2%} of edges)"
+    )
+    if "pagerank_iterations" in report:
+        print(f"   PageRank warm start: {report['pagerank_iterations']} iterations")
+    if "modularity" in report:
+        print(
+            f"   Communities refined around {report['region_nodes']} nodes, "
+            f"modularity {report['modularity']:.4f}"
+        )
+    if report["full_recompute"]:
+        print(f"⚠️ Full recompute warranted: {'; '.join(report['reasons'])}")
+        return None
+    return arrays
+
+
+def build_analytics(communities: bool = True, seed: int = 0, full: bool = False):
+    if not GRAPH_FILE.exists():
+        raise FileNotFoundError(f"Graph not found: {GRAPH_FILE}")
+
+    with open(GRAPH_FILE, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    source = source_fingerprint(GRAPH_FILE)
+    engine = load_engine(data)
+    analytics = GraphAnalytics.from_engine(engine)
+    subjects = node_subjects(data, engine.names)
+
+    started = time.perf_counter()
+    arrays = None if full or not communities else updated_arrays(analytics, subjects, source, seed)
+    mode = "incremental"
+    if arrays is None:
+        mode = "full"
+        labels = detect_communities(analytics, "louvain", seed=seed).labels() if communities else None
+        arrays = build_analytics_table(analytics, subjects, labels, source=source)
+    save_analytics_table(arrays, ANALYTICS_FILE)
+
+    meta = decode_meta(arrays["meta"])
+    print(
+        f"✅ Analytics ({mode}) for {meta['node_count']} nodes, {meta['community_count']} communities "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
+    if meta["not_converged"]:
+        print(f"⚠️ Did not converge (stored as NaN): {', '.join(meta['not_converged'])}")
+    print(f"💾 Saved to {ANALYTICS_FILE}")
+
+
+# ======================================================
+# MAIN
+# ======================================================
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Per-node analytics table for the overview pages.")
+    parser.add_argument("--no-communities", action="store_true", help="skip community detection")
+    parser.add_argument("--seed", type=int, default=0, help="seed for community detection")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="recompute everything instead of updating the previous table"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    build_analytics(communities=not args.no_communities, seed=args.seed, full=args.full)
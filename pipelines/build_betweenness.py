@@ -0,0 +1,118 @@
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# ======================================================
+# PATH CONFIG
+# ======================================================
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from components.analytics import GraphAnalytics
+from components.betweenness import (
+    DEFAULT_DELTA,
+    DEFAULT_EPSILON,
+    approximate_betweenness,
+    betweenness_path,
+    progress_path,
+    save_betweenness,
+    write_progress,
+)
+from components.graph_snapshot import source_fingerprint
+from pipelines.build_path_index import load_engine
+
+GRAPH_FILE = BASE_DIR / "data" / "graphs" / "merged_graph.json"
+BETWEENNESS_FILE = betweenness_path(GRAPH_FILE)
+PROGRESS_FILE = progress_path(GRAPH_FILE)
+
+
+# ======================================================
+# BUILD
+# ======================================================
+
+def build_betweenness(
+    epsilon: float = DEFAULT_EPSILON,
+    delta: float = DEFAULT_DELTA,
+    directed: bool = False,
+    exact=None,
+    workers: int = 1,
+    seed: int = 0,
+):
+    if not GRAPH_FILE.exists():
+        raise FileNotFoundError(f"Graph not found: {GRAPH_FILE}")
+
+    started = time.perf_counter()
+    status = {"state": "running", "pid": os.getpid(), "started_at": time.time(), "done": 0, "total": None}
+    write_progress(PROGRESS_FILE, **status)
+
+    try:
+        with open(GRAPH_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        source = source_fingerprint(GRAPH_FILE)
+        analytics = GraphAnalytics.from_engine(load_engine(data))
+
+        def progress(done, total):
+            status.update(done=done, total=total)
+            write_progress(PROGRESS_FILE, **status)
+            print(f"   {done}/{total} sources ({time.perf_counter() - started:.1f}s)", flush=True)
+
+        scores, info = approximate_betweenness(
+            analytics,
+            directed=directed,
+            epsilon=epsilon,
+            delta=delta,
+            exact=exact,
+            seed=seed,
+            workers=workers,
+            progress=progress,
+        )
+        info["seconds"] = round(time.perf_counter() - started, 2)
+        save_betweenness(scores, info, BETWEENNESS_FILE, source=source)
+    except Exception as e:
+        write_progress(PROGRESS_FILE, **dict(status, state="failed", error=str(e)))
+        raise
+
+    write_progress(PROGRESS_FILE, **dict(status, state="done", seconds=info["seconds"]))
+
+    bound = "" if info["mode"] == "exact" else f", ±{epsilon} with probability {1 - delta:.0%}"
+    print(f"✅ {info['mode'].capitalize()} betweenness from {info['samples']} sources{bound} "
+          f"in {info['seconds']:.2f}s")
+    print(f"💾 Saved to {BETWEENNESS_FILE}")
+
+
+# ======================================================
+# MAIN
+# ======================================================
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Betweenness centrality for the bridging-nodes view.")
+    parser.add_argument("--epsilon", type=float, default=DEFAULT_EPSILON, help="maximum error per node")
+    parser.add_argument("--delta", type=float, default=DEFAULT_DELTA, help="probability of exceeding epsilon")
+    parser.add_argument("--workers", type=int, default=1, help="process pool size (default: 1, serial)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the sampled sources")
+    parser.add_argument("--directed", action="store_true", help="follow edge direction")
+    parser.add_argument(
+        "--exact",
+        action="store_true",
+        help="use every node as a source (default: only for small graphs)"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    build_betweenness(
+        epsilon=args.epsilon,
+        delta=args.delta,
+        directed=args.directed,
+        exact=True if args.exact else None,
+        workers=args.workers,
+        seed=args.seed,
+    )
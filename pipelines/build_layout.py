@@ -0,0 +1,59 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# ======================================================
+# PATH CONFIG
+# ======================================================
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from components.analytics import GraphAnalytics
+from components.graph_layout import build_layout, layout_path, save_layout
+from components.graph_snapshot import source_fingerprint
+from pipelines.build_path_index import load_engine
+
+GRAPH_FILE = BASE_DIR / "data" / "graphs" / "merged_graph.json"
+LAYOUT_FILE = layout_path(GRAPH_FILE)
+
+
+# ======================================================
+# BUILD
+# ======================================================
+
+def build_graph_layout(seed: int = 0):
+    if not GRAPH_FILE.exists():
+        raise FileNotFoundError(f"Graph not found: {GRAPH_FILE}")
+
+    with open(GRAPH_FILE, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    source = source_fingerprint(GRAPH_FILE)
+    analytics = GraphAnalytics.from_engine(load_engine(data))
+
+    started = time.perf_counter()
+    arrays = build_layout(analytics, seed=seed, source=source)
+    save_layout(arrays, LAYOUT_FILE)
+
+    print(f"✅ Layout for {analytics.node_count} nodes in {time.perf_counter() - started:.2f}s")
+    print(f"💾 Saved to {LAYOUT_FILE}")
+
+
+# ======================================================
+# MAIN
+# ======================================================
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fixed node coordinates for the graph view.")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the initial positions")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    build_graph_layout(seed=args.seed)
@@ -0,0 +1,138 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# ======================================================
+# PATH CONFIG
+# ======================================================
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+import networkx as nx
+
+from components.component_index import build_component_index, component_path, save_component_index
+from components.graph_snapshot import open_snapshot, snapshot_path, source_fingerprint
+from components.path_engine import (
+    DEFAULT_LANDMARKS,
+    PathEngine,
+    build_landmarks,
+    landmark_path,
+    save_landmarks,
+)
+from components.reachability_index import (
+    ReachabilityIndex,
+    build_reachability_index,
+    reachability_path,
+    save_reachability_index,
+    update_reachability_index,
+)
+
+GRAPH_FILE = BASE_DIR / "data" / "graphs" / "merged_graph.json"
+SNAPSHOT_FILE = snapshot_path(GRAPH_FILE)
+LANDMARK_FILE = landmark_path(GRAPH_FILE)
+COMPONENT_FILE = component_path(GRAPH_FILE)
+REACHABILITY_FILE = reachability_path(GRAPH_FILE)
+
+
+# ======================================================
+# BUILD
+# ======================================================
+
+def load_engine(data: dict) -> PathEngine:
+    """Engine over the snapshot if it is current, else over the JSON graph."""
+    snapshot = open_snapshot(SNAPSHOT_FILE, source=GRAPH_FILE)
+    if snapshot is not None:
+        return PathEngine.from_snapshot(snapshot)
+
+    G = nx.DiGraph()
+    G.add_nodes_from(data.get("nodes", {}))
+    G.add_edges_from(
+        (e.get("source"), e.get("target"), {"type": e.get("type", "related_to")})
+        for e in data.get("edges", [])
+    )
+    return PathEngine.from_graph(G)
+
+
+def node_subjects(data: dict, names) -> list:
+    nodes = data.get("nodes", {})
+    return [
+        nodes.get(name, {}).get("metadata", {}).get("subjects", [])
+        for name in names
+    ]
+
+
+def reachability_arrays(engine: PathEngine, source: dict, full: bool = False):
+    """
+    Labels for the engine's graph: the previous index updated in place
+    when the graph only gained nodes and edges since, else a full build.
+    """
+    if not full and REACHABILITY_FILE.exists():
+        previous = ReachabilityIndex.load(REACHABILITY_FILE)
+        arrays = update_reachability_index(previous, engine, source=source)
+        if arrays is not None:
+            return arrays, "incremental"
+    return build_reachability_index(engine, source=source), "full"
+
+
+def build_path_index(count: int = DEFAULT_LANDMARKS, full: bool = False):
+    if not GRAPH_FILE.exists():
+        raise FileNotFoundError(f"Graph not found: {GRAPH_FILE}")
+
+    with open(GRAPH_FILE, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    source = source_fingerprint(GRAPH_FILE)
+    engine = load_engine(data)
+
+    started = time.perf_counter()
+    arrays = build_landmarks(engine, count, source=source)
+    save_landmarks(arrays, LANDMARK_FILE)
+
+    print(
+        f"✅ {len(arrays['landmarks'])} landmarks over {engine.node_count} nodes "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
+    print(f"💾 Saved to {LANDMARK_FILE}")
+
+    started = time.perf_counter()
+    arrays = build_component_index(engine, node_subjects(data, engine.names), source=source)
+    save_component_index(arrays, COMPONENT_FILE)
+
+    print(
+        f"✅ {len(arrays['wcc_size'])} weak / {len(arrays['scc_size'])} strong components "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
+    print(f"💾 Saved to {COMPONENT_FILE}")
+
+    started = time.perf_counter()
+    arrays, mode = reachability_arrays(engine, source, full=full)
+    save_reachability_index(arrays, REACHABILITY_FILE)
+
+    print(
+        f"✅ Reachability labels ({mode}) in {time.perf_counter() - started:.2f}s"
+    )
+    print(f"💾 Saved to {REACHABILITY_FILE}")
+
+
+# ======================================================
+# MAIN
+# ======================================================
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build the path-finding indexes next to merged_graph.json.")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="rebuild the reachability labels from scratch instead of updating them"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    build_path_index(full=args.full)
@@ -0,0 +1,57 @@
+import json
+import sys
+from pathlib import Path
+
+# ======================================================
+# PATH CONFIG
+# ======================================================
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from components.autocomplete import (
+    build_autocomplete_index,
+    node_degrees,
+    save_autocomplete_index,
+)
+from components.graph_snapshot import source_fingerprint
+from components.search_index import build_search_index, save_search_index
+
+GRAPH_FILE = BASE_DIR / "data" / "graphs" / "merged_graph.json"
+INDEX_FILE = BASE_DIR / "data" / "indexes" / "search_index.npz"
+AUTOCOMPLETE_FILE = BASE_DIR / "data" / "indexes" / "autocomplete_index.npz"
+
+
+# ======================================================
+# BUILD
+# ======================================================
+
+def build_index():
+    if not GRAPH_FILE.exists():
+        raise FileNotFoundError(f"Graph not found: {GRAPH_FILE}")
+
+    with open(GRAPH_FILE, "r", encoding="utf-8") as f:
+        graph = json.load(f)
+
+    source = source_fingerprint(GRAPH_FILE)
+
+    index = build_search_index(graph, source=source)
+    save_search_index(index, INDEX_FILE)
+
+    print(f"✅ Indexed {len(index['doc_len'])} nodes, {len(index['term_offsets']) - 1} terms")
+    print(f"💾 Saved to {INDEX_FILE}")
+
+    names, degree = node_degrees(graph)
+    save_autocomplete_index(build_autocomplete_index(names, degree, source), AUTOCOMPLETE_FILE)
+
+    print(f"💾 Saved autocomplete index to {AUTOCOMPLETE_FILE}")
+
+
+# ======================================================
+# MAIN
+# ======================================================
+
+if __name__ == "__main__":
+    build_index()
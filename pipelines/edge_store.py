@@ -0,0 +1,153 @@
+import json
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# ======================================================
+# EDGE IDENTITY
+# ======================================================
+
+EdgeKey = Tuple[object, object, object]
+Provenance = Tuple[str, str]
+
+
+def _hashable(value):
+    """Lists / dicts coming from hand-written JSON are not hashable."""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, sort_keys=True, ensure_ascii=False)
+    return value
+
+
+def edge_key(edge: dict) -> EdgeKey:
+    """Canonical edge identity: (source, type, target)."""
+    return (
+        _hashable(edge.get("source")),
+        _hashable(edge.get("type")),
+        _hashable(edge.get("target")),
+    )
+
+
+# ======================================================
+# EDGE STORE
+# ======================================================
+
+class EdgeStore:
+    """
+    Insertion-ordered edge set keyed by (source, type, target).
+
+    Insert / lookup are O(1), the first writer of an edge wins, and every
+    edge remembers which (subject_id, file) pairs contributed it.
+    """
+
+    def __init__(self, edges: Optional[Iterable[dict]] = None):
+        self._edges: Dict[EdgeKey, dict] = {}
+        self._provenance: Dict[EdgeKey, Dict[Provenance, None]] = {}
+        # Insertion sequence (survives redirects) and node → incident keys
+        self._seq: Dict[EdgeKey, int] = {}
+        self._by_node: Dict[object, Dict[EdgeKey, None]] = {}
+        self._next_seq = 0
+
+        for edge in edges or []:
+            self.add(edge)
+
+    # --------------------------------------------------
+    # Mutation
+    # --------------------------------------------------
+    def add(self, edge: dict, subject_id: str = None, source_file: str = None) -> bool:
+        """
+        Insert an edge.
+        Returns True if the edge was new, False if it was already stored.
+        """
+        key = edge_key(edge)
+        is_new = key not in self._edges
+
+        if is_new:
+            self._insert(key, edge, self._next_seq)
+            self._next_seq += 1
+
+        if subject_id is not None or source_file is not None:
+            self._provenance[key][(subject_id, source_file)] = None
+
+        return is_new
+
+    def _insert(self, key: EdgeKey, edge: dict, seq: int):
+        self._edges[key] = edge
+        self._provenance[key] = {}
+        self._seq[key] = seq
+        self._by_node.setdefault(key[0], {})[key] = None
+        self._by_node.setdefault(key[2], {})[key] = None
+
+    def discard(self, key: EdgeKey) -> Optional[dict]:
+        """Remove an edge by key, returning it (or None)."""
+        if key not in self._edges:
+            return None
+
+        for node in (key[0], key[2]):
+            incident = self._by_node.get(node)
+            if incident is not None:
+                incident.pop(key, None)
+                if not incident:
+                    del self._by_node[node]
+
+        self._provenance.pop(key)
+        self._seq.pop(key)
+        return self._edges.pop(key)
+
+    def redirect_node(self, old_node: str, new_node: str) -> int:
+        """
+        Repoint every edge touching old_node to new_node in O(degree).
+        Rewritten edges keep their position; edges that collapse onto an
+        existing edge are merged into it (provenance kept).
+        Returns the number of edges rewritten.
+        """
+        if old_node == new_node:
+            return 0
+
+        keys = list(self._by_node.get(old_node, {}))
+
+        for key in keys:
+            provenance = self._provenance[key]
+            seq = self._seq[key]
+            edge = dict(self.discard(key))
+
+            if edge.get("source") == old_node:
+                edge["source"] = new_node
+            if edge.get("target") == old_node:
+                edge["target"] = new_node
+
+            new_key = edge_key(edge)
+            if new_key in self._edges:
+                # Keep the earlier position of the two colliding edges
+                self._seq[new_key] = min(self._seq[new_key], seq)
+            else:
+                self._insert(new_key, edge, seq)
+            self._provenance[new_key].update(provenance)
+
+        return len(keys)
+
+    # --------------------------------------------------
+    # Lookup
+    # --------------------------------------------------
+    def __contains__(self, edge) -> bool:
+        key = edge if isinstance(edge, tuple) else edge_key(edge)
+        return key in self._edges
+
+    def __len__(self) -> int:
+        return len(self._edges)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.to_list())
+
+    def get(self, key: EdgeKey) -> Optional[dict]:
+        return self._edges.get(key)
+
+    def provenance(self, edge) -> List[Provenance]:
+        """(subject_id, source_file) pairs that contributed this edge."""
+        key = edge if isinstance(edge, tuple) else edge_key(edge)
+        return list(self._provenance.get(key, {}))
+
+    # --------------------------------------------------
+    # Serialization
+    # --------------------------------------------------
+    def to_list(self) -> List[dict]:
+        """Edges in insertion order, ready for json.dump."""
+        keys = sorted(self._edges, key=self._seq.__getitem__)
+        return [self._edges[k] for k in keys]
@@ -1,10 +1,19 @@
 import json
+import sys
 from pathlib import Path
 from collections import defaultdict
 
 BASE_DIR = Path(__file__).resolve().parents[1]
+
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from components.bitmap_index import bitmap_path, build_bitmap_index, save_bitmap_index
+from components.graph_snapshot import source_fingerprint
+
 GRAPH = BASE_DIR / "data" / "graphs" / "merged_graph.json"
 OUT = BASE_DIR / "data" / "indexes" / "subject_index.json"
+BITMAPS = bitmap_path(GRAPH)
 OUT.parent.mkdir(parents=True, exist_ok=True)
 
 graph = json.loads(GRAPH.read_text())
@@ -17,3 +26,7 @@ for node, props in graph["nodes"].items():
 
 OUT.write_text(json.dumps(index, indent=2))
 print(f"✅ Subject index saved → {OUT}")
+
+# Same membership as bitsets over node ids, used by the filter components
+save_bitmap_index(build_bitmap_index(graph, source_fingerprint(GRAPH)), BITMAPS)
+print(f"✅ Bitmap index saved → {BITMAPS}")
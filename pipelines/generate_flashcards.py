@@ -1,4 +1,7 @@
+import argparse
+import hashlib
 import json
+import sys
 from pathlib import Path
 
 # ======================================================
@@ -7,26 +10,121 @@ from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from components.graph_db import GraphDB, db_path
+
 GRAPH_FILE = BASE_DIR / "data" / "graphs" / "merged_graph.json"
+DB_FILE = db_path(GRAPH_FILE)
 FLASHCARD_FILE = BASE_DIR / "data" / "flashcards" / "flashcards.json"
 
 FLASHCARD_FILE.parent.mkdir(parents=True, exist_ok=True)
 
+# Part of every content hash: bump when card_for() changes so all cards
+# are regenerated once
+CARD_VERSION = 1
+
 
 # ======================================================
 # GENERATION
 # ======================================================
-
-def generate_flashcards():
-    if not GRAPH_FILE.exists():
-        raise FileNotFoundError(f"Graph not found: {GRAPH_FILE}")
+#
+# Cards are keyed by entity and carry a hash of the node content they
+# were built from (definition, description, properties, domain, subjects,
+# sources). A run rebuilds only cards whose hash changed, drops cards of
+# nodes that are gone, and writes the store sorted by entity with one
+# card per block, so a small merge shows up as a small diff. The file is
+# left untouched when nothing changed.
+
+def content_hash(props: dict) -> str:
+    meta = props.get("metadata", {})
+    content = [
+        CARD_VERSION,
+        props.get("definition"),
+        props.get("description"),
+        props.get("properties"),
+        props.get("domain"),
+        meta.get("subjects", []),
+        meta.get("source_files", []),
+    ]
+    payload = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def card_for(entity: str, props: dict, digest: str) -> dict:
+    meta = props.get("metadata", {})
+
+    subjects = meta.get("subjects", [])
+    sources = meta.get("source_files", [])
+
+    domain = props.get("domain", "General")
+    definition = props.get("definition", "No definition available.")
+    description = props.get("description", "")
+    properties = props.get("properties", {})
+
+    facts = []
+    for k, v in properties.items():
+        if isinstance(v, list):
+            v = ", ".join(map(str, v))
+        facts.append(f"**{k}:** {v}")
+
+    return {
+        "entity": entity,
+        "domain": domain,
+        "subjects": subjects,
+        "sources": sources,
+        "front": f"🧩 {entity}\n📘 Domain: {domain}\n📚 Subjects: {', '.join(subjects)}",
+        "back": (
+            f"**Definition:** {definition}\n\n"
+            f"**Description:** {description}\n\n"
+            + "\n".join(facts)
+        ).strip(),
+        "hash": digest,
+    }
+
+
+def load_cards(path: Path) -> dict:
+    """entity → card from a previous run (empty if missing or unreadable)."""
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cards = json.load(f)
+    except json.JSONDecodeError:
+        return {}
+    return {card["entity"]: card for card in cards if "entity" in card}
+
+
+def node_records():
+    """
+    (entity, node record) pairs, from the SQLite store when
+    merge_graph.py --sqlite wrote an up-to-date one (node rows only, no
+    edges), else from merged_graph.json.
+    """
+    db = GraphDB.open(DB_FILE, source=GRAPH_FILE)
+    if db is not None:
+        try:
+            yield from db.node_records()
+        finally:
+            db.close()
+        return
 
     with open(GRAPH_FILE, "r", encoding="utf-8") as f:
         graph = json.load(f)
+    yield from graph["nodes"].items()
 
-    flashcards = []
 
-    for entity, props in graph["nodes"].items():
+def generate_flashcards(full: bool = False):
+    if not GRAPH_FILE.exists():
+        raise FileNotFoundError(f"Graph not found: {GRAPH_FILE}")
+
+    existing = load_cards(FLASHCARD_FILE)
+    previous = {} if full else existing
+    cards = {}
+    regenerated = 0
+
+    for entity, props in node_records():
 
         # Skip empty placeholder nodes
         if not any([
@@ -36,39 +134,29 @@ def generate_flashcards():
         ]):
             continue
 
-        meta = props.get("metadata", {})
-
-        subjects = meta.get("subjects", [])
-        sources = meta.get("source_files", [])
-
-        domain = props.get("domain", "General")
-        definition = props.get("definition", "No definition available.")
-        description = props.get("description", "")
-        properties = props.get("properties", {})
-
-        facts = []
-        for k, v in properties.items():
-            if isinstance(v, list):
-                v = ", ".join(map(str, v))
-            facts.append(f"**{k}:** {v}")
-
-        flashcards.append({
-            "entity": entity,
-            "domain": domain,
-            "subjects": subjects,
-            "sources": sources,
-            "front": f"🧩 {entity}\n📘 Domain: {domain}\n📚 Subjects: {', '.join(subjects)}",
-            "back": (
-                f"**Definition:** {definition}\n\n"
-                f"**Description:** {description}\n\n"
-                + "\n".join(facts)
-            ).strip()
-        })
-
-    with open(FLASHCARD_FILE, "w", encoding="utf-8") as f:
-        json.dump(flashcards, f, indent=2, ensure_ascii=False)
-
-    print(f"✅ Generated {len(flashcards)} flashcards")
+        digest = content_hash(props)
+        card = previous.get(entity)
+        if card is None or card.get("hash") != digest:
+            card = card_for(entity, props, digest)
+            regenerated += 1
+        cards[entity] = card
+
+    removed = len(existing.keys() - cards.keys())
+    flashcards = [cards[entity] for entity in sorted(cards)]
+    text = json.dumps(flashcards, indent=2, ensure_ascii=False)
+
+    print(
+        f"✅ {len(flashcards)} flashcards: {regenerated} regenerated, "
+        f"{removed} removed, {len(flashcards) - regenerated} unchanged"
+    )
+
+    if FLASHCARD_FILE.exists() and FLASHCARD_FILE.read_text(encoding="utf-8") == text:
+        print(f"✅ {FLASHCARD_FILE} already up to date")
+        return
+
+    tmp = FLASHCARD_FILE.with_name(FLASHCARD_FILE.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    tmp.replace(FLASHCARD_FILE)
     print(f"💾 Saved to {FLASHCARD_FILE}")
 
 
@@ -76,5 +164,12 @@ def generate_flashcards():
 # MAIN
 # ======================================================
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Flashcards from the merged graph, regenerated per changed node.")
+    parser.add_argument("--full", action="store_true", help="regenerate every card")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    generate_flashcards()
+    args = parse_args()
+    generate_flashcards(full=args.full)
@@ -0,0 +1,235 @@
+import json
+import re
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+from pipelines.edge_store import edge_key
+
+# ======================================================
+# STREAMING JSON READER
+# ======================================================
+#
+# Walks a JSON document chunk by chunk and only materializes the values the
+# caller asks for. Memory is bounded by CHUNK_SIZE plus the largest single
+# value decoded, independent of the document size.
+
+CHUNK_SIZE = 1 << 20
+SKIP_WHITESPACE = re.compile(r"[ \t\n\r]*").match
+
+
+class JsonStreamReader:
+    def __init__(self, f, chunk_size: int = CHUNK_SIZE):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    # --------------------------------------------------
+    # Buffer management
+    # --------------------------------------------------
+    def _fill(self) -> bool:
+        """Read one more chunk. Returns False at end of file."""
+        if self._eof:
+            return False
+
+        chunk = self._f.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+
+        # Drop the consumed prefix so the buffer never grows past one value
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _error(self, msg: str):
+        return json.JSONDecodeError(msg, self._buf, self._pos)
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of file)."""
+        while True:
+            self._pos = SKIP_WHITESPACE(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, ch: str):
+        if self.peek() != ch:
+            raise self._error(f"Expected {ch!r}")
+        self._pos += 1
+
+    # --------------------------------------------------
+    # Values
+    # --------------------------------------------------
+    def read_value(self):
+        """Decode the next complete value."""
+        self.peek()
+
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+
+            # A number cut at the chunk boundary decodes "successfully"
+            if end == len(self._buf) and not self._eof and self._fill():
+                continue
+
+            self._pos = end
+            return value
+
+    def skip_value(self):
+        """Skip the next value without building it."""
+        ch = self.peek()
+
+        if ch not in "[{":
+            self.read_value()
+            return
+
+        depth = 0
+        in_string = False
+        escaped = False
+
+        while True:
+            if self._pos >= len(self._buf) and not self._fill():
+                raise self._error("Unterminated value")
+
+            c = self._buf[self._pos]
+            self._pos += 1
+
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif c == "\\":
+                    escaped = True
+                elif c == '"':
+                    in_string = False
+            elif c == '"':
+                in_string = True
+            elif c in "[{":
+                depth += 1
+            elif c in "]}":
+                depth -= 1
+                if depth == 0:
+                    return
+
+    # --------------------------------------------------
+    # Containers
+    # --------------------------------------------------
+    def iter_object(self) -> Iterator[str]:
+        """
+        Yield the keys of the next object.
+        After each key the reader sits on its value; the caller must
+        consume it (read_value / skip_value / iter_*) before continuing.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+
+        while True:
+            if self.peek() != '"':
+                raise self._error("Expected object key")
+            key = self.read_value()
+            self.expect(":")
+
+            yield key
+
+            ch = self.peek()
+            self._pos += 1
+            if ch == "}":
+                return
+            if ch != ",":
+                raise self._error("Expected ',' or '}'")
+
+    def iter_array(self) -> Iterator[None]:
+        """Yield once per array element, positioned on the element."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+
+        while True:
+            yield None
+
+            ch = self.peek()
+            self._pos += 1
+            if ch == "]":
+                return
+            if ch != ",":
+                raise self._error("Expected ',' or ']'")
+
+
+# ======================================================
+# GRAPH PAYLOADS
+# ======================================================
+
+def stream_graph_payload(path: Path) -> Optional[Tuple[dict, dict]]:
+    """
+    Stream a full-graph payload ({"nodes": {...}, "edges": [...]}).
+
+    Returns (nodes, edges) where nodes is {name: node_data} and edges is
+    {edge_key: edge}, both in document order. Neither the raw text nor
+    the top-level document is ever held in memory at once, and repeated
+    strings (field names, node names used as edge endpoints) are shared,
+    as json.load would for keys.
+
+    Returns None if the document is not a full-graph payload, so the
+    caller can fall back to the regular loader.
+    Raises json.JSONDecodeError on malformed input.
+    """
+    nodes = {}
+    edges = {}
+    seen = set()
+    share = {}.setdefault
+
+    def shared_keys(value):
+        if not isinstance(value, dict):
+            return value
+        return {share(k, k): v for k, v in value.items()}
+
+    def shared_edge(value):
+        if not isinstance(value, dict):
+            return value
+        return {
+            share(k, k): share(v, v) if type(v) is str else v
+            for k, v in value.items()
+        }
+
+    with open(path, "r", encoding="utf-8") as f:
+        reader = JsonStreamReader(f)
+
+        if reader.peek() != "{":
+            return None
+
+        for key in reader.iter_object():
+            seen.add(key)
+
+            if key == "nodes" and reader.peek() == "{":
+                for name in reader.iter_object():
+                    nodes[share(name, name)] = shared_keys(reader.read_value())
+
+            elif key == "edges" and reader.peek() == "[":
+                for _ in reader.iter_array():
+                    edge = shared_edge(reader.read_value())
+                    edges.setdefault(edge_key(edge), edge)
+
+            elif key in ("nodes", "edges"):
+                # Some other shape — let the regular loader decide
+                return None
+
+            else:
+                reader.skip_value()
+
+        if reader.peek() != "":
+            raise reader._error("Extra data")
+
+    if "nodes" not in seen or "edges" not in seen:
+        return None
+
+    return nodes, edges
@@ -1,4 +1,9 @@
+import argparse
 import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
@@ -9,8 +14,31 @@ from typing import Optional
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from components.bitmap_index import bitmap_path, build_bitmap_index, save_bitmap_index
+from components.graph_db import db_path, write_graph_db
+from components.graph_snapshot import snapshot_path, source_fingerprint, write_snapshot
+from pipelines.edge_store import EdgeStore, edge_key
+from pipelines.json_stream import stream_graph_payload
+from pipelines.merge_manifest import (
+    file_entry,
+    load_manifest,
+    manifest_path,
+    new_manifest,
+    save_manifest,
+    sha256_bytes,
+    sha256_file,
+    stat_matches,
+)
+
 JSON_NODES_DIR = BASE_DIR / "json_nodes"
 OUTPUT_GRAPH = BASE_DIR / "data" / "graphs" / "merged_graph.json"
+MANIFEST_FILE = manifest_path(OUTPUT_GRAPH)
+SNAPSHOT_FILE = snapshot_path(OUTPUT_GRAPH)
+DB_FILE = db_path(OUTPUT_GRAPH)
+BITMAP_FILE = bitmap_path(OUTPUT_GRAPH)
 
 OUTPUT_GRAPH.parent.mkdir(parents=True, exist_ok=True)
 
@@ -22,6 +50,9 @@ SKIP_FILES = {
     ".ds_store"
 }
 
+# Full-graph payloads at least this large are streamed instead of json.load-ed
+STREAM_THRESHOLD_BYTES = 16 * 1024 * 1024
+
 # ======================================================
 # UTILITIES
 # ======================================================
@@ -53,6 +84,35 @@ def safe_load_json(path: Path) -> Optional[dict]:
         return None
 
 
+def stream_large_graph(path: Path):
+    """
+    Stream a large full-graph payload (see json_stream.py).
+
+    Returns:
+        (nodes, edges) — streamed
+        None           — not large / not a full-graph payload, load normally
+        False          — invalid or unreadable
+    """
+    try:
+        if path.stat().st_size < STREAM_THRESHOLD_BYTES:
+            return None
+
+        streamed = stream_graph_payload(path)
+        if streamed is None:
+            return None
+
+        nodes, edges = streamed
+        return nodes, list(edges.values())
+
+    except json.JSONDecodeError:
+        print(f"⚠️ Invalid JSON skipped: {path}")
+        return False
+
+    except Exception as e:
+        print(f"⚠️ Failed reading {path}: {e}")
+        return False
+
+
 def iter_subject_files():
     """
     Yield:
@@ -81,8 +141,109 @@ def iter_subject_files():
 # MERGE ENGINE
 # ======================================================
 
-def merge_graph():
-    graph = {
+# Outcome of parsing one subject file
+STATUS_OK = "ok"
+STATUS_UNSUPPORTED = "unsupported"
+STATUS_INVALID = "invalid"
+
+
+def entity_node(item: dict) -> dict:
+    """Node template for entity-style payloads (cases 2 and 3)."""
+    return {
+        "type": item.get("type", "Concept"),
+        "domain": item.get("domain", ""),
+        "definition": item.get("definition", ""),
+        "description": item.get("description", ""),
+        "properties": item.get("properties", {}),
+        "metadata": {}
+    }
+
+
+def entity_edges(item: dict):
+    for rel in item.get("relations", []):
+        yield {
+            "source": item["entity"],
+            "type": rel.get("type", "related_to"),
+            "target": rel.get("target")
+        }
+
+
+def parse_subject_file(json_path: Path):
+    """
+    Parse one subject file into its contribution to the graph.
+
+    Returns:
+        status, nodes {name: node_data} (file order, first occurrence wins),
+        edges [edge] (file order)
+    """
+    streamed = stream_large_graph(json_path)
+    if streamed is False:
+        return STATUS_INVALID, {}, []
+    if streamed is not None:
+        return STATUS_OK, *streamed
+
+    payload = safe_load_json(json_path)
+    if payload is None:
+        return STATUS_INVALID, {}, []
+
+    nodes = {}
+    edges = []
+
+    # --------------------------------------------------
+    # CASE 1 — Full graph JSON
+    # --------------------------------------------------
+    if isinstance(payload, dict) and "nodes" in payload and "edges" in payload:
+        nodes.update(payload.get("nodes", {}))
+        edges.extend(payload.get("edges", []))
+
+    # --------------------------------------------------
+    # CASE 2 — Single entity JSON
+    # --------------------------------------------------
+    elif isinstance(payload, dict) and "entity" in payload:
+        nodes[payload["entity"]] = entity_node(payload)
+        edges.extend(entity_edges(payload))
+
+    # --------------------------------------------------
+    # CASE 3 — List of entities
+    # --------------------------------------------------
+    elif isinstance(payload, list):
+        for item in payload:
+            if not isinstance(item, dict) or "entity" not in item:
+                continue
+
+            if item["entity"] not in nodes:
+                nodes[item["entity"]] = entity_node(item)
+            edges.extend(entity_edges(item))
+
+    # --------------------------------------------------
+    # Unsupported JSON schema
+    # --------------------------------------------------
+    else:
+        return STATUS_UNSUPPORTED, {}, []
+
+    return STATUS_OK, nodes, edges
+
+
+def parse_files(paths, workers: int = 1):
+    """
+    parse_subject_file() over many files, results in input order.
+
+    With workers > 1 the files are decoded in a process pool; the caller
+    still folds the results serially, in sorted file order, so "first
+    writer wins" behaves exactly as in a serial run.
+    """
+    paths = list(paths)
+
+    if workers <= 1 or len(paths) <= 1:
+        return map(parse_subject_file, paths)
+
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(parse_subject_file, paths, chunksize=chunksize))
+
+
+def new_graph() -> dict:
+    return {
         "nodes": {},
         "edges": [],
         "metadata": {
@@ -91,113 +252,93 @@ def merge_graph():
         }
     }
 
+
+def register_subject(graph, subject_id, subject_name, json_path: Path):
+    graph["metadata"]["subjects"].setdefault(subject_id, {
+        "subject_id": subject_id,
+        "display_name": subject_name,
+        "files": []
+    })
+    graph["metadata"]["subjects"][subject_id]["files"].append(json_path.name)
+
+
+def relative_key(json_path: Path) -> str:
+    """Manifest key: <subject_id>/<file name>"""
+    return json_path.relative_to(JSON_NODES_DIR).as_posix()
+
+
+def print_summary(graph, total_files, valid_files, skipped_files):
+    print("\n📊 Merge Summary")
+    print(f"   Total JSON files scanned : {total_files}")
+    print(f"   Valid files ingested     : {valid_files}")
+    print(f"   Files skipped            : {skipped_files}")
+    print(f"   Nodes                     : {len(graph['nodes'])}")
+    print(f"   Edges                     : {len(graph['edges'])}")
+    print(f"   Subjects                  : {len(graph['metadata']['subjects'])}")
+
+
+def merge_graph(
+    edges: Optional[EdgeStore] = None,
+    manifest: Optional[dict] = None,
+    workers: int = 1
+):
+    """
+    Merge every subject file into one graph dict.
+
+    Pass an EdgeStore to keep per-edge provenance after the merge, a
+    manifest (see merge_manifest.py) to record per-file fingerprints for
+    later incremental runs, and workers > 1 to parse files in parallel.
+    """
+    graph = new_graph()
+
+    # O(1) dedup keyed by (source, type, target); serialized at the end
+    if edges is None:
+        edges = EdgeStore()
+
     print("\n🔍 Scanning subject folders...\n")
 
     total_files = 0
     valid_files = 0
     skipped_files = 0
 
-    for subject_id, subject_name, json_path in iter_subject_files():
+    subject_files = list(iter_subject_files())
+    results = parse_files((path for _, _, path in subject_files), workers)
+
+    for (subject_id, subject_name, json_path), parsed in zip(subject_files, results):
         total_files += 1
         print(f"   • {subject_name:<35} ← {json_path.name}")
 
-        payload = safe_load_json(json_path)
-        if payload is None:
+        status, file_nodes, file_edges = parsed
+
+        if manifest is not None:
+            manifest["files"][relative_key(json_path)] = file_entry(
+                subject_id, json_path, status,
+                file_nodes, dict.fromkeys(map(edge_key, file_edges))
+            )
+
+        if status == STATUS_INVALID:
             skipped_files += 1
             continue
 
         valid_files += 1
 
         # Register subject metadata
-        graph["metadata"]["subjects"].setdefault(subject_id, {
-            "subject_id": subject_id,
-            "display_name": subject_name,
-            "files": []
-        })
-        graph["metadata"]["subjects"][subject_id]["files"].append(json_path.name)
-
-        # --------------------------------------------------
-        # CASE 1 — Full graph JSON
-        # --------------------------------------------------
-        if isinstance(payload, dict) and "nodes" in payload and "edges" in payload:
-
-            for node_name, node_data in payload.get("nodes", {}).items():
-                node = graph["nodes"].setdefault(node_name, node_data)
-
-                meta = node.setdefault("metadata", {})
-                meta.setdefault("subjects", set()).add(subject_id)
-                meta.setdefault("source_files", set()).add(json_path.name)
-
-            for edge in payload.get("edges", []):
-                if edge not in graph["edges"]:
-                    graph["edges"].append(edge)
-
-        # --------------------------------------------------
-        # CASE 2 — Single entity JSON
-        # --------------------------------------------------
-        elif isinstance(payload, dict) and "entity" in payload:
-            entity = payload["entity"]
-
-            node = graph["nodes"].setdefault(entity, {
-                "type": payload.get("type", "Concept"),
-                "domain": payload.get("domain", ""),
-                "definition": payload.get("definition", ""),
-                "description": payload.get("description", ""),
-                "properties": payload.get("properties", {}),
-                "metadata": {}
-            })
+        register_subject(graph, subject_id, subject_name, json_path)
+
+        if status == STATUS_UNSUPPORTED:
+            print(f"⚠️ Unsupported schema skipped: {json_path}")
+            skipped_files += 1
+            continue
+
+        for node_name, node_data in file_nodes.items():
+            node = graph["nodes"].setdefault(node_name, node_data)
 
             meta = node.setdefault("metadata", {})
             meta.setdefault("subjects", set()).add(subject_id)
             meta.setdefault("source_files", set()).add(json_path.name)
 
-            for rel in payload.get("relations", []):
-                edge = {
-                    "source": entity,
-                    "type": rel.get("type", "related_to"),
-                    "target": rel.get("target")
-                }
-                if edge not in graph["edges"]:
-                    graph["edges"].append(edge)
-
-        # --------------------------------------------------
-        # CASE 3 — List of entities
-        # --------------------------------------------------
-        elif isinstance(payload, list):
-            for item in payload:
-                if not isinstance(item, dict) or "entity" not in item:
-                    continue
-
-                entity = item["entity"]
-
-                node = graph["nodes"].setdefault(entity, {
-                    "type": item.get("type", "Concept"),
-                    "domain": item.get("domain", ""),
-                    "definition": item.get("definition", ""),
-                    "description": item.get("description", ""),
-                    "properties": item.get("properties", {}),
-                    "metadata": {}
-                })
-
-                meta = node.setdefault("metadata", {})
-                meta.setdefault("subjects", set()).add(subject_id)
-                meta.setdefault("source_files", set()).add(json_path.name)
-
-                for rel in item.get("relations", []):
-                    edge = {
-                        "source": entity,
-                        "type": rel.get("type", "related_to"),
-                        "target": rel.get("target")
-                    }
-                    if edge not in graph["edges"]:
-                        graph["edges"].append(edge)
-
-        # --------------------------------------------------
-        # Unsupported JSON schema
-        # --------------------------------------------------
-        else:
-            print(f"⚠️ Unsupported schema skipped: {json_path}")
-            skipped_files += 1
+        for edge in file_edges:
+            edges.add(edge, subject_id, json_path.name)
 
     # --------------------------------------------------
     # Normalize metadata sets → lists
@@ -207,16 +348,195 @@ def merge_graph():
         meta["subjects"] = sorted(list(meta.get("subjects", [])))
         meta["source_files"] = sorted(list(meta.get("source_files", [])))
 
+    graph["edges"] = edges.to_list()
+
     # --------------------------------------------------
     # Summary
     # --------------------------------------------------
-    print("\n📊 Merge Summary")
-    print(f"   Total JSON files scanned : {total_files}")
-    print(f"   Valid files ingested     : {valid_files}")
-    print(f"   Files skipped            : {skipped_files}")
-    print(f"   Nodes                     : {len(graph['nodes'])}")
-    print(f"   Edges                     : {len(graph['edges'])}")
-    print(f"   Subjects                  : {len(graph['metadata']['subjects'])}")
+    print_summary(graph, total_files, valid_files, skipped_files)
+
+    return graph
+
+
+# ======================================================
+# INCREMENTAL MERGE
+# ======================================================
+
+def contribution_owners(files: dict, field: str):
+    """
+    For every node name / edge key listed in the manifest entries, find the
+    first file (in merge order) that contributed it, plus all contributors.
+
+    Dict insertion order equals the order a full merge would insert them,
+    because `files` is itself in merge order.
+    """
+    owners = {}
+    contributors = {}
+
+    for rel, entry in files.items():
+        if entry["status"] != STATUS_OK:
+            continue
+        for item in entry[field]:
+            key = tuple(item) if field == "edges" else item
+            owners.setdefault(key, rel)
+            contributors.setdefault(key, []).append(rel)
+
+    return owners, contributors
+
+
+def merge_graph_incremental(
+    manifest: dict,
+    edges: Optional[EdgeStore] = None,
+    workers: int = 1
+):
+    """
+    Re-merge only what changed since the manifest was written.
+
+    Files whose size/mtime (or, failing that, content hash) match the
+    manifest are not re-parsed. Nodes and edges whose first contributor
+    was removed or modified are re-resolved from the next contributor, and
+    subject / source_files provenance is recomputed from the manifest, so
+    the result equals a full rebuild.
+
+    Falls back to a full merge if the manifest is empty or no longer
+    describes the graph on disk. The manifest is updated in place.
+    """
+    if edges is None:
+        edges = EdgeStore()
+
+    previous_bytes = OUTPUT_GRAPH.read_bytes() if OUTPUT_GRAPH.exists() else None
+
+    if previous_bytes is None or manifest.get("graph_sha256") != sha256_bytes(previous_bytes):
+        print("\n♻️  No usable manifest for the current graph — full rebuild")
+        manifest["files"] = {}
+        return merge_graph(edges, manifest, workers)
+
+    previous = json.loads(previous_bytes.decode("utf-8"))
+    previous_files = manifest["files"]
+
+    print("\n🔍 Scanning subject folders (incremental)...\n")
+
+    # --------------------------------------------------
+    # Detect added / changed / removed files
+    # --------------------------------------------------
+    files = {}
+    subject_names = {}
+    paths = {}
+    parsed = {}
+    to_parse = []
+
+    for subject_id, subject_name, json_path in iter_subject_files():
+        rel = relative_key(json_path)
+        subject_names[subject_id] = subject_name
+        paths[rel] = json_path
+
+        old = previous_files.get(rel)
+        if old is not None:
+            if stat_matches(old, json_path):
+                files[rel] = old
+                continue
+
+            if old["sha256"] == sha256_file(json_path):
+                # Touched but identical: refresh the cheap fingerprint only
+                st = json_path.stat()
+                files[rel] = dict(old, size=st.st_size, mtime_ns=st.st_mtime_ns)
+                continue
+
+        print(f"   • {subject_name:<35} ← {json_path.name} ({'changed' if old else 'added'})")
+
+        files[rel] = None  # keeps merge order; filled in below
+        to_parse.append((rel, subject_id))
+
+    results = parse_files((paths[rel] for rel, _ in to_parse), workers)
+
+    for (rel, subject_id), (status, file_nodes, file_edges) in zip(to_parse, results):
+        if status == STATUS_UNSUPPORTED:
+            print(f"⚠️ Unsupported schema skipped: {paths[rel]}")
+
+        parsed[rel] = (file_nodes, {edge_key(e): e for e in reversed(file_edges)})
+        files[rel] = file_entry(
+            subject_id, paths[rel], status,
+            file_nodes, dict.fromkeys(map(edge_key, file_edges))
+        )
+
+    removed = [rel for rel in previous_files if rel not in files]
+    for rel in removed:
+        print(f"   • {rel} (removed)")
+
+    changed = set(parsed)
+
+    # --------------------------------------------------
+    # Resolve first writers, re-reading unchanged files only when a
+    # retracted first writer hands a node / edge over to them
+    # --------------------------------------------------
+    old_node_owner, _ = contribution_owners(previous_files, "nodes")
+    old_edge_owner, _ = contribution_owners(previous_files, "edges")
+    node_owner, node_contributors = contribution_owners(files, "nodes")
+    edge_owner, edge_contributors = contribution_owners(files, "edges")
+
+    handovers = {
+        owner for name, owner in node_owner.items()
+        if owner not in parsed and owner != old_node_owner.get(name)
+    } | {
+        owner for key, owner in edge_owner.items()
+        if owner not in parsed and owner != old_edge_owner.get(key)
+    }
+
+    handovers = sorted(handovers)
+    results = parse_files((paths[rel] for rel in handovers), workers)
+
+    for rel, (_, file_nodes, file_edges) in zip(handovers, results):
+        parsed[rel] = (file_nodes, {edge_key(e): e for e in reversed(file_edges)})
+
+    # --------------------------------------------------
+    # Rebuild the graph in full-merge order
+    # --------------------------------------------------
+    graph = new_graph()
+
+    for rel, entry in files.items():
+        if entry["status"] != STATUS_INVALID:
+            subject_id = entry["subject_id"]
+            register_subject(graph, subject_id, subject_names[subject_id], paths[rel])
+
+    previous_edges = {edge_key(e): e for e in previous["edges"]}
+
+    for name, owner in node_owner.items():
+        if owner in parsed:
+            node = parsed[owner][0][name]
+        else:
+            node = previous["nodes"][name]
+
+        contributors = node_contributors[name]
+        meta = node.setdefault("metadata", {})
+        meta["subjects"] = sorted({files[rel]["subject_id"] for rel in contributors})
+        meta["source_files"] = sorted({paths[rel].name for rel in contributors})
+
+        graph["nodes"][name] = node
+
+    for key, owner in edge_owner.items():
+        if owner in parsed:
+            edge = parsed[owner][1][key]
+        else:
+            edge = previous_edges[key]
+
+        for rel in edge_contributors[key]:
+            edges.add(edge, files[rel]["subject_id"], paths[rel].name)
+
+    graph["edges"] = edges.to_list()
+
+    manifest["files"] = files
+
+    # --------------------------------------------------
+    # Summary
+    # --------------------------------------------------
+    statuses = [entry["status"] for entry in files.values()]
+    total_files = len(statuses)
+    invalid = statuses.count(STATUS_INVALID)
+    unsupported = statuses.count(STATUS_UNSUPPORTED)
+
+    print(f"\n   Re-parsed files          : {len(parsed)} "
+          f"({len(changed)} added/changed, {len(removed)} removed)")
+    print_summary(graph, total_files, total_files - invalid, invalid + unsupported)
 
     return graph
 
@@ -225,23 +545,76 @@ def merge_graph():
 # SAVE
 # ======================================================
 
-def save_graph(graph):
+def save_graph(graph, manifest: Optional[dict] = None, sqlite: bool = False):
     OUTPUT_GRAPH.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(OUTPUT_GRAPH, "w", encoding="utf-8") as f:
-        json.dump(graph, f, indent=2, ensure_ascii=False)
+    text = json.dumps(graph, indent=2, ensure_ascii=False)
+
+    # Atomic replace: running apps never read a half-written graph
+    tmp = OUTPUT_GRAPH.with_name(OUTPUT_GRAPH.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, OUTPUT_GRAPH)
 
     print(f"\n💾 Graph saved to:\n   {OUTPUT_GRAPH}")
 
+    # Memory-mappable mirror used by components/graph_loader.py
+    write_snapshot(graph, SNAPSHOT_FILE, source_fingerprint(OUTPUT_GRAPH))
+    print(f"🗜  Snapshot saved to:\n   {SNAPSHOT_FILE}")
+
+    save_bitmap_index(build_bitmap_index(graph, source_fingerprint(OUTPUT_GRAPH)), BITMAP_FILE)
+    print(f"🧮 Bitmap index saved to:\n   {BITMAP_FILE}")
+
+    if sqlite:
+        write_graph_db(graph, DB_FILE, source_fingerprint(OUTPUT_GRAPH))
+        print(f"🗄  SQLite store saved to:\n   {DB_FILE}")
+
+    if manifest is not None:
+        manifest["graph_sha256"] = sha256_bytes(text.encode("utf-8"))
+        save_manifest(manifest, MANIFEST_FILE)
+        print(f"🧾 Manifest saved to:\n   {MANIFEST_FILE}")
+
 
 # ======================================================
 # MAIN
 # ======================================================
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Merge json_nodes/ into one graph.")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only re-parse files changed since the last run (uses the manifest)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="parse files in a pool of N processes (default: 1, serial)"
+    )
+    parser.add_argument(
+        "--sqlite",
+        action="store_true",
+        help="also write the indexed SQLite store (merged_graph.sqlite)"
+    )
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    graph = merge_graph()
-    save_graph(graph)
+    args = parse_args()
+    started = time.perf_counter()
+
+    if args.incremental:
+        manifest = load_manifest(MANIFEST_FILE) or new_manifest()
+        graph = merge_graph_incremental(manifest, workers=args.workers)
+    else:
+        manifest = new_manifest()
+        graph = merge_graph(manifest=manifest, workers=args.workers)
+
+    print(f"   Merge time                : {time.perf_counter() - started:.2f}s "
+          f"(workers={args.workers})")
 
+    save_graph(graph, manifest, sqlite=args.sqlite)
 
 # import json
 # from pathlib import Path
@@ -0,0 +1,94 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Optional
+
+# ======================================================
+# MANIFEST FORMAT
+# ======================================================
+#
+# {
+#   "version": 1,
+#   "graph_sha256": "<hash of the merged_graph.json it describes>",
+#   "files": {
+#     "<subject_id>/<file>.json": {
+#       "subject_id": ...,
+#       "size": ..., "mtime_ns": ..., "sha256": ...,
+#       "status": "ok" | "unsupported" | "invalid",
+#       "nodes": [node names, in file order],
+#       "edges": [[source, type, target], ...]
+#     }
+#   }
+# }
+#
+# "nodes" / "edges" record what each file contributed, which is what lets an
+# incremental merge retract a removed or modified file without re-reading
+# the rest of the corpus.
+
+MANIFEST_VERSION = 1
+
+
+def manifest_path(graph_path: Path) -> Path:
+    """merged_graph.json → merged_graph.manifest.json"""
+    return graph_path.with_name(f"{graph_path.stem}.manifest.json")
+
+
+def new_manifest() -> dict:
+    return {"version": MANIFEST_VERSION, "graph_sha256": None, "files": {}}
+
+
+def load_manifest(path: Path) -> Optional[dict]:
+    """
+    Load a manifest.
+    Returns None if missing, unreadable or from another format version.
+    """
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return None
+
+    return manifest
+
+
+def save_manifest(manifest: dict, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+
+
+# ======================================================
+# FINGERPRINTS
+# ======================================================
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stat_matches(entry: dict, path: Path) -> bool:
+    """Cheap change check: same size and mtime → assume unchanged."""
+    st = path.stat()
+    return entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns
+
+
+def file_entry(subject_id: str, path: Path, status: str, nodes, edge_keys) -> dict:
+    st = path.stat()
+    return {
+        "subject_id": subject_id,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": sha256_file(path),
+        "status": status,
+        "nodes": list(nodes),
+        "edges": [list(k) for k in edge_keys],
+    }